@@ -50,6 +50,24 @@ def resource():
     return _resource
 
 
+def main(*args, **kwargs):
+    """
+    Convenience method for creating/showing a library widget instance.
+
+    The main module is imported on the first call. See
+    studiolibrary.main.main for the arguments.
+
+    :rtype: studiolibrary.LibraryWidget
+    """
+    import studiolibrary.main
+
+    # The import sets the module on the package, so set the function
+    main = sys.modules["studiolibrary.main"].main
+    globals()["main"] = main
+
+    return main(*args, **kwargs)
+
+
 def setup(path):
     """
     Setup the packages that have been decoupled from the Studio Library.
@@ -69,10 +87,13 @@ setup(PACKAGES_PATH)
 import studioqt
 
 from studiolibrary.cmds import *
+from studiolibrary.atomicwrite import FileLock, AtomicFile, LockTimeoutError, atomicWrite
+from studiolibrary.blobstore import BlobStore, collectGarbage
+from studiolibrary.fileops import copyTree, FileTransaction, FileTransactionError
 from studiolibrary.database import Database
+from studiolibrary.settingsstore import SettingsStore
 from studiolibrary.libraryitem import LibraryItem
 from studiolibrary.librarywidget import LibraryWidget
-from studiolibrary.main import main
 
 import studiolibrary.folderitem
 
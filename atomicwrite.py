@@ -0,0 +1,416 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Atomic file writes guarded by an advisory lock.
+
+The data is written to a unique temp file in the same folder, flushed to
+disc and then renamed over the destination. Readers therefore see either
+the old or the new file and never a partial one.
+
+Writers to the same path are serialised with an fcntl lock on a lock file
+next to the destination. The kernel releases the lock when a writer
+crashes, so a left over lock file never blocks other writers. Where fcntl
+is not available the lock file is created exclusively and is treated as
+stale when it is older than STALE_LOCK_AGE.
+
+The lock can also be held across a read, modify and write of a file, so
+concurrent updates wait for each other instead of losing changes. A
+thread that holds the lock for a path can lock it again, so the write
+inside the update does not wait for itself.
+
+Example:
+    import studiolibrary
+
+    with studiolibrary.atomicWrite("/tmp/pose.json") as f:
+        f.write(data)
+
+    with studiolibrary.FileLock("/tmp/pose.json"):
+        data = studiolibrary.readJson("/tmp/pose.json")
+        data["count"] += 1
+        studiolibrary.saveJson("/tmp/pose.json", data)
+"""
+import os
+import time
+import ctypes
+import uuid
+import errno
+import logging
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+__all__ = [
+    "FileLock",
+    "AtomicFile",
+    "LockTimeoutError",
+    "atomicWrite",
+    "replaceFile",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+LOCK_TIMEOUT = 30.0
+LOCK_INTERVAL = 0.01
+STALE_LOCK_AGE = 120.0
+
+
+# The number of times each thread has locked each lock file
+_locked = threading.local()
+
+
+class LockTimeoutError(Exception):
+    """"""
+
+
+def _lockCounts():
+    """
+    Return the lock counts for the lock files held by the current thread.
+
+    :rtype: dict
+    """
+    if not hasattr(_locked, "counts"):
+        _locked.counts = {}
+    return _locked.counts
+
+
+def lockPath(path):
+    """
+    Return the lock file path for the given path.
+
+    :type path: str
+    :rtype: str
+    """
+    dirname, basename = os.path.split(path)
+    return os.path.join(dirname, "." + basename + ".lock")
+
+
+def replaceFile(src, dst):
+    """
+    Rename the given src over the given dst in a single step.
+
+    :type src: str
+    :type dst: str
+    :rtype: None
+    """
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+
+    elif os.name == "nt":
+        # MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH
+        flags = 0x1 | 0x8
+        func = ctypes.windll.kernel32.MoveFileExW
+
+        if not func(unicode(src), unicode(dst), flags):
+            raise ctypes.WinError()
+
+    else:
+        os.rename(src, dst)
+
+
+def syncDirectory(dirname):
+    """
+    Flush the folder entry of a renamed file to disc where supported.
+
+    :type dirname: str
+    :rtype: None
+    """
+    if os.name == "nt":
+        return
+
+    try:
+        fd = os.open(dirname or ".", os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class FileLock(object):
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT):
+        """
+        :type path: str
+        :type timeout: float
+        """
+        self._path = lockPath(path)
+        self._key = os.path.normcase(os.path.abspath(self._path))
+        self._fd = None
+        self._nested = False
+        self._timeout = timeout
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.release()
+
+    def path(self):
+        """
+        :rtype: str
+        """
+        return self._path
+
+    def isLocked(self):
+        """
+        :rtype: bool
+        """
+        return self._fd is not None or self._nested
+
+    def acquire(self):
+        """
+        Wait until the lock is acquired or the timeout is reached.
+
+        Returns at once when the current thread already holds the lock.
+
+        :raises: LockTimeoutError
+        :rtype: None
+        """
+        counts = _lockCounts()
+
+        if counts.get(self._key):
+            counts[self._key] += 1
+            self._nested = True
+            return
+
+        start = time.time()
+
+        while True:
+            if fcntl:
+                acquired = self._tryFcntl()
+            else:
+                acquired = self._tryExclusive()
+
+            if acquired:
+                counts[self._key] = 1
+                return
+
+            if time.time() - start > self._timeout:
+                msg = "Timed out waiting for the lock {0}".format(self._path)
+                raise LockTimeoutError(msg)
+
+            time.sleep(LOCK_INTERVAL)
+
+    def release(self):
+        """
+        Remove the lock file and release the lock.
+
+        The file is removed while the lock is still held so that a
+        waiting writer never locks a file that is about to be removed.
+
+        :rtype: None
+        """
+        counts = _lockCounts()
+
+        if self._nested:
+            counts[self._key] -= 1
+            self._nested = False
+            return
+
+        if self._fd is None:
+            return
+
+        counts.pop(self._key, None)
+
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        os.close(self._fd)
+        self._fd = None
+
+    def _tryFcntl(self):
+        """
+        :rtype: bool
+        """
+        fd = os.open(self._path, os.O_CREAT | os.O_RDWR)
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError) as error:
+            os.close(fd)
+            if error.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+
+        # The previous owner may have removed the file after we opened
+        # it, in which case the lock is on an orphaned file.
+        try:
+            if os.fstat(fd).st_ino == os.stat(self._path).st_ino:
+                self._fd = fd
+                return True
+        except OSError:
+            pass
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+        return False
+
+    def _tryExclusive(self):
+        """
+        :rtype: bool
+        """
+        try:
+            fd = os.open(self._path, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+            try:
+                age = time.time() - os.path.getmtime(self._path)
+            except OSError:
+                return False
+
+            if age > STALE_LOCK_AGE:
+                logger.warning("Removing stale lock file %s", self._path)
+                try:
+                    os.remove(self._path)
+                except OSError:
+                    pass
+
+            return False
+
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        return True
+
+
+class AtomicFile(object):
+
+    def __init__(self, path, mode="w", timeout=LOCK_TIMEOUT):
+        """
+        :type path: str
+        :type mode: str
+        :type timeout: float
+        """
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+
+        self._path = path
+        self._lock = FileLock(path, timeout=timeout)
+        self._lock.acquire()
+
+        dirname, basename = os.path.split(path)
+        name = ".{0}.{1}.tmp".format(basename, uuid.uuid4().hex)
+        self._tempPath = os.path.join(dirname, name)
+
+        try:
+            self._file = open(self._tempPath, mode)
+        except Exception:
+            self._lock.release()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        if t is None:
+            self.close()
+        else:
+            self.discard()
+
+    def path(self):
+        """
+        :rtype: str
+        """
+        return self._path
+
+    def write(self, data):
+        """
+        :type data: str
+        :rtype: None
+        """
+        self._file.write(data)
+
+    def writelines(self, lines):
+        """
+        :type lines: list[str]
+        :rtype: None
+        """
+        self._file.writelines(lines)
+
+    def close(self):
+        """
+        Flush the temp file to disc and rename it over the destination.
+
+        :rtype: None
+        """
+        if self._file is None:
+            return
+
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+            replaceFile(self._tempPath, self._path)
+            syncDirectory(os.path.dirname(self._path))
+        except Exception:
+            self.discard()
+            raise
+        finally:
+            self._lock.release()
+
+    def discard(self):
+        """
+        Remove the temp file and leave the destination unchanged.
+
+        :rtype: None
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        if os.path.exists(self._tempPath):
+            os.remove(self._tempPath)
+
+        self._lock.release()
+
+
+@contextlib.contextmanager
+def atomicWrite(path, mode="w", timeout=LOCK_TIMEOUT):
+    """
+    Return a file object that replaces the given path when it is closed.
+
+    :type path: str
+    :type mode: str
+    :type timeout: float
+    :rtype: AtomicFile
+    """
+    f = AtomicFile(path, mode=mode, timeout=timeout)
+
+    try:
+        yield f
+    except Exception:
+        f.discard()
+        raise
+
+    f.close()
@@ -0,0 +1,333 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+A content addressed store for the thumbnails and image sequences.
+
+Many items are saved from the same shot and share identical images. The
+store keeps one copy of each image in a ".blobs" folder under the library
+root, named by the hash of its contents. The files in the items are hard
+links to the blobs, so they take no extra space and moving or trashing an
+item only renames links.
+
+The store is optional and is only used when the ".blobs" folder exists.
+A blob with no links outside the store is no longer used by any item and
+is removed by collectGarbage.
+
+Files that are in the store must be replaced and never written in place,
+since writing to a hard link changes the blob for every item.
+
+Example:
+    import studiolibrary
+
+    studiolibrary.BlobStore.create("/library")
+
+    store = studiolibrary.BlobStore.find("/library/poses/wave.pose")
+    store.dedupe("/library/poses/wave.pose")
+
+    studiolibrary.collectGarbage("/library")
+"""
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+
+import studiolibrary
+
+
+__all__ = [
+    "BlobStore",
+    "collectGarbage",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+STORE_NAME = ".blobs"
+CHUNK_SIZE = 1024 * 1024
+
+# The file types that are stored as blobs
+BLOB_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def hashFile(path):
+    """
+    Return the sha1 digest of the contents of the given file.
+
+    :type path: str
+    :rtype: str
+    """
+    sha1 = hashlib.sha1()
+
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            sha1.update(data)
+
+    return sha1.hexdigest()
+
+
+def linkFile(src, dst):
+    """
+    Replace the given dst with a hard link to the given src.
+
+    Return False if hard links are not supported for the given paths.
+
+    :type src: str
+    :type dst: str
+    :rtype: bool
+    """
+    link = getattr(os, "link", None)
+    if link is None:
+        return False
+
+    dirname, basename = os.path.split(dst)
+    tempPath = os.path.join(dirname, ".{0}.{1}.tmp".format(basename, uuid.uuid4().hex))
+
+    try:
+        link(src, tempPath)
+    except OSError:
+        return False
+
+    try:
+        studiolibrary.replaceFile(tempPath, dst)
+    except OSError:
+        os.remove(tempPath)
+        raise
+
+    return True
+
+
+class BlobStore(object):
+
+    @classmethod
+    def create(cls, root):
+        """
+        Create a store under the given library root.
+
+        :type root: str
+        :rtype: BlobStore
+        """
+        path = os.path.join(root, STORE_NAME)
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        return cls(root)
+
+    @classmethod
+    def find(cls, path):
+        """
+        Return the store for the given item path or None.
+
+        :type path: str
+        :rtype: BlobStore or None
+        """
+        dirname = os.path.abspath(path)
+
+        while True:
+            if os.path.isdir(os.path.join(dirname, STORE_NAME)):
+                return cls(dirname)
+
+            parent = os.path.dirname(dirname)
+            if parent == dirname:
+                return None
+
+            dirname = parent
+
+    def __init__(self, root):
+        """
+        :type root: str
+        """
+        self._root = root
+        self._path = os.path.join(root, STORE_NAME)
+
+    def root(self):
+        """
+        :rtype: str
+        """
+        return self._root
+
+    def path(self):
+        """
+        :rtype: str
+        """
+        return self._path
+
+    def blobPath(self, digest, ext=""):
+        """
+        Return the path of the blob for the given digest.
+
+        :type digest: str
+        :type ext: str
+        :rtype: str
+        """
+        return os.path.join(self._path, digest[:2], digest[2:] + ext.lower())
+
+    def isStored(self, path):
+        """
+        Return True if the given file is a link to a blob.
+
+        :type path: str
+        :rtype: bool
+        """
+        if os.stat(path).st_nlink < 2:
+            return False
+
+        ext = os.path.splitext(path)[1]
+        blobPath = self.blobPath(hashFile(path), ext)
+
+        return os.path.exists(blobPath) and os.path.samefile(path, blobPath)
+
+    def add(self, path):
+        """
+        Add the given file to the store and replace it with a link.
+
+        Return the blob path, or None if hard links are not supported.
+
+        :type path: str
+        :rtype: str or None
+        """
+        ext = os.path.splitext(path)[1]
+        blobPath = self.blobPath(hashFile(path), ext)
+
+        if os.path.exists(blobPath):
+            if os.path.samefile(path, blobPath):
+                return blobPath
+        else:
+            dirname = os.path.dirname(blobPath)
+            if not os.path.exists(dirname):
+                try:
+                    os.makedirs(dirname)
+                except OSError:
+                    if not os.path.isdir(dirname):
+                        raise
+
+            # The file itself becomes the blob, so nothing is copied
+            if not linkFile(path, blobPath):
+                return None
+
+        if not linkFile(blobPath, path):
+            return None
+
+        return blobPath
+
+    def copy(self, src, dst):
+        """
+        Link the given dst to the blob of the given src if it has one.
+
+        Return False if the src is not in the store.
+
+        :type src: str
+        :type dst: str
+        :rtype: bool
+        """
+        if not self.isStored(src):
+            return False
+
+        return linkFile(src, dst)
+
+    def dedupe(self, path):
+        """
+        Add the images in the given item folder to the store.
+
+        Return the number of files that are links to blobs.
+
+        :type path: str
+        :rtype: int
+        """
+        count = 0
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+
+                if not filename.lower().endswith(BLOB_EXTENSIONS):
+                    continue
+
+                if self.add(os.path.join(dirpath, filename)):
+                    count += 1
+
+        logger.debug("Stored %d blobs for %s", count, path)
+
+        return count
+
+    def blobs(self):
+        """
+        Return the paths of all the blobs in the store.
+
+        :rtype: list[str]
+        """
+        paths = []
+
+        for dirpath, dirnames, filenames in os.walk(self._path):
+            for filename in filenames:
+                if not filename.startswith("."):
+                    paths.append(os.path.join(dirpath, filename))
+
+        return paths
+
+    def collectGarbage(self):
+        """
+        Remove the blobs that are not linked from any item.
+
+        Return the number of blobs and bytes that were removed.
+
+        :rtype: (int, int)
+        """
+        count = 0
+        size = 0
+
+        for path in self.blobs():
+            stat = os.stat(path)
+
+            if stat.st_nlink == 1:
+                os.remove(path)
+                count += 1
+                size += stat.st_size
+
+        for dirpath, dirnames, filenames in os.walk(self._path, topdown=False):
+            if dirpath != self._path and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+        logger.info("Removed %d unused blobs (%d bytes) from %s", count, size, self._path)
+
+        return count, size
+
+    def remove(self):
+        """
+        Remove the store. The links in the items keep their contents.
+
+        :rtype: None
+        """
+        shutil.rmtree(self._path)
+
+
+def collectGarbage(root):
+    """
+    Remove the unused blobs from the store under the given library root.
+
+    :type root: str
+    :rtype: (int, int)
+    """
+    store = BlobStore.find(root)
+
+    if store is None:
+        logger.info("No blob store found for %s", root)
+        return 0, 0
+
+    return store.collectGarbage()
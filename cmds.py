@@ -16,7 +16,6 @@ import json
 import uuid
 import ctypes
 import shutil
-import urllib2
 import locale
 import logging
 import getpass
@@ -26,6 +25,9 @@ import collections
 
 from datetime import datetime
 
+from studiolibrary import fileops
+from studiolibrary.atomicwrite import FileLock, atomicWrite, replaceFile
+
 
 __all__ = [
     "user",
@@ -35,6 +37,7 @@ __all__ = [
     "isWindows",
     "read",
     "write",
+    "replaceFile",
     "update",
     "saveJson",
     "readJson",
@@ -42,6 +45,8 @@ __all__ = [
     "replaceJson",
     "relPath",
     "absPath",
+    "relPaths",
+    "absPaths",
     "realPath",
     "normPath",
     "copyPath",
@@ -65,9 +70,11 @@ __all__ = [
     "registerItem",
     "registeredItems",
     "itemFromPath",
+    "itemClassFromPath",
     "itemsFromPaths",
     "itemsFromUrls",
     "findItems",
+    "findItemClasses",
     "findItemsInFolders",
     "IGNORE_PATHS",
     "ANALYTICS_ID",
@@ -79,6 +86,16 @@ __all__ = [
 logger = logging.getLogger(__name__)
 
 
+# The JSON serialisation profiles. Compact output is smaller and faster to
+# write and read. Pretty output is kept for files that people edit.
+JSON_PROFILES = {
+    "compact": {"separators": (",", ":")},
+    "pretty": {"indent": 4},
+}
+
+DEFAULT_JSON_PROFILE = "compact"
+
+
 _itemClasses = collections.OrderedDict()
 
 
@@ -151,12 +168,12 @@ def clearRegisteredItems():
     _itemClasses = collections.OrderedDict()
 
 
-def itemFromPath(path, **kwargs):
+def itemClassFromPath(path):
     """
-    Return a new item instance for the given path.
+    Return the registered item class that supports the given path.
 
     :type path: str
-    :rtype: studiolibrary.LibraryItem or None
+    :rtype: type or None
     """
     path = normPath(path)
 
@@ -166,7 +183,20 @@ def itemFromPath(path, **kwargs):
 
     for cls in registeredItems():
         if cls.match(path):
-            return cls(path, **kwargs)
+            return cls
+
+
+def itemFromPath(path, **kwargs):
+    """
+    Return a new item instance for the given path.
+
+    :type path: str
+    :rtype: studiolibrary.LibraryItem or None
+    """
+    cls = itemClassFromPath(path)
+
+    if cls:
+        return cls(normPath(path), **kwargs)
 
 
 def itemsFromPaths(paths, **kwargs):
@@ -222,14 +252,16 @@ def pathsFromUrls(urls):
         yield path
 
 
-def findItems(path, depth=3, **kwargs):
+def findItemClasses(path, depth=3):
     """
-    Find and create items by walking the given path.
+    Walk the given path and return the item paths with their item classes.
+
+    No items are created, so this can be called from a worker thread.
 
     :type path: str
     :type depth: int
 
-    :rtype: collections.Iterable[studiolibrary.LibraryItem]
+    :rtype: collections.Iterable[(str, type)]
     """
     path = normPath(path)
 
@@ -243,16 +275,15 @@ def findItems(path, depth=3, **kwargs):
         for filename in files:
             remove = False
 
-            # Normalise the path for consistent matching
             path = os.path.join(root, filename)
-            item = itemFromPath(path, **kwargs)
+            cls = itemClassFromPath(path)
 
-            if item:
-                # Yield the item that matches/supports the current path
-                yield item
+            if cls:
+                # Normalise the path for consistent matching
+                yield normPath(path), cls
 
                 # Stop walking the dir if the item doesn't support nested items
-                if not item.EnableNestedItems:
+                if not cls.EnableNestedItems:
                     remove = True
 
             if remove and filename in dirs:
@@ -267,6 +298,19 @@ def findItems(path, depth=3, **kwargs):
             del dirs[:]
 
 
+def findItems(path, depth=3, **kwargs):
+    """
+    Find and create items by walking the given path.
+
+    :type path: str
+    :type depth: int
+
+    :rtype: collections.Iterable[studiolibrary.LibraryItem]
+    """
+    for path, cls in findItemClasses(path, depth=depth):
+        yield cls(path, **kwargs)
+
+
 def findItemsInFolders(folders, depth=3, **kwargs):
     """
     Find and create new item instances by walking the given paths.
@@ -388,18 +432,25 @@ def formatPath(formatString, path="", **kwargs):
     return unicode(formatString).format(**kwargs)
 
 
-def copyPath(src, dst):
+def copyPath(src, dst, callback=None):
     """
     Make a copy of the given src path to the given destination path.
 
+    Folders are copied with a pool of threads and can be resumed when the
+    copy is interrupted. The images in the library blob store are linked
+    instead of copied.
+
+    The callback is called with the bytes copied and the total bytes.
+
     :type src: str
     :type dst: str
+    :type callback: func or None
     :rtype: str
     """
-    if os.path.isfile(src):
-        shutil.copy(src, dst)
-    else:
-        shutil.copytree(src, dst)
+    if os.path.isfile(src) and os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+
+    fileops.copyPath(src, dst, callback=callback)
 
     return dst
 
@@ -512,11 +563,15 @@ def renamePath(src, dst, extension=None, force=False):
     return dst
 
 
-def read(path):
+def read(path, relative=True):
     """
     Return the contents of the given file.
+
+    Set relative to False to return the contents without making the
+    relative paths absolute.
     
     :type path: str 
+    :type relative: bool
     :rtype: str 
     """
     data = ""
@@ -526,70 +581,37 @@ def read(path):
         with open(path) as f:
             data = f.read() or data
 
-    data = absPath(data, path)
+    if relative:
+        data = absPath(data, path)
 
     return data
 
 
-def write(path, data):
+def write(path, data, relative=True):
     """
     Write the given data to the given file on disc.
 
+    The data is written to a unique temp file in the same folder, flushed
+    to disc and then renamed over the path while holding the lock for the
+    path. Readers therefore see either the old or the new contents and
+    never a partial file.
+
+    Set relative to False to write the data without making the paths
+    relative to the file.
+
     :type path: str 
     :type data: str 
+    :type relative: bool
     :rtype: None 
     """
     path = normPath(path)
-    data = relPath(data, path)
-
-    tmp = path + ".tmp"
-    bak = path + ".bak"
-
-    # Create the directory if it doesn't exists
-    dirname = os.path.dirname(path)
-    if not os.path.exists(dirname):
-        os.makedirs(dirname)
-
-    # Use the tmp file to check for concurrent writes
-    if os.path.exists(tmp):
-        msg = "The path is locked for writing and cannot be accessed {}"
-        msg = msg.format(tmp)
-        raise IOError(msg)
-
-    # Safely write the data to a tmp file and then rename to the given path
-    try:
-        # Create and write the new data
-        #  to the path.tmp file
-        with open(tmp, "w") as f:
-            f.write(data)
-            f.flush()
-
-        # Remove any existing path.bak files
-        if os.path.exists(bak):
-            os.remove(bak)
-
-        # Rename the existing path to path.bak
-        if os.path.exists(path):
-            os.rename(path, bak)
-
-        # Rename the tmp path to the given path
-        if os.path.exists(tmp):
-            os.rename(tmp, path)
-
-        # Clean up the bak file only if the given path exists
-        if os.path.exists(path) and os.path.exists(bak):
-            os.remove(bak)
-
-    except:
-        # Remove the tmp file if there are any issues
-        if os.path.exists(tmp):
-            os.remove(tmp)
 
-        # Restore the path from the current .bak file
-        if not os.path.exists(path) and os.path.exists(bak):
-            os.rename(bak, path)
+    if relative:
+        data = relPath(data, path)
 
-        raise
+    # The temp file is removed if there are any issues
+    with atomicWrite(path) as f:
+        f.write(data)
 
 
 def update(data, other):
@@ -608,71 +630,261 @@ def update(data, other):
     return data
 
 
-def updateJson(path, data):
+def updateJson(path, data, relative=True, profile=DEFAULT_JSON_PROFILE):
     """
     Update a json file with the given data.
 
+    The file is locked while it is read and written, so concurrent
+    updates wait for each other instead of losing changes. A
+    LockTimeoutError is raised when the lock cannot be acquired.
+
     :type path: str
     :type data: dict
+    :type relative: bool
+    :type profile: str
     :rtype: None
     """
-    data_ = readJson(path)
-    data_ = update(data_, data)
-    saveJson(path, data_)
+    with FileLock(normPath(path)):
+        data_ = readJson(path, relative=relative)
+        data_ = update(data_, data)
+        saveJson(path, data_, relative=relative, profile=profile)
 
 
-def saveJson(path, data):
+def saveJson(path, data, relative=True, profile=DEFAULT_JSON_PROFILE):
     """
     Serialize the data to a JSON string and write it to the given path.
 
+    The paths inside the folders above the file are stored relative to
+    the file. Set relative to False to store the data unchanged.
+
+    The profile is one of JSON_PROFILES. Use "compact" for files that are
+    mostly read by the library, such as the database, and "pretty" for
+    files that people may edit by hand.
+
     :type path: str
     :type data: dict
+    :type relative: bool
+    :type profile: str
     :rtype: None
     """
     path = normPath(path)
-    data = json.dumps(data, indent=4)
-    write(path, data)
 
+    if relative:
+        data = relPaths(data, path)
+
+    data = json.dumps(data, **JSON_PROFILES[profile])
+    write(path, data, relative=False)
 
-def readJson(path):
+
+def readJson(path, relative=True):
     """
     Read the given JSON file and deserialize to a Python object.
 
     :type path: str
+    :type relative: bool
     :rtype: dict
     """
     path = normPath(path)
 
     logger.debug(u'Reading json file: {0}'.format(path))
 
-    data = read(path) or "{}"
-    data = json.loads(data)
+    data = read(path, relative=False) or "{}"
+
+    if relative:
+        data = json.loads(data, object_pairs_hook=_absPathsHook(path))
+
+        # The hook is not called for a top level list or string
+        data = _mapListStrings(data, _absPathFunc(path))
+    else:
+        data = json.loads(data)
 
     return data
 
 
-def replaceJson(path, old, new, count=-1):
+def replaceJson(path, old, new, count=-1, relative=True, profile=DEFAULT_JSON_PROFILE):
     """
     Replace the old value with the new value in the given json file.
+
+    The file is locked while it is read and written like updateJson.
     
     :type path: str
     :type old: str
     :type new: str
     :type count: int
+    :type relative: bool
+    :type profile: str
     :rtype: dict
     """
     old = old.encode("unicode_escape")
     new = new.encode("unicode_escape")
 
-    data = read(path) or "{}"
-    data = data.replace(old, new, count)
-    data = json.loads(data)
+    with FileLock(normPath(path)):
+        data = readJson(path, relative=relative)
+        data = json.dumps(data)
+        data = data.replace(old, new, count)
+        data = json.loads(data)
+
+        saveJson(path, data, relative=relative, profile=profile)
+
+    return data
+
+
+def _pathTokens(start):
+    """
+    Return the absolute folders above the start path and their tokens.
+
+    The tokens use the same format as relPath. The folder of the file is
+    "../", its parent "../../" and the folder above that "../../../".
+
+    :type start: str
+    :rtype: list[(str, str)]
+    """
+    tokens = []
+    path = normPath(start)
+
+    for token in ["../", "../../", "../../../"]:
+        path = normPath(os.path.dirname(path))
+        tokens.append((path.rstrip("/") + "/", token))
+
+    return tokens
+
+
+def _mapStrings(data, func):
+    """
+    Return a copy of data with func applied to every string and key.
+
+    :type data: object
+    :type func: func
+    :rtype: object
+    """
+    if isinstance(data, basestring):
+        return func(data)
+
+    elif isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            if isinstance(key, basestring):
+                key = func(key)
+            result[key] = _mapStrings(value, func)
+        return result
+
+    elif isinstance(data, (list, tuple)):
+        return [_mapStrings(value, func) for value in data]
+
+    return data
+
+
+def _relPathFunc(start):
+    """
+    Return a function that makes a single path relative to the start path.
+
+    :type start: str
+    :rtype: func
+    """
+    # A path at the root of the drive would match every absolute path
+    tokens = [(path, token) for path, token in _pathTokens(start) if path != "/"]
+
+    def rel(value):
+        for path, token in tokens:
+            if value.startswith(path):
+                return token + value[len(path):]
+        return value
+
+    return rel
+
+
+def _absPathFunc(start):
+    """
+    Return a function that joins a single relative path to the start path.
+
+    :type start: str
+    :rtype: func
+    """
+    tokens = list(reversed(_pathTokens(start)))
+
+    def abs_(value):
+        if value.startswith("../"):
+            for path, token in tokens:
+                if value.startswith(token):
+                    return path + value[len(token):]
+        return value
+
+    return abs_
+
+
+def _absPathsHook(start):
+    """
+    Return a json object_pairs_hook that makes the paths absolute.
+
+    The keys and the strings in the values of each object are rewritten
+    as the object is decoded. The objects in a value have already been
+    decoded, so only the strings in nested lists are rewritten here.
+
+    :type start: str
+    :rtype: func
+    """
+    func = _absPathFunc(start)
+
+    def hook(pairs):
+        result = {}
+
+        for key, value in pairs:
+            result[func(key)] = _mapListStrings(value, func)
+
+        return result
 
-    saveJson(path, data)
+    return hook
+
+
+def _mapListStrings(data, func):
+    """
+    Return data with func applied to the strings in it and in nested lists.
+
+    The dictionaries are returned unchanged.
+
+    :type data: object
+    :type func: func
+    :rtype: object
+    """
+    if isinstance(data, basestring):
+        return func(data)
+
+    elif isinstance(data, list):
+        return [_mapListStrings(value, func) for value in data]
 
     return data
 
 
+def relPaths(data, start):
+    """
+    Return a copy of data with the paths made relative to the start path.
+
+    Unlike relPath this only rewrites the strings and keys that begin with
+    one of the folders above the start path, in a single pass over the
+    decoded data.
+
+    Example:
+        relPaths({"path": "P:/test/relative/hand.anim"}, "P:/test/relative/file.database")
+        # {"path": "../hand.anim"}
+
+    :type data: object
+    :type start: str
+    :rtype: object
+    """
+    return _mapStrings(data, _relPathFunc(start))
+
+
+def absPaths(data, start):
+    """
+    Return a copy of data with the relative paths joined to the start path.
+
+    :type data: object
+    :type start: str
+    :rtype: object
+    """
+    return _mapStrings(data, _absPathFunc(start))
+
+
 def relPath(data, start):
     """
     Return a relative version of all the paths in data from the start path.
@@ -1019,6 +1231,9 @@ def sendAnalytics(
 
     def _send(url):
         try:
+            # Imported in the thread since it is slow to import
+            import urllib2
+
             url = url.replace(" ", "")
             f = urllib2.urlopen(url, None, 1.0)
         except Exception:
@@ -1186,8 +1401,219 @@ def testRelativePaths():
     assert result == path, msg
 
 
+def testFindItemClasses():
+    """
+    Test the item classes are found without creating the items.
+    """
+    import tempfile
+
+    class FolderItem(object):
+        RegisterOrder = 0
+        EnableNestedItems = True
+
+        @classmethod
+        def match(cls, path):
+            return os.path.isdir(path) and not path.endswith(".anim")
+
+    class AnimItem(object):
+        RegisterOrder = 1
+        EnableNestedItems = False
+
+        @classmethod
+        def match(cls, path):
+            return path.endswith(".anim")
+
+        def __init__(self, path, **kwargs):
+            self.path = path
+
+    global _itemClasses
+    itemClasses = _itemClasses
+
+    dirname = normPath(tempfile.mkdtemp())
+
+    try:
+        clearRegisteredItems()
+        registerItem(FolderItem)
+        registerItem(AnimItem)
+
+        for path in ["poses/wave.anim/nested.anim", "poses/.hidden", "walk.anim"]:
+            os.makedirs(os.path.join(dirname, path))
+
+        results = sorted(findItemClasses(dirname, depth=3))
+
+        expected = [
+            (dirname + "/poses", FolderItem),
+            (dirname + "/poses/wave.anim", AnimItem),
+            (dirname + "/walk.anim", AnimItem),
+        ]
+
+        assert results == expected, "Classes do not match {0}".format(results)
+
+        paths = sorted(item.path for item in findItems(dirname + "/poses", depth=1))
+        assert paths == [dirname + "/poses/wave.anim"], "Items do not match {0}".format(paths)
+
+    finally:
+        _itemClasses = itemClasses
+        shutil.rmtree(dirname)
+
+
+def testRelativeJsonPaths():
+    """
+    Test the paths in the decoded data are made relative and absolute.
+    """
+    start = "P:/test/relative/file.database"
+
+    data = {
+        "P:/test/relative/hand.anim": {"path": "P:/test/relative/hand.anim"},
+        "P:/test/face.anim": {"paths": ["P:/test/face.anim", "P:/other"]},
+        "name": "See P:/test/relative/hand.anim",
+    }
+
+    expected = {
+        "../hand.anim": {"path": "../hand.anim"},
+        "../../face.anim": {"paths": ["../../face.anim", "../../../other"]},
+        "name": "See P:/test/relative/hand.anim",
+    }
+
+    data_ = relPaths(data, start)
+    msg = "Data does not match {} {}".format(expected, data_)
+    assert data_ == expected, msg
+
+    data_ = absPaths(data_, start)
+    msg = "Data does not match {} {}".format(data, data_)
+    assert data_ == data, msg
+
+    data_ = json.loads(json.dumps(expected), object_pairs_hook=_absPathsHook(start))
+    msg = "Data does not match {} {}".format(data, data_)
+    assert data_ == data, msg
+
+    # Strings in nested lists and in a top level list
+    import tempfile
+
+    dirname = normPath(tempfile.mkdtemp())
+    path = dirname + "/lib/.studiolibrary/database.json"
+
+    try:
+        for data_ in [
+            {"paths": [[dirname + "/lib/a.anim"], [{"path": dirname + "/lib/b.anim"}]]},
+            [dirname + "/lib/a.anim", [dirname + "/lib/b.anim", 1], {"path": dirname + "/c"}],
+            dirname + "/lib/a.anim",
+        ]:
+            saveJson(path, data_)
+
+            with open(path) as f:
+                assert dirname not in f.read(), "Paths were not made relative"
+
+            result = readJson(path)
+            msg = "Data does not match {} {}".format(data_, result)
+            assert result == data_, msg
+    finally:
+        shutil.rmtree(dirname)
+
+    # Files written by relPath can be read by absPaths. Only the paths at
+    # the start of a string are restored.
+    del data["name"]
+
+    text = relPath(json.dumps(data), start)
+    data_ = absPaths(json.loads(text), start)
+    msg = "Data does not match {} {}".format(data, data_)
+    assert data_ == data, msg
+
+
+def testJsonProfiles():
+    """
+    Test the files written with each profile can be read by older readers.
+    """
+    import tempfile
+
+    dirname = normPath(tempfile.mkdtemp())
+    path = dirname + "/library/.studiolibrary/database.json"
+
+    data = {
+        dirname + "/library/hand.anim": {"name": u"hand \u00e9", "value": 0.1 + 0.2},
+        "tags": ["face", None, True, 12345678901234],
+    }
+
+    try:
+        for profile in JSON_PROFILES:
+            saveJson(path, data, profile=profile)
+
+            with open(path) as f:
+                text = f.read()
+
+            # Older versions read the file with the text absPath
+            data_ = json.loads(absPath(text, path))
+            msg = "Data does not match {} {}".format(data, data_)
+            assert data_ == data, msg
+
+            data_ = readJson(path)
+            msg = "Data does not match {} {}".format(data, data_)
+            assert data_ == data, msg
+
+            if profile == "compact":
+                assert "\n" not in text, "Compact file contains new lines"
+    finally:
+        removePath(dirname)
+
+
+def benchmarkRelativePaths(itemCount=10000):
+    """
+    Compare the read and write time of the text and structural rewrites.
+
+    :type itemCount: int
+    :rtype: dict
+    """
+    import time
+    import tempfile
+
+    dirname = normPath(tempfile.mkdtemp())
+    path = dirname + "/library/.studiolibrary/database.json"
+
+    data = {}
+    for i in range(itemCount):
+        itemPath = "{0}/library/folder{1}/pose{2}.pose".format(dirname, i % 100, i)
+        data[itemPath] = {"path": itemPath, "tags": ["face", "body"]}
+
+    def writeText():
+        write(path, json.dumps(data, indent=4))
+
+    def readText():
+        json.loads(read(path))
+
+    def timeit(func, repeat=3):
+        result = None
+        for i in range(repeat):
+            start = time.time()
+            func()
+            duration = time.time() - start
+            if result is None or duration < result:
+                result = duration
+        return result
+
+    results = {
+        "writeText": timeit(writeText),
+        "readText": timeit(readText),
+        "writeJson": timeit(lambda: saveJson(path, data)),
+        "readJson": timeit(lambda: readJson(path)),
+    }
+
+    removePath(dirname)
+
+    msg = "{0} items with relative paths\n".format(itemCount)
+    msg += "  write text replace: {writeText:>10.4f} sec\n"
+    msg += "  write structural:   {writeJson:>10.4f} sec\n"
+    msg += "  read text replace:  {readText:>10.4f} sec\n"
+    msg += "  read structural:    {readJson:>10.4f} sec"
+
+    print(msg.format(**results))
+
+    return results
+
+
 if __name__ == "__main__":
     testUpdate()
     testSplitPath()
     testFormatPath()
     testRelativePaths()
+    testRelativeJsonPaths()
+    testJsonProfiles()
@@ -10,6 +10,7 @@
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import json
 import logging
 
 import studiolibrary
@@ -194,6 +195,17 @@ class Database(QtCore.QObject):
 
         return results
 
+    def lock(self):
+        """
+        Return a lock for reading, changing and writing the database.
+
+        The lock is held by the methods that change the database, so
+        concurrent changes from other processes are not lost.
+
+        :rtype: studiolibrary.FileLock
+        """
+        return studiolibrary.FileLock(self.path())
+
     def read(self):
         """
         Read the database from disc and return a dict object.
@@ -240,16 +252,17 @@ class Database(QtCore.QObject):
         :type data: dict
         :rtype: None
         """
-        data_ = self.read()
-        keys = self.normPaths(keys)
+        with self.lock():
+            data_ = self.read()
+            keys = self.normPaths(keys)
 
-        for key in keys:
-            if key in data_:
-                data_[key].update(data)
-            else:
-                data_[key] = data
+            for key in keys:
+                if key in data_:
+                    data_[key].update(data)
+                else:
+                    data_[key] = data
 
-        self.save(data_)
+            self.save(data_)
 
     def updateItems(self, items, data):
         """
@@ -277,15 +290,16 @@ class Database(QtCore.QObject):
         :type keys: list[str]
         :rtype: None
         """
-        data = self.read()
+        with self.lock():
+            data = self.read()
 
-        keys = self.normPaths(keys)
+            keys = self.normPaths(keys)
 
-        for key in keys:
-            if key in data:
-                del data[key]
+            for key in keys:
+                if key in data:
+                    del data[key]
 
-        self.save(data)
+            self.save(data)
 
     def addPath(self, path, data=None):
         """
@@ -298,6 +312,17 @@ class Database(QtCore.QObject):
         data = data or {}
         self.updateMultiple([path], data)
 
+    def addPaths(self, paths, data=None):
+        """
+        Add the given paths and data to the database.
+
+        :type paths: list[str]
+        :type data: dict or None
+        :rtype: None
+        """
+        data = data or {}
+        self.updateMultiple(paths, data)
+
     def removePath(self, path):
         """
         Remove the given path from the database.
@@ -315,24 +340,33 @@ class Database(QtCore.QObject):
         :type dst: str
         :rtype: None
         """
-        src = self.normPath(src)
-        dst = self.normPath(dst)
+        self.renamePaths([(src, dst)])
+
+    def renamePaths(self, paths):
+        """
+        Rename the given (src, dst) paths in the database with a single write.
+
+        :type paths: list[(str, str)]
+        :rtype: None
+        """
+        with self.lock():
+            data = json.dumps(self.read())
 
-        src1 = '"' + src + '"'
-        dst2 = '"' + dst + '"'
+            for src, dst in paths:
+                src = json.dumps(self.normPath(src))[:-1]
+                dst = json.dumps(self.normPath(dst))[:-1]
 
-        # Replace paths that match exactly the given src and dst strings
-        self.replace(src1, dst2)
+                # Replace paths that match exactly the given src and dst strings
+                data = data.replace(src + '"', dst + '"')
 
-        src2 = '"' + src
-        dst2 = '"' + dst
+                # Add a slash as a suffix for better directory matching
+                if not src.endswith("/"):
+                    src += "/"
 
-        # Add a slash as a suffix for better directory matching
-        if not src2.endswith("/"):
-            src2 += "/"
+                if not dst.endswith("/"):
+                    dst += "/"
 
-        if not dst2.endswith("/"):
-            dst2 += "/"
+                # Replace all paths that start with the src path with the dst path
+                data = data.replace(src, dst)
 
-        # Replace all paths that start with the src path with the dst path
-        self.replace(src2, dst2)
+            self.save(json.loads(data))
@@ -0,0 +1,527 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Move, copy and trash many files and folders as one operation.
+
+All the operations are checked before anything is changed. Renames on
+the same device are run in parallel. If any operation fails, the ones
+that have already been done are undone in reverse order, so the library
+is left as it was.
+
+The path changes are returned together, so the caller can update its
+database once and refresh the affected items without a rescan.
+
+Folders are copied with copyTree, which copies the files in a thread
+pool and records each finished file in a manifest in the destination.
+An interrupted copy can then be resumed by calling it again. A failed
+copy in a transaction keeps its partial folder, so that adding the same
+copy to a new transaction resumes it.
+
+Example:
+    import studiolibrary
+
+    with studiolibrary.FileTransaction() as transaction:
+        transaction.move("/library/a.pose", "/library/poses/a.pose")
+        transaction.copy("/library/b.anim", "/library/anims/b.anim")
+        transaction.trash("/library/c.pose", "/library/.trash")
+
+    print transaction.changes()
+    # [("/library/a.pose", "/library/poses/a.pose"), ...]
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import threading
+
+from multiprocessing.pool import ThreadPool
+
+import studiolibrary
+from studiolibrary.blobstore import BlobStore
+
+
+__all__ = [
+    "copyTree",
+    "FileTransaction",
+    "FileTransactionError",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_THREADS = 8
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_NAME = ".copy_manifest"
+
+
+class FileTransactionError(Exception):
+    """"""
+
+
+def isSameDevice(src, dst):
+    """
+    Return True if the given paths are on the same device.
+
+    :type src: str
+    :type dst: str
+    :rtype: bool
+    """
+    dirname = os.path.dirname(dst)
+
+    while dirname and not os.path.exists(dirname):
+        parent = os.path.dirname(dirname)
+        if parent == dirname:
+            break
+        dirname = parent
+
+    try:
+        return os.stat(src).st_dev == os.stat(dirname).st_dev
+    except OSError:
+        return False
+
+
+def copyFile(src, dst, callback=None):
+    """
+    Copy the given file and its permissions and modified time.
+
+    The data is written to a temp file that is renamed over the dst. An
+    existing dst may be a link to a blob, so it is never written in place.
+
+    The callback is called with the number of bytes after each chunk.
+
+    :type src: str
+    :type dst: str
+    :type callback: func or None
+    :rtype: None
+    """
+    dirname, basename = os.path.split(dst)
+    tempPath = os.path.join(dirname, ".{0}.{1}.tmp".format(basename, uuid.uuid4().hex))
+
+    try:
+        with open(src, "rb") as fsrc:
+            with open(tempPath, "wb") as fdst:
+                while True:
+                    data = fsrc.read(CHUNK_SIZE)
+                    if not data:
+                        break
+
+                    fdst.write(data)
+
+                    if callback:
+                        callback(len(data))
+
+        shutil.copystat(src, tempPath)
+        studiolibrary.replaceFile(tempPath, dst)
+
+    except Exception:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
+
+
+def readManifest(path):
+    """
+    Return the files that have been copied by an interrupted copy.
+
+    :type path: str
+    :rtype: dict[str, list]
+    """
+    manifest = {}
+
+    if not os.path.exists(path):
+        return manifest
+
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                relPath, size, mtime = json.loads(line)
+            except ValueError:
+                # The last line may be incomplete after a crash
+                continue
+            manifest[relPath] = [size, mtime]
+
+    return manifest
+
+
+def isResumable(path):
+    """
+    Return True if the given path is a folder left by an interrupted copy.
+
+    :type path: str
+    :rtype: bool
+    """
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def copyTree(src, dst, threads=MAX_THREADS, callback=None, store=None):
+    """
+    Copy the given folder with a pool of threads.
+
+    Each finished file is added to a manifest in the destination. When a
+    manifest exists, files that were copied and have not changed since
+    are skipped. The manifest is removed when the copy is complete.
+
+    Files that are in the given blob store are linked instead of copied.
+
+    The callback is called with the bytes copied and the total bytes.
+
+    :type src: str
+    :type dst: str
+    :type threads: int
+    :type callback: func or None
+    :type store: BlobStore or None
+    :rtype: None
+    """
+    files = []
+
+    for dirpath, dirnames, filenames in os.walk(src):
+        relDir = os.path.relpath(dirpath, src)
+        dstDir = os.path.normpath(os.path.join(dst, relDir))
+
+        if not os.path.exists(dstDir):
+            os.makedirs(dstDir)
+
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            relPath = os.path.normpath(os.path.join(relDir, filename))
+            files.append((relPath, stat.st_size, stat.st_mtime))
+
+    manifestPath = os.path.join(dst, MANIFEST_NAME)
+    manifest = readManifest(manifestPath)
+
+    todo = []
+    total = 0
+    state = {"copied": 0}
+
+    for relPath, size, mtime in files:
+        total += size
+
+        dstPath = os.path.join(dst, relPath)
+        if manifest.get(relPath) == [size, mtime] and os.path.exists(dstPath) \
+                and os.path.getsize(dstPath) == size:
+            state["copied"] += size
+        else:
+            todo.append((relPath, size, mtime))
+
+    if manifest:
+        logger.debug("Resuming copy %s (%d of %d files left)", src, len(todo), len(files))
+
+    lock = threading.Lock()
+
+    def progress(count):
+        with lock:
+            state["copied"] += count
+            copied = state["copied"]
+        if callback:
+            callback(copied, total)
+
+    with open(manifestPath, "a") as manifestFile:
+
+        def copy(item):
+            relPath, size, mtime = item
+            srcPath = os.path.join(src, relPath)
+            dstPath = os.path.join(dst, relPath)
+
+            if store is not None and store.copy(srcPath, dstPath):
+                progress(size)
+            else:
+                copyFile(srcPath, dstPath, progress)
+
+            with lock:
+                manifestFile.write(json.dumps([relPath, size, mtime]) + "\n")
+                manifestFile.flush()
+
+        if threads > 1 and len(todo) > 1:
+            pool = ThreadPool(min(threads, len(todo)))
+            try:
+                pool.map(copy, todo)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for item in todo:
+                copy(item)
+
+    os.remove(manifestPath)
+
+    if callback:
+        callback(total, total)
+
+
+def copyPath(src, dst, callback=None):
+    """
+    Copy the given file or folder.
+
+    :type src: str
+    :type dst: str
+    :type callback: func or None
+    :rtype: None
+    """
+    if os.path.isdir(src):
+        store = BlobStore.find(src)
+        copyTree(src, dst, callback=callback, store=store)
+        shutil.copystat(src, dst)
+    else:
+        copyFile(src, dst)
+
+
+def removePath(path):
+    """
+    Remove the given file or folder.
+
+    :type path: str
+    :rtype: None
+    """
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+class FileTransaction(object):
+
+    MOVE = "move"
+    COPY = "copy"
+
+    def __init__(self, threads=MAX_THREADS, callback=None):
+        """
+        :type threads: int
+        :type callback: func or None
+        """
+        self._threads = threads
+        self._callback = callback
+        self._operations = []
+        self._done = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        if t is None:
+            self.commit()
+
+    def setCallback(self, callback):
+        """
+        Set the function that is called with the bytes copied and the total.
+
+        The function is called from the copy threads.
+
+        :type callback: func or None
+        :rtype: None
+        """
+        self._callback = callback
+
+    def move(self, src, dst):
+        """
+        Add an operation to move the given path.
+
+        :type src: str
+        :type dst: str
+        :rtype: None
+        """
+        self._operations.append((self.MOVE, src, dst))
+
+    def copy(self, src, dst):
+        """
+        Add an operation to copy the given path.
+
+        A folder left by an interrupted copy to the same dst is resumed.
+
+        :type src: str
+        :type dst: str
+        :rtype: None
+        """
+        self._operations.append((self.COPY, src, dst))
+
+    def trash(self, src, trashPath):
+        """
+        Add an operation to move the given path into the trash folder.
+
+        A time stamp is added to the name when it already exists there.
+
+        :type src: str
+        :type trashPath: str
+        :rtype: str
+        """
+        basename = os.path.basename(src.rstrip("/\\"))
+        dst = os.path.join(trashPath, basename)
+
+        if os.path.exists(dst) or dst in self.destinations():
+            name, ext = os.path.splitext(basename)
+            stamp = str(time.time()).replace(".", "")
+            dst = os.path.join(trashPath, "{0}_{1}{2}".format(name, stamp, ext))
+
+        self.move(src, dst)
+
+        return dst
+
+    def operations(self):
+        """
+        :rtype: list[(str, str, str)]
+        """
+        return self._operations
+
+    def destinations(self):
+        """
+        :rtype: list[str]
+        """
+        return [dst for op, src, dst in self._operations]
+
+    def changes(self):
+        """
+        Return the (src, dst) paths of the operations that have been done.
+
+        :rtype: list[(str, str)]
+        """
+        return [(src, dst) for op, src, dst in self._done]
+
+    def validate(self):
+        """
+        Check all the operations before anything is changed.
+
+        :raises: FileTransactionError
+        :rtype: None
+        """
+        destinations = set()
+
+        for op, src, dst in self._operations:
+            if not os.path.exists(src):
+                msg = "The path does not exist: {0}".format(src)
+                raise FileTransactionError(msg)
+
+            resume = op == self.COPY and isResumable(dst)
+
+            if (os.path.exists(dst) and not resume) or dst in destinations:
+                msg = "The path already exists: {0}".format(dst)
+                raise FileTransactionError(msg)
+
+            if (dst + os.path.sep).startswith(src.rstrip("/\\") + os.path.sep):
+                msg = "Cannot move or copy a folder into itself: {0}".format(src)
+                raise FileTransactionError(msg)
+
+            destinations.add(dst)
+
+    def commit(self):
+        """
+        Run all the operations or none of them.
+
+        :raises: FileTransactionError
+        :rtype: list[(str, str)]
+        """
+        self.validate()
+
+        renames = []
+        others = []
+
+        for operation in self._operations:
+            op, src, dst = operation
+            if op == self.MOVE and isSameDevice(src, dst):
+                renames.append(operation)
+            else:
+                others.append(operation)
+
+        try:
+            self._run(renames, parallel=True)
+            self._run(others, parallel=False)
+        except Exception as error:
+            logger.exception(error)
+            self.rollback()
+            raise FileTransactionError(str(error))
+
+        logger.debug("Committed %d file operations", len(self._done))
+
+        return self.changes()
+
+    def _run(self, operations, parallel=False):
+        """
+        :type operations: list[(str, str, str)]
+        :type parallel: bool
+        :rtype: None
+        """
+        if not operations:
+            return
+
+        if parallel and self._threads > 1 and len(operations) > 1:
+            pool = ThreadPool(min(self._threads, len(operations)))
+            try:
+                results = pool.map(self._runOperation, operations)
+            finally:
+                pool.close()
+                pool.join()
+
+            errors = [error for error in results if error]
+            if errors:
+                raise errors[0]
+        else:
+            for operation in operations:
+                error = self._runOperation(operation)
+                if error:
+                    raise error
+
+    def _runOperation(self, operation):
+        """
+        Run the given operation and return the error if it failed.
+
+        :type operation: (str, str, str)
+        :rtype: Exception or None
+        """
+        op, src, dst = operation
+
+        try:
+            dirname = os.path.dirname(dst)
+            if dirname and not os.path.exists(dirname):
+                try:
+                    os.makedirs(dirname)
+                except OSError:
+                    # Another worker may have created it
+                    if not os.path.isdir(dirname):
+                        raise
+
+            if op == self.MOVE:
+                shutil.move(src, dst)
+            else:
+                copyPath(src, dst, callback=self._callback)
+
+        except Exception as error:
+            # Remove what a failed copy has already written, unless the
+            # copy can be resumed by running the same copy again.
+            if op == self.COPY and os.path.exists(dst):
+                if isResumable(dst):
+                    logger.warning("The copy can be resumed: %s", dst)
+                else:
+                    removePath(dst)
+            return error
+
+        self._done.append(operation)
+        return None
+
+    def rollback(self):
+        """
+        Undo the operations that have been done in reverse order.
+
+        :rtype: None
+        """
+        while self._done:
+            op, src, dst = self._done.pop()
+
+            try:
+                if op == self.MOVE:
+                    shutil.move(dst, src)
+                else:
+                    removePath(dst)
+            except Exception:
+                logger.exception("Cannot roll back %s %s -> %s", op, src, dst)
@@ -246,6 +246,18 @@ class LibraryItem(studioqt.CombinedWidgetItem):
 
         return widget
 
+    def prefetch(self, items):
+        """
+        Read the data for the given items that the user may select next.
+
+        Called when the item is selected with the items next to it in the
+        view, nearest first in the direction the user is moving in.
+
+        :type items: list[LibraryItem]
+        :rtype: None
+        """
+        pass
+
     def contextEditMenu(self, menu, items=None):
         """
         Called when the user would like to edit the item from the menu.
@@ -450,12 +462,17 @@ class LibraryItem(studioqt.CombinedWidgetItem):
         logger.debug(u'Loading "{0}"'.format(self.name()))
         LibraryItem.loaded.emit(self)
 
-    def save(self, path=None, contents=None):
+    def save(self, path=None, contents=None, stagingPath=None):
         """
         Save the item to the given path.
 
+        When a staging path is given, the folder is renamed to the item
+        path with a single rename instead of moving the contents. The
+        staging folder must be on the same disc as the item path.
+
         :type path: str or None
         :type contents: list[str] or None
+        :type stagingPath: str or None
         :rtype: None
         """
         path = path or self.path()
@@ -470,7 +487,10 @@ class LibraryItem(studioqt.CombinedWidgetItem):
         if os.path.exists(path):
             self.showAlreadyExistsDialog()
 
-        studiolibrary.movePaths(contents, path)
+        if stagingPath:
+            os.rename(stagingPath, path)
+        else:
+            studiolibrary.movePaths(contents, path)
 
         if self.database():
             self.database().addPath(path)
@@ -32,6 +32,13 @@ __all__ = ["LibraryWidget"]
 logger = logging.getLogger(__name__)
 
 
+# The number of items to prefetch in the direction of movement
+PREFETCH_AHEAD = 4
+
+# The number of items to prefetch in the other direction
+PREFETCH_BEHIND = 1
+
+
 class PreviewFrame(QtWidgets.QFrame):
     pass
 
@@ -40,6 +47,106 @@ class FoldersFrame(QtWidgets.QFrame):
     pass
 
 
+class FileTransactionThread(QtCore.QThread):
+    """
+    Commit a file transaction without blocking the user interface.
+    """
+    progressChanged = QtCore.Signal(object, object)
+
+    def __init__(self, transaction, parent=None):
+        """
+        :type transaction: studiolibrary.FileTransaction
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QThread.__init__(self, parent)
+
+        self._error = None
+        self._changes = []
+        self._transaction = transaction
+
+        # The copy threads emit the progress and Qt queues it to the receiver
+        self._transaction.setCallback(self.progressChanged.emit)
+
+    def error(self):
+        """
+        :rtype: Exception or None
+        """
+        return self._error
+
+    def changes(self):
+        """
+        :rtype: list[(str, str)]
+        """
+        return self._changes
+
+    def run(self):
+        """
+        :rtype: None
+        """
+        try:
+            self._changes = self._transaction.commit()
+        except Exception as error:
+            self._error = error
+
+
+class ItemScanThread(QtCore.QThread):
+    """
+    Find the item paths and read the item data without blocking the user interface.
+    """
+
+    def __init__(self, folders, depth, database=None, parent=None):
+        """
+        :type folders: list[str]
+        :type depth: int
+        :type database: studiolibrary.Database or None
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QThread.__init__(self, parent)
+
+        self._data = {}
+        self._error = None
+        self._depth = depth
+        self._results = []
+        self._folders = folders
+        self._database = database
+
+    def error(self):
+        """
+        :rtype: Exception or None
+        """
+        return self._error
+
+    def data(self):
+        """
+        Return the item data that was read from the database.
+
+        :rtype: dict
+        """
+        return self._data
+
+    def results(self):
+        """
+        Return the item paths that were found with their item classes.
+
+        :rtype: list[(str, type)]
+        """
+        return self._results
+
+    def run(self):
+        """
+        :rtype: None
+        """
+        try:
+            for folder in self._folders:
+                self._results.extend(studiolibrary.findItemClasses(folder, self._depth))
+
+            if self._database:
+                self._data = self._database.read()
+
+        except Exception as error:
+            self._error = error
+
+
 class GlobalSignal(QtCore.QObject):
     """
     Triggered for all library instance.
@@ -172,8 +279,10 @@ class LibraryWidget(QtWidgets.QWidget):
 
         self.setObjectName("studiolibrary")
 
+        # Send the analytics after the window has been shown
         version = studiolibrary.version()
-        studiolibrary.sendAnalytics("MainWindow", version=version)
+        callback = partial(studiolibrary.sendAnalytics, "MainWindow", version=version)
+        QtCore.QTimer.singleShot(0, callback)
 
         resource = studiolibrary.resource()
         self.setWindowIcon(resource.icon("icon_black"))
@@ -183,6 +292,7 @@ class LibraryWidget(QtWidgets.QWidget):
         self._name = name or self.DEFAULT_NAME
         self._theme = None
         self._database = None
+        self._settingsStore = None
         self._isDebug = False
         self._isLocked = False
         self._isLoaded = False
@@ -190,6 +300,11 @@ class LibraryWidget(QtWidgets.QWidget):
         self._currentItem = None
         self._refreshEnabled = False
 
+        self._prefetchItem = None
+        self._prefetchDirection = 1
+
+        self._restorePathEnabled = True
+
         self._superusers = None
         self._lockRegExp = None
         self._unlockRegExp = None
@@ -200,6 +315,10 @@ class LibraryWidget(QtWidgets.QWidget):
         self._itemsHiddenCount = 0
         self._itemsVisibleCount = 0
 
+        self._transactionThread = None
+        self._itemScanThread = None
+        self._asyncRefreshEnabled = False
+
         self._isTrashFolderVisible = False
         self._foldersWidgetVisible = True
         self._previewWidgetVisible = True
@@ -219,7 +338,7 @@ class LibraryWidget(QtWidgets.QWidget):
         self._searchWidget.setToolTip(tip)
         self._searchWidget.setStatusTip(tip)
 
-        self._statusWidget = studioqt.StatusWidget(self)
+        self._statusWidget = None
         self._menuBarWidget = studioqt.MenuBarWidget()
         self._foldersWidget = studioqt.TreeWidget(self)
 
@@ -298,7 +417,6 @@ class LibraryWidget(QtWidgets.QWidget):
 
         self.layout().addWidget(self._menuBarWidget)
         self.layout().addWidget(self._splitter)
-        self.layout().addWidget(self._statusWidget)
 
         vbox = QtWidgets.QVBoxLayout()
         self._previewFrame.setLayout(vbox)
@@ -362,6 +480,9 @@ class LibraryWidget(QtWidgets.QWidget):
         self.setPreviewWidgetFromItem(item)
         self.itemSelectionChanged.emit(item)
 
+        if item:
+            self.prefetchItems(item)
+
     def _itemDropped(self, event):
         """
         Triggered when items are dropped on the items widget or folders widget.
@@ -398,9 +519,17 @@ class LibraryWidget(QtWidgets.QWidget):
     def statusWidget(self):
         """
         Return the status widget.
+
+        The widget is created the first time it is needed, so it is not
+        built before a deferred window is painted.
         
         :rtype: studioqt.StatusWidget
         """
+        if self._statusWidget is None:
+            self._statusWidget = studioqt.StatusWidget(self)
+            self._statusWidget.setVisible(self._statusBarWidgetVisible)
+            self.layout().addWidget(self._statusWidget)
+
         return self._statusWidget
 
     def searchWidget(self):
@@ -631,11 +760,13 @@ class LibraryWidget(QtWidgets.QWidget):
     def updateFolders(self):
         """
         Update the folders to be shown in the folders widget.
+
+        Only the root folder is created. The folders widget loads the
+        other folders with self.folderPaths when they are needed.
         
         :rtype: None 
         """
         rootPath = self.path()
-        trashPath = self.trashPath()
 
         paths = {
             rootPath: {
@@ -646,20 +777,37 @@ class LibraryWidget(QtWidgets.QWidget):
             }
         }
 
-        for item in studiolibrary.findItems(rootPath):
+        self.foldersWidget().setChildLoader(self.folderPaths)
+        self.foldersWidget().setPaths(paths, root=rootPath)
+
+    def folderPaths(self, path):
+        """
+        Return the folders directly inside the given path with their settings.
+
+        This is also called from the folders widget's loader thread, so it
+        only reads the disc and returns plain paths.
+
+        :type path: str
+        :rtype: dict
+        """
+        trashPath = self.trashPath()
+
+        paths = {}
+
+        for item in studiolibrary.findItems(path, depth=1):
 
             if self.isValidInFolderView(item):
 
-                path = item.path()
-                paths[path] = {}
+                path_ = item.path()
+                paths[path_] = {}
 
-                if trashPath == path:
+                if trashPath == path_:
                     iconPath = studioqt.resource.get("icons", "delete.png")
-                    paths[path] = {
+                    paths[path_] = {
                         "iconPath": iconPath
                     }
 
-        self.foldersWidget().setPaths(paths, root=rootPath)
+        return paths
 
     def isValidInFolderView(self, item):
         """
@@ -809,15 +957,20 @@ class LibraryWidget(QtWidgets.QWidget):
             self.selectItems(items)
             self.scrollToSelectedItem()
 
-    def setItems(self, items):
+    def setItems(self, items, data=None):
         """
         Set the items for the library widget.
 
+        The item data is read from the database when it is not given.
+
+        :type items: list[studiolibrary.LibraryItem]
+        :type data: dict or None
         :rtype: list[studiolibrary.LibraryItem]
         """
         selectedItems = self.selectedItems()
 
-        data = self.readItemData()
+        if data is None:
+            data = self.readItemData()
 
         self.itemsWidget().setItems(items, data=data, sortEnabled=True)
 
@@ -826,13 +979,53 @@ class LibraryWidget(QtWidgets.QWidget):
         if selectedItems:
             self.selectItems(selectedItems)
 
-    @studioqt.showWaitCursor
+    def isAsyncRefreshEnabled(self):
+        """
+        Return True if the items are found in a worker thread.
+
+        :rtype: bool
+        """
+        return self._asyncRefreshEnabled
+
+    def setAsyncRefreshEnabled(self, enable):
+        """
+        Set if the items are found in a worker thread when refreshing.
+
+        The folders are walked and the database is read in the worker, so
+        the window stays responsive while a large library is loading. The
+        items are created in the main thread when the worker has finished.
+
+        :type enable: bool
+        :rtype: None
+        """
+        self._asyncRefreshEnabled = enable
+
+    def isScanningItems(self):
+        """
+        Return True if the items are being found in a worker thread.
+
+        :rtype: bool
+        """
+        return self._itemScanThread is not None
+
     def refreshItems(self):
         """
         Refresh the items for the library widget.
 
         :rtype: list[studiolibrary.LibraryItem]
         """
+        if self.isAsyncRefreshEnabled():
+            self.scanItems()
+        else:
+            self._refreshItems()
+
+    @studioqt.showWaitCursor
+    def _refreshItems(self):
+        """
+        Refresh the items and wait for them to be found.
+
+        :rtype: None
+        """
         elapsedTime = time.time()
 
         paths = self.itemsWidget().selectedPaths()
@@ -844,6 +1037,18 @@ class LibraryWidget(QtWidgets.QWidget):
         elapsedTime = time.time() - elapsedTime
         self.showRefreshMessage(elapsedTime)
 
+    def itemSearchDepth(self):
+        """
+        Return the folder depth to search for items.
+
+        :rtype: int
+        """
+        depth = 1
+        if self.isRecursiveSearchEnabled():
+            depth = self.RECURSIVE_SEARCH_DEPTH
+
+        return depth
+
     def updateItems(self):
         """
         Update the items to be shown in the items widget.
@@ -854,19 +1059,68 @@ class LibraryWidget(QtWidgets.QWidget):
 
         self.clearItems()
 
-        depth = 1
-        if self.isRecursiveSearchEnabled():
-            depth = self.RECURSIVE_SEARCH_DEPTH
-
         items = list(studiolibrary.findItemsInFolders(
             paths,
-            depth,
+            self.itemSearchDepth(),
             libraryWidget=self,
             )
         )
 
         self.setItems(items)
 
+    def scanItems(self):
+        """
+        Find the items for the selected folders in a worker thread.
+
+        The current items are replaced when the worker has finished. A
+        scan that is still running is ignored when a new one starts.
+
+        :rtype: None
+        """
+        thread = ItemScanThread(
+            self.selectedFolderPaths(),
+            self.itemSearchDepth(),
+            database=self.database(),
+            parent=self,
+        )
+
+        selectedPaths = self.itemsWidget().selectedPaths()
+
+        thread.finished.connect(
+            partial(self._itemScanFinished, thread, selectedPaths, time.time())
+        )
+
+        self._itemScanThread = thread
+        thread.start()
+
+    def _itemScanFinished(self, thread, selectedPaths, startTime):
+        """
+        Triggered in the main thread when an item scan has finished.
+
+        :type thread: ItemScanThread
+        :type selectedPaths: list[str]
+        :type startTime: float
+        :rtype: None
+        """
+        thread.deleteLater()
+
+        if thread is not self._itemScanThread:
+            return
+
+        self._itemScanThread = None
+
+        if thread.error():
+            self.showExceptionDialog("Refresh Error", thread.error())
+            return
+
+        items = [cls(path, libraryWidget=self) for path, cls in thread.results()]
+
+        self.clearItems()
+        self.setItems(items, data=thread.data())
+        self.itemsWidget().selectPaths(selectedPaths)
+
+        self.showRefreshMessage(time.time() - startTime)
+
     def createItemsFromUrls(self, urls):
         """
         Return a new list of items from the given urls.
@@ -1338,6 +1592,11 @@ class LibraryWidget(QtWidgets.QWidget):
     def moveItems(self, items, dst, copy=False, force=False):
         """
         Move the given items to the destination folder path.
+
+        All the items are moved or copied as one file transaction in a
+        background thread. The copy progress is shown in the status
+        widget. When the transaction is done the database is written once
+        and the items are updated in place.
         
         :type items: list[studiolibrary.LibraryItem]
         :type dst: str
@@ -1345,31 +1604,122 @@ class LibraryWidget(QtWidgets.QWidget):
         :type force: bool
         :rtype: None 
         """
+        if self._transactionThread and self._transactionThread.isRunning():
+            self.showWarningMessage("Please wait for the current move to finish.")
+            return
+
         self.itemsWidget().clearSelection()
 
-        movedItems = []
+        transaction = studiolibrary.FileTransaction()
 
-        try:
-            for item in items:
+        for item in items:
 
-                path = dst + "/" + item.name()
+            path = dst + "/" + item.name()
 
-                if force:
-                    path = studiolibrary.generateUniquePath(path)
+            if force:
+                path = studiolibrary.generateUniquePath(path)
+
+            if copy:
+                transaction.copy(item.path(), path)
+            else:
+                transaction.move(item.path(), path)
 
-                if copy:
-                    item.copy(path)
-                else:
-                    item.rename(path)
+        thread = FileTransactionThread(transaction, self)
+
+        thread.progressChanged.connect(
+            self._transactionProgressChanged,
+            QtCore.Qt.QueuedConnection
+        )
+
+        thread.finished.connect(
+            partial(self._transactionFinished, thread, items, copy)
+        )
+
+        self._transactionThread = thread
+        thread.start()
+
+    def _transactionProgressChanged(self, copied, total):
+        """
+        Triggered in the main thread when the copy progress has changed.
 
+        :type copied: int
+        :type total: int
+        :rtype: None
+        """
+        if total:
+            msg = "Copying {0}% ({1:.1f} of {2:.1f} MB)"
+            msg = msg.format(100 * copied / total, copied / 1048576.0, total / 1048576.0)
+            self.statusWidget().showInfoMessage(msg)
+
+    def _transactionFinished(self, thread, items, copy):
+        """
+        Triggered when the file transaction for moveItems has finished.
+
+        :type thread: FileTransactionThread
+        :type items: list[studiolibrary.LibraryItem]
+        :type copy: bool
+        :rtype: None
+        """
+        self._transactionThread = None
+        thread.deleteLater()
+
+        if thread.error():
+            self.showExceptionDialog("Move Error", thread.error())
+            return
+
+        changes = thread.changes()
+        paths = [dst for src, dst in changes]
+
+        db = self.database()
+
+        if copy:
+            if db:
+                db.addPaths(paths)
+
+            movedItems = list(studiolibrary.itemsFromPaths(paths, libraryWidget=self))
+        else:
+            if db:
+                db.renamePaths(changes)
+
+            itemsByPath = dict((item.path(), item) for item in items)
+
+            movedItems = []
+            for src, dst in changes:
+                item = itemsByPath[src]
+                item.setPath(dst)
                 movedItems.append(item)
 
-        except Exception as error:
-            self.showExceptionDialog("Move Error", error)
-            raise
-        finally:
-            self.refresh()
-            self.selectItems(movedItems)
+            self.itemsWidget().removeItems(movedItems)
+
+        visibleItems = [item for item in movedItems if self.isPathVisible(item.path())]
+        if visibleItems:
+            self.addItems(visibleItems)
+
+        if [item for item in movedItems if item.DisplayInFolderView]:
+            self.refreshFolders()
+
+        self.selectItems(movedItems)
+
+        msg = "{0} {1} item(s)".format("Copied" if copy else "Moved", len(movedItems))
+        self.showInfoMessage(msg)
+
+    def isPathVisible(self, path):
+        """
+        Return True if the item for the given path is shown for the selected folders.
+
+        :type path: str
+        :rtype: bool
+        """
+        dirname = os.path.dirname(path)
+
+        for folder in self.selectedFolderPaths():
+            if dirname == folder:
+                return True
+
+            if self.isRecursiveSearchEnabled() and dirname.startswith(folder + "/"):
+                return True
+
+        return False
 
     # -----------------------------------------------------------------------
     # Support for search
@@ -1461,6 +1811,11 @@ class LibraryWidget(QtWidgets.QWidget):
         value = bool(value)
 
         self._statusBarWidgetVisible = value
+
+        # The status widget is shown or hidden when it is created
+        if self._statusWidget is None:
+            return
+
         if value:
             self.statusWidget().show()
         else:
@@ -1621,6 +1976,61 @@ class LibraryWidget(QtWidgets.QWidget):
         else:
             self.clearPreviewWidget()
 
+    def nextItems(self, item, direction=1, count=1):
+        """
+        Return the visible items after the given item in the view.
+
+        :type item: studiolibrary.LibraryItem
+        :type direction: int
+        :type count: int
+        :rtype: list[studiolibrary.LibraryItem]
+        """
+        items = []
+        treeWidget = self.itemsWidget().treeWidget()
+
+        while len(items) < count:
+            if direction > 0:
+                item = treeWidget.itemBelow(item)
+            else:
+                item = treeWidget.itemAbove(item)
+
+            if item is None:
+                break
+
+            if not isinstance(item, studioqt.CombinedWidgetItemGroup):
+                items.append(item)
+
+        return items
+
+    def prefetchItems(self, item):
+        """
+        Let the given item read the data for the items around it.
+
+        The direction the user is moving in is taken from the previous
+        selected item.
+
+        :type item: studiolibrary.LibraryItem
+        :rtype: None
+        """
+        previous = self._prefetchItem
+        self._prefetchItem = item
+
+        try:
+            if previous is not None and previous is not item:
+                if previous in self.nextItems(item, -1, PREFETCH_AHEAD):
+                    self._prefetchDirection = 1
+                elif previous in self.nextItems(item, 1, PREFETCH_AHEAD):
+                    self._prefetchDirection = -1
+
+            direction = self._prefetchDirection
+
+            items = self.nextItems(item, direction, PREFETCH_AHEAD)
+            items.extend(self.nextItems(item, -direction, PREFETCH_BEHIND))
+
+            item.prefetch(items)
+        except Exception as error:
+            logger.exception(error)
+
     def previewWidget(self):
         """
         Return the current preview widget.
@@ -1686,6 +2096,22 @@ class LibraryWidget(QtWidgets.QWidget):
         """
         return studiolibrary.formatPath(self.SETTINGS_PATH)
 
+    def settingsStore(self):
+        """
+        Return the in memory store for the settings path.
+
+        :rtype: studiolibrary.SettingsStore
+        """
+        path = self.settingsPath()
+
+        if not self._settingsStore or self._settingsStore.path() != path:
+            if self._settingsStore:
+                self._settingsStore.flush()
+
+            self._settingsStore = studiolibrary.SettingsStore(path, parent=self)
+
+        return self._settingsStore
+
     def geometrySettings(self):
         """
         Return the geometry values as a list.
@@ -1771,7 +2197,7 @@ class LibraryWidget(QtWidgets.QWidget):
             if themeSettings:
                 self.setThemeSettings(themeSettings)
 
-            if not self.path():
+            if not self.path() and self.isRestorePathEnabled():
                 path = settings.get("path")
                 if path and os.path.exists(path):
                     self.setPath(path)
@@ -1832,23 +2258,24 @@ class LibraryWidget(QtWidgets.QWidget):
         data.update(settings)
         self.saveSettings(data)
 
-    def saveSettings(self, settings=None):
+    def saveSettings(self, settings=None, flush=False):
         """
-        Save the settings to the self.settingsPath() as a json format.
+        Save the settings to the self.settingsPath() after a short delay.
+
+        Use flush=True to write them to disc now, for example when the
+        application is about to quit and the delay will never elapse.
 
         :type settings: dict or None
+        :type flush: bool
         :rtype: None
         """
         settings = settings or self.settings()
 
         key = self.name()
-        path = self.settingsPath()
+        self.settingsStore().update({key: settings})
 
-        data = studiolibrary.readJson(path)
-        data[key] = settings
-
-        logger.debug("Saving settings {path}".format(path=path))
-        studiolibrary.saveJson(path, data)
+        if flush:
+            self.settingsStore().flush()
 
     @studioqt.showWaitCursor
     def loadSettings(self):
@@ -1868,17 +2295,32 @@ class LibraryWidget(QtWidgets.QWidget):
         :rtype: dict
         """
         key = self.name()
-        path = self.settingsPath()
         data = {}
 
-        logger.debug(u"Reading settings {path}".format(path=path))
-
         try:
-            data = studiolibrary.readJson(path)
+            data = self.settingsStore().data()
         except Exception as error:
             logging.exception(error)
 
-        return data.get(key, {})
+        return copy.deepcopy(data.get(key, {}))
+
+    def setRestorePathEnabled(self, enabled):
+        """
+        Set if the path is restored from the settings when they are loaded.
+
+        This is disabled when the path is set after the window is shown,
+        so the library is not read twice.
+
+        :type enabled: bool
+        :rtype: None
+        """
+        self._restorePathEnabled = enabled
+
+    def isRestorePathEnabled(self):
+        """
+        :rtype: bool
+        """
+        return self._restorePathEnabled
 
     def isLoaded(self):
         """
@@ -1965,7 +2407,7 @@ class LibraryWidget(QtWidgets.QWidget):
         :type event: QtWidgets.QEvent
         :rtype: None
         """
-        self.saveSettings()
+        self.saveSettings(flush=True)
         QtWidgets.QWidget.closeEvent(self, event)
 
     def show(self):
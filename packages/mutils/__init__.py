@@ -22,12 +22,21 @@ import namespace
 from scriptjob import ScriptJob
 from matchnames import matchNames, groupObjects
 
-from node import Node
+from node import Node, ShortNameResolver
+from querycache import QueryCache
 from attribute import Attribute
+from capture import captureAttrs
 
-from transferobject import TransferObject
+from studiolibrary.atomicwrite import AtomicFile, atomicWrite
+from jsonstream import JsonStreamReader, JsonStreamWriter
+from binaryfile import BINARY_EXTENSION, isBinaryPath
+from binaryfile import readBinary, readBinaryMetadata, writeBinary
+from animcurve import AnimCurve, saveAnimCurves, readAnimCurves
+from transferobject import TransferObject, resolveTransferPath
+from transfercache import TransferCache, transferCache
 
 from selectionset import SelectionSet, saveSelectionSet
 from pose import Pose, savePose, loadPose
 from animation import Animation, PasteOption, saveAnim, loadAnims
 from mirrortable import MirrorTable, MirrorOption, saveMirrorTable
+from mirrorlocator import findMirrorTables, loadMirrorTable, clearMirrorTableCache
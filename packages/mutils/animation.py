@@ -32,6 +32,9 @@ MIN_TIME_LIMIT = -10000
 MAX_TIME_LIMIT = 100000
 DEFAULT_FILE_TYPE = "mayaBinary"  # "mayaAscii"
 
+# Saves the keys as packed curve data instead of exporting a Maya file
+CURVES_FILE_TYPE = "animCurves"
+
 
 class PasteOption:
 
@@ -406,6 +409,12 @@ class Animation(mutils.Pose):
             mayaPath = os.path.join(self.path(), "animation.ma")
         return mayaPath
 
+    def curvesPath(self):
+        """
+        :rtype: str
+        """
+        return os.path.join(self.path(), "animation.curves")
+
     def poseJsonPath(self):
         """
         :rtype: str
@@ -422,6 +431,9 @@ class Animation(mutils.Pose):
         if os.path.exists(self.mayaPath()):
             result.append(self.mayaPath())
 
+        if os.path.exists(self.curvesPath()):
+            result.append(self.curvesPath())
+
         if os.path.exists(self.poseJsonPath()):
             result.append(self.poseJsonPath())
 
@@ -468,14 +480,24 @@ class Animation(mutils.Pose):
 
     @mutils.unifyUndo
     @mutils.restoreSelection
-    def open(self):
+    def open(self, curves=None, time=None):
         """
         The reason we use importing and not referencing is because we
         need to modify the imported animation curves and modifying
         referenced animation curves is only supported in Maya 2014+
+
+        The curves and time range are only used for the anim curves
+        file type, a Maya file is always imported completely.
+
+        :type curves: list[str] or None
+        :type time: (int, int) or None
+        :rtype: list[str]
         """
         self.close()  # Make sure everything is cleaned before importing
 
+        if os.path.exists(self.curvesPath()):
+            return self.createAnimCurves(curves=curves, time=time)
+
         nodes = maya.cmds.file(
             self.mayaPath(),
             i=True,
@@ -487,6 +509,51 @@ class Animation(mutils.Pose):
 
         return nodes
 
+    def createAnimCurves(self, curves=None, time=None):
+        """
+        Create the saved anim curves in the import namespace.
+
+        Only the given curves and the keys around the given time range
+        are read from disc.
+
+        :type curves: list[str] or None
+        :type time: (int, int) or None
+        :rtype: list[str]
+        """
+        nodes = []
+        curves = mutils.readAnimCurves(self.curvesPath(), names=curves, time=time)
+
+        maya.cmds.namespace(add=Animation.IMPORT_NAMESPACE)
+
+        for name, curve in curves.items():
+            name = Animation.IMPORT_NAMESPACE + ":" + name
+            nodes.append(curve.create(name))
+
+        return nodes
+
+    def curvesFrameRange(self, time=None):
+        """
+        Return the first and last key of all the saved anim curves.
+
+        The range is read from the file so that it is the same when only
+        some of the curves are created.
+
+        :type time: (int, int) or None
+        :rtype: (int, int)
+        """
+        toc = mutils.animcurve.readAnimCurvesToc(self.curvesPath())
+        ranges = [c["frameRange"] for c in toc["curves"].values() if c["frameRange"]]
+
+        result = (min(r[0] for r in ranges), max(r[1] for r in ranges))
+
+        if time:
+            try:
+                result = clampRange(time, result)
+            except OutOfBoundsError as error:
+                logger.warning(error)
+
+        return result
+
     def close(self):
         """
         Clean up all imported nodes, as well as the namespace.
@@ -520,9 +587,51 @@ class Animation(mutils.Pose):
                     results.append("// End")
                     break
 
-        with open(path, "w") as f:
+        with mutils.atomicWrite(path) as f:
             f.writelines(results)
 
+    def saveAnimCurves(self, path, objects, time):
+        """
+        Save the keys for the given objects as packed curve data.
+
+        This is much faster than exporting a Maya file since no nodes
+        are duplicated and the file can be read without Maya. The end
+        time is exclusive like the copyKey call when exporting a Maya file.
+
+        :type path: str
+        :type objects: list[str]
+        :type time: (int, int)
+        :rtype: None
+        """
+        curves = {}
+
+        for name in objects:
+            attrs = maya.cmds.listAttr(name, unlocked=True, keyable=True) or []
+            attrs = list(set(attrs) - set(['translate', 'rotate', 'scale']))
+
+            for attr in attrs:
+                srcCurve = mutils.Attribute(name, attr).animCurve()
+
+                if srcCurve:
+                    curve = mutils.AnimCurve.fromCurve(
+                        srcCurve,
+                        time=time,
+                        includeUpperBound=False,
+                    )
+
+                    if curve.count():
+                        curveName = "CURVE{0}".format(len(curves) + 1)
+                        curves[curveName] = curve
+                        self.setAnimCurve(name, attr, curveName)
+
+        curvesPath = os.path.join(path, "animation.curves")
+        posePath = os.path.join(path, "pose.json")
+        mutils.Pose.save(self, posePath)
+
+        if curves:
+            logger.info("Saving animation: %s" % curvesPath)
+            mutils.saveAnimCurves(curvesPath, curves)
+
     @mutils.timing
     @mutils.unifyUndo
     @mutils.showWaitCursor
@@ -592,61 +701,65 @@ class Animation(mutils.Pose):
                 maya.cmds.undoInfo(openChunk=True)
                 mutils.bakeConnected(objects, time=(start, end), sampleBy=sampleBy)
 
-            for name in objects:
-                if maya.cmds.copyKey(name, time=(start, end), includeUpperBound=False, option="keys"):
+            if fileType == CURVES_FILE_TYPE:
+                self.saveAnimCurves(path, objects, time=(start, end))
+
+            else:
+                for name in objects:
+                    if maya.cmds.copyKey(name, time=(start, end), includeUpperBound=False, option="keys"):
 
-                    # Might return more than one object when duplicating shapes or blendshapes
-                    transform, = maya.cmds.duplicate(name, name="CURVE", parentOnly=True)
-                    deleteObjects.append(transform)
+                        # Might return more than one object when duplicating shapes or blendshapes
+                        transform, = maya.cmds.duplicate(name, name="CURVE", parentOnly=True)
+                        deleteObjects.append(transform)
 
-                    mutils.disconnectAll(transform)
-                    maya.cmds.pasteKey(transform)
+                        mutils.disconnectAll(transform)
+                        maya.cmds.pasteKey(transform)
 
-                    attrs = maya.cmds.listAttr(transform, unlocked=True, keyable=True) or []
-                    attrs = list(set(attrs) - set(['translate', 'rotate', 'scale']))
+                        attrs = maya.cmds.listAttr(transform, unlocked=True, keyable=True) or []
+                        attrs = list(set(attrs) - set(['translate', 'rotate', 'scale']))
 
-                    for attr in attrs:
-                        dstAttr = mutils.Attribute(transform, attr)
-                        dstCurve = dstAttr.animCurve()
+                        for attr in attrs:
+                            dstAttr = mutils.Attribute(transform, attr)
+                            dstCurve = dstAttr.animCurve()
 
-                        if dstCurve:
+                            if dstCurve:
 
-                            dstCurve = maya.cmds.rename(dstCurve, "CURVE")
-                            deleteObjects.append(dstCurve)
+                                dstCurve = maya.cmds.rename(dstCurve, "CURVE")
+                                deleteObjects.append(dstCurve)
 
-                            srcAttr = mutils.Attribute(name, attr)
-                            srcCurve = srcAttr.animCurve()
+                                srcAttr = mutils.Attribute(name, attr)
+                                srcCurve = srcAttr.animCurve()
 
-                            if srcCurve:
-                                preInfinity = maya.cmds.getAttr(srcCurve + ".preInfinity")
-                                postInfinity = maya.cmds.getAttr(srcCurve + ".postInfinity")
-                                curveColor = maya.cmds.getAttr(srcCurve + ".curveColor")
-                                useCurveColor = maya.cmds.getAttr(srcCurve + ".useCurveColor")
+                                if srcCurve:
+                                    preInfinity = maya.cmds.getAttr(srcCurve + ".preInfinity")
+                                    postInfinity = maya.cmds.getAttr(srcCurve + ".postInfinity")
+                                    curveColor = maya.cmds.getAttr(srcCurve + ".curveColor")
+                                    useCurveColor = maya.cmds.getAttr(srcCurve + ".useCurveColor")
 
-                                maya.cmds.setAttr(dstCurve + ".preInfinity", preInfinity)
-                                maya.cmds.setAttr(dstCurve + ".postInfinity", postInfinity)
-                                maya.cmds.setAttr(dstCurve + ".curveColor", *curveColor[0])
-                                maya.cmds.setAttr(dstCurve + ".useCurveColor", useCurveColor)
+                                    maya.cmds.setAttr(dstCurve + ".preInfinity", preInfinity)
+                                    maya.cmds.setAttr(dstCurve + ".postInfinity", postInfinity)
+                                    maya.cmds.setAttr(dstCurve + ".curveColor", *curveColor[0])
+                                    maya.cmds.setAttr(dstCurve + ".useCurveColor", useCurveColor)
 
-                            if maya.cmds.keyframe(dstCurve, query=True, time=(start, end), keyframeCount=True):
-                                self.setAnimCurve(name, attr, dstCurve)
-                                maya.cmds.cutKey(dstCurve, time=(MIN_TIME_LIMIT, start - 1))
-                                maya.cmds.cutKey(dstCurve, time=(end + 1, MAX_TIME_LIMIT))
-                                validCurves.append(dstCurve)
+                                if maya.cmds.keyframe(dstCurve, query=True, time=(start, end), keyframeCount=True):
+                                    self.setAnimCurve(name, attr, dstCurve)
+                                    maya.cmds.cutKey(dstCurve, time=(MIN_TIME_LIMIT, start - 1))
+                                    maya.cmds.cutKey(dstCurve, time=(end + 1, MAX_TIME_LIMIT))
+                                    validCurves.append(dstCurve)
 
-            fileName = "animation.ma"
-            if fileType == "mayaBinary":
-                fileName = "animation.mb"
+                fileName = "animation.ma"
+                if fileType == "mayaBinary":
+                    fileName = "animation.mb"
 
-            mayaPath = os.path.join(path, fileName)
-            posePath = os.path.join(path, "pose.json")
-            mutils.Pose.save(self, posePath)
+                mayaPath = os.path.join(path, fileName)
+                posePath = os.path.join(path, "pose.json")
+                mutils.Pose.save(self, posePath)
 
-            if validCurves:
-                maya.cmds.select(validCurves)
-                logger.info("Saving animation: %s" % mayaPath)
-                maya.cmds.file(mayaPath, force=True, options='v=0', type=fileType, uiConfiguration=False, exportSelected=True)
-                self.cleanMayaFile(mayaPath)
+                if validCurves:
+                    maya.cmds.select(validCurves)
+                    logger.info("Saving animation: %s" % mayaPath)
+                    maya.cmds.file(mayaPath, force=True, options='v=0', type=fileType, uiConfiguration=False, exportSelected=True)
+                    self.cleanMayaFile(mayaPath)
 
         finally:
             if bakeConnected:
@@ -715,8 +828,19 @@ class Animation(mutils.Pose):
 
             raise mutils.NoMatchFoundError(text)
 
-        # Load the animation data.
-        srcCurves = self.open()
+        # Only create the curves for the attributes that will be pasted
+        curves = []
+
+        for srcNode, dstNode in matches:
+            for attr in self.attrs(srcNode.name()):
+                if attrs is None or attr in attrs:
+                    curve = self.animCurve(srcNode.name(), attr)
+                    if curve:
+                        curves.append(curve)
+
+        # Load the animation data. An empty list reads no curves, when
+        # only static attributes are pasted.
+        srcCurves = self.open(curves=curves, time=sourceTime)
 
         try:
             maya.cmds.flushUndo()
@@ -725,43 +849,48 @@ class Animation(mutils.Pose):
             if currentTime and startFrame is None:
                 startFrame = int(maya.cmds.currentTime(query=True))
 
-            srcTime = findFirstLastKeyframes(srcCurves, sourceTime)
+            if os.path.exists(self.curvesPath()):
+                srcTime = self.curvesFrameRange(sourceTime)
+            else:
+                srcTime = findFirstLastKeyframes(srcCurves, sourceTime)
             dstTime = moveTime(srcTime, startFrame)
 
-            if option != PasteOption.ReplaceCompletely:
+            if option != PasteOption.ReplaceCompletely and srcCurves:
                 insertKeyframe(srcCurves, srcTime)
 
-            for srcNode, dstNode in matches:
-
-                # Remove the first pipe in-case the object has a parent
-                dstNode.stripFirstPipe()
-
-                for attr in self.attrs(srcNode.name()):
-
-                    # Filter any attributes if the parameter has been set
-                    if attrs is not None and attr not in attrs:
-                        continue
-
-                    dstAttr = mutils.Attribute(dstNode.name(), attr)
-                    srcCurve = self.animCurve(srcNode.name(), attr, withNamespace=True)
-
-                    # Skip if the destination attribute does not exists.
-                    if not dstAttr.exists():
-                        logger.debug('Skipping attribute: The destination attribute "%s.%s" does not exist!' %
-                                     (dstAttr.name(), dstAttr.attr()))
-                        continue
-
-                    if srcCurve:
-                        dstAttr.setAnimCurve(
-                            srcCurve,
-                            time=dstTime,
-                            option=option,
-                            source=srcTime,
-                            connect=connect
-                        )
-                    else:
-                        value = self.attrValue(srcNode.name(), attr)
-                        dstAttr.setStaticKeyframe(value, dstTime, option)
+            # Remember the connection and lock state of each plug while pasting
+            with mutils.QueryCache():
+                for srcNode, dstNode in matches:
+
+                    # Remove the first pipe in-case the object has a parent
+                    dstNode.stripFirstPipe()
+
+                    for attr in self.attrs(srcNode.name()):
+
+                        # Filter any attributes if the parameter has been set
+                        if attrs is not None and attr not in attrs:
+                            continue
+
+                        dstAttr = mutils.Attribute(dstNode.name(), attr)
+                        srcCurve = self.animCurve(srcNode.name(), attr, withNamespace=True)
+
+                        # Skip if the destination attribute does not exists.
+                        if not dstAttr.exists():
+                            logger.debug('Skipping attribute: The destination attribute "%s.%s" does not exist!' %
+                                         (dstAttr.name(), dstAttr.attr()))
+                            continue
+
+                        if srcCurve:
+                            dstAttr.setAnimCurve(
+                                srcCurve,
+                                time=dstTime,
+                                option=option,
+                                source=srcTime,
+                                connect=connect
+                            )
+                        else:
+                            value = self.attrValue(srcNode.name(), attr)
+                            dstAttr.setStaticKeyframe(value, dstTime, option)
 
         finally:
             self.close()
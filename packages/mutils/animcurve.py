@@ -0,0 +1,730 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Native storage for animation curves without exporting a Maya scene.
+
+Each curve is stored as packed arrays of key times, values, tangents and
+weights. The file can be read without Maya for previewing and the curves
+are recreated in the scene with a few batched commands.
+
+Layout (little endian):
+
+    header      magic "MUTC", uint16 version
+    toc         uint32 size, utf-8 json with the curve names, their
+                offsets, key counts and static attributes
+    curves      per curve and for "count" keys:
+                    float64[count] times, values,
+                    float64[count] inAngles, outAngles, inWeights, outWeights
+                    uint8[count] inTypes, outTypes, locks, weightLocks
+
+Example:
+    import mutils
+
+    curve = mutils.AnimCurve.fromCurve("pSphere1_translateX", time=(1, 24))
+    mutils.saveAnimCurves("/tmp/animation.curves", {"CURVE1": curve})
+
+    curves = mutils.readAnimCurves("/tmp/animation.curves")
+    print curves["CURVE1"].times(), curves["CURVE1"].values()
+
+    # Only decode the given curves and the keys around the time range
+    curves = mutils.readAnimCurves("/tmp/animation.curves", names=["CURVE1"], time=(10, 20))
+
+    curves["CURVE1"].create("CURVE1")
+"""
+import json
+import struct
+import bisect
+import logging
+
+from multiprocessing.pool import ThreadPool
+
+import mutils
+
+try:
+    import maya.cmds
+except ImportError:
+    import traceback
+    traceback.print_exc()
+
+
+__all__ = [
+    "AnimCurve",
+    "AnimCurveError",
+    "saveAnimCurves",
+    "readAnimCurves",
+    "readAnimCurvesToc",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b"MUTC"
+VERSION = 1
+
+HEADER = struct.Struct("<4sH")
+UINT32 = struct.Struct("<I")
+
+# The packed arrays stored for each curve in the order they are written
+FLOAT_ARRAYS = ["times", "values", "inAngles", "outAngles", "inWeights", "outWeights"]
+BYTE_ARRAYS = ["inTypes", "outTypes", "locks", "weightLocks"]
+
+# The size in bytes of a single key
+KEY_SIZE = 8 * len(FLOAT_ARRAYS) + len(BYTE_ARRAYS)
+
+# The number of keys kept on each side of a time range. Two keys are
+# needed so that auto tangents at the range boundary are unchanged.
+KEY_MARGIN = 2
+
+# The maximum number of threads and the minimum number of curves per
+# thread used when reading curves in parallel
+MAX_THREADS = 4
+CURVES_PER_THREAD = 64
+
+# Tangent types that Maya computes from the neighbouring keys. The angle
+# and weight only need to be set for other types.
+AUTO_TANGENT_TYPES = [
+    "auto",
+    "clamped",
+    "fast",
+    "flat",
+    "linear",
+    "plateau",
+    "slow",
+    "spline",
+    "step",
+    "stepnext",
+]
+
+
+class AnimCurveError(Exception):
+    """Base class for exceptions in this module."""
+    pass
+
+
+class AnimCurve(object):
+
+    @classmethod
+    def fromCurve(cls, curve, time=None, includeUpperBound=True):
+        """
+        Return a new anim curve instance from the given Maya anim curve.
+
+        Only the keys within the given time range are queried. When
+        includeUpperBound is False the keys on the end time are skipped,
+        the same as maya.cmds.copyKey(includeUpperBound=False).
+
+        :type curve: str
+        :type time: (int, int) or None
+        :type includeUpperBound: bool
+        :rtype: AnimCurve
+        """
+        kwargs = {}
+        if time:
+            kwargs["time"] = tuple(time)
+
+        times = maya.cmds.keyframe(curve, query=True, timeChange=True, **kwargs) or []
+
+        # The keys are sorted by time so only the last ones can be on the end time
+        count = len(times)
+        if time and not includeUpperBound:
+            count = len([t for t in times if t < time[1]])
+            times = times[:count]
+
+        animCurve = cls(maya.cmds.nodeType(curve))
+
+        animCurve.setAttrs({
+            "preInfinity": maya.cmds.getAttr(curve + ".preInfinity"),
+            "postInfinity": maya.cmds.getAttr(curve + ".postInfinity"),
+            "curveColor": list(maya.cmds.getAttr(curve + ".curveColor")[0]),
+            "useCurveColor": maya.cmds.getAttr(curve + ".useCurveColor"),
+            "weighted": bool(maya.cmds.keyTangent(curve, query=True, weightedTangents=True)[0]),
+        })
+
+        if not times:
+            return animCurve
+
+        def keyTangent(**flags):
+            flags.update(kwargs)
+            return (maya.cmds.keyTangent(curve, query=True, **flags) or [])[:count]
+
+        animCurve.setKeys(
+            times,
+            maya.cmds.keyframe(curve, query=True, valueChange=True, **kwargs)[:count],
+            inTypes=keyTangent(inTangentType=True),
+            outTypes=keyTangent(outTangentType=True),
+            inAngles=keyTangent(inAngle=True),
+            outAngles=keyTangent(outAngle=True),
+            inWeights=keyTangent(inWeight=True),
+            outWeights=keyTangent(outWeight=True),
+            locks=keyTangent(lock=True),
+            weightLocks=keyTangent(weightLock=True),
+        )
+
+        return animCurve
+
+    def __init__(self, curveType="animCurveTU", attrs=None):
+        """
+        :type curveType: str
+        :type attrs: dict or None
+        """
+        self._type = curveType
+        self._attrs = attrs or {}
+        self._keys = dict((name, []) for name in FLOAT_ARRAYS + BYTE_ARRAYS)
+
+    def type(self):
+        """
+        Return the Maya node type for the curve. eg: animCurveTA
+
+        :rtype: str
+        """
+        return self._type
+
+    def attrs(self):
+        """
+        Return the static curve attributes like preInfinity and curveColor.
+
+        :rtype: dict
+        """
+        return self._attrs
+
+    def setAttrs(self, attrs):
+        """
+        :type attrs: dict
+        :rtype: None
+        """
+        self._attrs.update(attrs)
+
+    def isWeighted(self):
+        """
+        :rtype: bool
+        """
+        return bool(self._attrs.get("weighted"))
+
+    def count(self):
+        """
+        Return the number of keys in the curve.
+
+        :rtype: int
+        """
+        return len(self._keys["times"])
+
+    def times(self):
+        """
+        :rtype: list[float]
+        """
+        return self._keys["times"]
+
+    def values(self):
+        """
+        :rtype: list[float]
+        """
+        return self._keys["values"]
+
+    def keys(self, name):
+        """
+        Return the array of key data for the given name. eg: inAngles
+
+        :type name: str
+        :rtype: list
+        """
+        return self._keys[name]
+
+    def frameRange(self):
+        """
+        Return the first and last key time.
+
+        :rtype: (float, float) or None
+        """
+        if self.count():
+            return self.times()[0], self.times()[-1]
+        return None
+
+    def setKeys(self, times, values, **kwargs):
+        """
+        Set the key arrays for the curve.
+
+        Any array that is not given is filled with the Maya defaults.
+
+        :type times: list[float]
+        :type values: list[float]
+        :type kwargs: dict
+        :rtype: None
+        """
+        count = len(times)
+
+        if len(values) != count:
+            msg = "The number of times and values do not match {0} != {1}"
+            raise AnimCurveError(msg.format(count, len(values)))
+
+        defaults = {
+            "inTypes": "auto",
+            "outTypes": "auto",
+            "inAngles": 0.0,
+            "outAngles": 0.0,
+            "inWeights": 1.0,
+            "outWeights": 1.0,
+            "locks": True,
+            "weightLocks": True,
+        }
+
+        self._keys["times"] = list(times)
+        self._keys["values"] = list(values)
+
+        for name, default in defaults.items():
+            keys = list(kwargs.get(name) or [])
+
+            if len(keys) != count:
+                keys = [default] * count
+
+            self._keys[name] = keys
+
+    def valueAt(self, time):
+        """
+        Return an approximation of the value at the given time.
+
+        The keys are interpolated linearly, so this should only be used
+        for previewing the curve outside of Maya.
+
+        :type time: float
+        :rtype: float or None
+        """
+        times = self.times()
+        values = self.values()
+
+        if not times:
+            return None
+
+        if time <= times[0]:
+            return values[0]
+
+        if time >= times[-1]:
+            return values[-1]
+
+        for i in range(1, len(times)):
+            if time <= times[i]:
+                t0, t1 = times[i - 1], times[i]
+                v0, v1 = values[i - 1], values[i]
+
+                if self.keys("outTypes")[i - 1] == "step":
+                    return v0
+
+                return v0 + (v1 - v0) * (time - t0) / float(t1 - t0)
+
+    def copy(self):
+        """
+        Return a copy of the curve.
+
+        :rtype: AnimCurve
+        """
+        curve = AnimCurve(self.type(), dict(self.attrs()))
+
+        for name, keys in self._keys.items():
+            curve._keys[name] = list(keys)
+
+        return curve
+
+    def negate(self):
+        """
+        Negate the values and tangent angles of all keys.
+
+        This is the same as scaling the keys with a value scale of -1.
+
+        :rtype: None
+        """
+        for name in ["values", "inAngles", "outAngles"]:
+            self._keys[name] = [-value for value in self._keys[name]]
+
+    def create(self, name):
+        """
+        Create the anim curve in the Maya scene with the given name.
+
+        :type name: str
+        :rtype: str
+        """
+        curve = maya.cmds.createNode(self.type(), name=name, skipSelect=True)
+        count = self.count()
+
+        if count:
+            # Set all keys with a single command
+            ktv = []
+            for time, value in zip(self.times(), self.values()):
+                ktv.extend([time, value])
+
+            plug = "{0}.ktv[0:{1}]".format(curve, count - 1)
+            maya.cmds.setAttr(plug, *ktv, size=count)
+
+            self._createTangents(curve)
+
+        for attr in ["preInfinity", "postInfinity", "useCurveColor"]:
+            if attr in self._attrs:
+                maya.cmds.setAttr(curve + "." + attr, self._attrs[attr])
+
+        if "curveColor" in self._attrs:
+            maya.cmds.setAttr(curve + ".curveColor", *self._attrs["curveColor"])
+
+        return curve
+
+    def _createTangents(self, curve):
+        """
+        Apply the tangents to the given curve grouping keys with the same values.
+
+        :type curve: str
+        :rtype: None
+        """
+        count = self.count()
+
+        if self.isWeighted():
+            maya.cmds.keyTangent(curve, edit=True, weightedTangents=True)
+
+        # Unlock the tangents so that the in and out can be set separately
+        maya.cmds.keyTangent(curve, edit=True, index=(0, count - 1), lock=False)
+
+        inTypes = self.keys("inTypes")
+        outTypes = self.keys("outTypes")
+
+        for i in range(count):
+            flags = {}
+
+            if inTypes[i] not in AUTO_TANGENT_TYPES:
+                flags["inAngle"] = self.keys("inAngles")[i]
+                if self.isWeighted():
+                    flags["inWeight"] = self.keys("inWeights")[i]
+
+            if outTypes[i] not in AUTO_TANGENT_TYPES:
+                flags["outAngle"] = self.keys("outAngles")[i]
+                if self.isWeighted():
+                    flags["outWeight"] = self.keys("outWeights")[i]
+
+            if flags:
+                maya.cmds.keyTangent(curve, edit=True, absolute=True, index=(i, i), **flags)
+
+        groups = [
+            ("inTangentType", inTypes),
+            ("outTangentType", outTypes),
+            ("lock", self.keys("locks")),
+        ]
+
+        if self.isWeighted():
+            groups.append(("weightLock", self.keys("weightLocks")))
+
+        for flag, keys in groups:
+            for value, indexes in _groupIndexes(keys).items():
+                if flag == "lock" and not value:
+                    continue
+
+                # Fixed tangents are set when setting the angle
+                if value == "fixed":
+                    continue
+
+                kwargs = {flag: value}
+                maya.cmds.keyTangent(curve, edit=True, index=indexes, **kwargs)
+
+    def slice(self, start, end):
+        """
+        Return a new curve with only the keys within the given time range.
+
+        :type start: float
+        :type end: float
+        :rtype: AnimCurve
+        """
+        indexes = [i for i, t in enumerate(self.times()) if start <= t <= end]
+
+        curve = AnimCurve(self.type(), dict(self.attrs()))
+
+        keys = {}
+        for name in FLOAT_ARRAYS + BYTE_ARRAYS:
+            keys[name] = [self._keys[name][i] for i in indexes]
+
+        curve.setKeys(**keys)
+
+        return curve
+
+    def pack(self, tangentTypes):
+        """
+        Return the packed key arrays for the curve.
+
+        :type tangentTypes: list[str]
+        :rtype: bytes
+        """
+        count = self.count()
+        data = []
+
+        for name in FLOAT_ARRAYS:
+            data.append(struct.pack("<%dd" % count, *self._keys[name]))
+
+        for name in ["inTypes", "outTypes"]:
+            indexes = []
+            for tangentType in self._keys[name]:
+                if tangentType not in tangentTypes:
+                    tangentTypes.append(tangentType)
+                indexes.append(tangentTypes.index(tangentType))
+            data.append(struct.pack("<%dB" % count, *indexes))
+
+        for name in ["locks", "weightLocks"]:
+            data.append(struct.pack("<%dB" % count, *[bool(v) for v in self._keys[name]]))
+
+        return b"".join(data)
+
+    @classmethod
+    def unpack(cls, data, count, tangentTypes, curveType, attrs, time=None):
+        """
+        Return a new curve from the given packed key arrays.
+
+        When a time range is given only the keys within the range and
+        the keys next to it are decoded.
+
+        :type data: bytes
+        :type count: int
+        :type tangentTypes: list[str]
+        :type curveType: str
+        :type attrs: dict
+        :type time: (int, int) or None
+        :rtype: AnimCurve
+        """
+        first, last = 0, count
+
+        if time:
+            times = struct.unpack_from("<%dd" % count, data, 0)
+            first, last = keySpan(times, time)
+
+        size = last - first
+        offset = 0
+        keys = {}
+
+        for name in FLOAT_ARRAYS:
+            keys[name] = list(struct.unpack_from("<%dd" % size, data, offset + 8 * first))
+            offset += 8 * count
+
+        for name in BYTE_ARRAYS:
+            keys[name] = list(struct.unpack_from("<%dB" % size, data, offset + first))
+            offset += count
+
+        for name in ["inTypes", "outTypes"]:
+            keys[name] = [tangentTypes[i] for i in keys[name]]
+
+        for name in ["locks", "weightLocks"]:
+            keys[name] = [bool(v) for v in keys[name]]
+
+        curve = cls(curveType, attrs)
+        curve.setKeys(**keys)
+
+        return curve
+
+
+def keySpan(times, time, margin=KEY_MARGIN):
+    """
+    Return the first and last index of the keys needed for the time range.
+
+    The keys just outside the range are included so that the curve
+    still evaluates the same at the start and end of the range.
+
+    Example:
+        print keySpan([0, 5, 10, 15, 20, 25], (9, 11), margin=1)
+        # (1, 4)
+
+    :type times: list[float]
+    :type time: (int, int)
+    :type margin: int
+    :rtype: (int, int)
+    """
+    start, end = time
+    count = len(times)
+
+    first = max(0, bisect.bisect_left(times, start) - margin)
+    last = min(count, bisect.bisect_right(times, end) + margin)
+
+    # Keep enough keys when the range is outside the curve
+    if last - first < margin:
+        first = max(0, min(first, count - margin))
+        last = min(count, first + margin)
+
+    return first, last
+
+
+def _groupIndexes(values):
+    """
+    Return the key index ranges grouped by value.
+
+    Example:
+        print _groupIndexes(["auto", "auto", "step", "auto"])
+        # {"auto": [(0, 1), (3, 3)], "step": [(2, 2)]}
+
+    :type values: list
+    :rtype: dict
+    """
+    result = {}
+
+    for i, value in enumerate(values):
+        ranges = result.setdefault(value, [])
+
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1] = (ranges[-1][0], i)
+        else:
+            ranges.append((i, i))
+
+    return result
+
+
+def saveAnimCurves(path, curves):
+    """
+    Save the given anim curves to the given path.
+
+    :type path: str
+    :type curves: dict[str, AnimCurve]
+    :rtype: None
+    """
+    toc = {"curves": {}, "tangentTypes": []}
+    blocks = []
+    offset = 0
+
+    for name, curve in curves.items():
+        block = curve.pack(toc["tangentTypes"])
+
+        toc["curves"][name] = {
+            "type": curve.type(),
+            "attrs": curve.attrs(),
+            "count": curve.count(),
+            "offset": offset,
+            "frameRange": curve.frameRange(),
+        }
+
+        blocks.append(block)
+        offset += len(block)
+
+    toc = json.dumps(toc).encode("utf-8")
+
+    with mutils.atomicWrite(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION))
+        f.write(UINT32.pack(len(toc)))
+        f.write(toc)
+        f.write(b"".join(blocks))
+
+
+def _readToc(f, path):
+    """
+    Read the header and table of contents from the given file object.
+
+    :type f: file
+    :type path: str
+    :rtype: dict
+    """
+    magic, version = HEADER.unpack(f.read(HEADER.size))
+
+    if magic != MAGIC:
+        raise AnimCurveError("Not a valid anim curve file {0}".format(path))
+
+    if version > VERSION:
+        msg = "Unsupported anim curve file version {0} for {1}"
+        raise AnimCurveError(msg.format(version, path))
+
+    size, = UINT32.unpack(f.read(UINT32.size))
+    return json.loads(f.read(size).decode("utf-8"))
+
+
+def readAnimCurvesToc(path):
+    """
+    Return the curve names, key counts and frame ranges without the keys.
+
+    :type path: str
+    :rtype: dict
+    """
+    with open(path, "rb") as f:
+        return _readToc(f, path)
+
+
+def _readCurves(path, start, items, tangentTypes, time=None):
+    """
+    Read the given table of contents items from the given path.
+
+    :type path: str
+    :type start: int
+    :type items: list[(str, dict)]
+    :type tangentTypes: list[str]
+    :type time: (int, int) or None
+    :rtype: list[(str, AnimCurve)]
+    """
+    result = []
+
+    with open(path, "rb") as f:
+        for name, info in items:
+            f.seek(start + info["offset"])
+            data = f.read(info["count"] * KEY_SIZE)
+
+            curve = AnimCurve.unpack(
+                data,
+                info["count"],
+                tangentTypes,
+                info["type"],
+                info["attrs"],
+                time=time,
+            )
+
+            result.append((name, curve))
+
+    return result
+
+
+def readAnimCurves(path, names=None, time=None, threads=None):
+    """
+    Read the anim curves from the given path.
+
+    Only the given curve names are read and when a time range is given
+    only the keys around that range are decoded. Large files are read
+    by a pool of threads, one file handle per thread.
+
+    :type path: str
+    :type names: list[str] or None
+    :type time: (int, int) or None
+    :type threads: int or None
+    :rtype: dict[str, AnimCurve]
+    """
+    with open(path, "rb") as f:
+        toc = _readToc(f, path)
+        start = f.tell()
+
+    if names is not None:
+        names = set(names)
+
+    items = [
+        (name, info) for name, info in toc["curves"].items()
+        if names is None or name in names
+    ]
+
+    # Sort by offset so that each thread reads forward through the file
+    items.sort(key=lambda item: item[1]["offset"])
+
+    if threads is None:
+        threads = min(MAX_THREADS, len(items) // CURVES_PER_THREAD)
+
+    def read(chunk):
+        return _readCurves(path, start, chunk, toc["tangentTypes"], time)
+
+    if threads <= 1:
+        return dict(read(items))
+
+    size = len(items) // threads + 1
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+
+    pool = ThreadPool(len(chunks))
+
+    try:
+        results = pool.map(read, chunks)
+    finally:
+        pool.close()
+        pool.join()
+
+    result = {}
+    for curves in results:
+        result.update(curves)
+
+    return result
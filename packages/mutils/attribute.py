@@ -20,6 +20,8 @@ attr.set(100)
 """
 import logging
 
+import mutils
+
 try:
     import maya.cmds
 except ImportError:
@@ -61,6 +63,21 @@ VALID_ATTRIBUTE_TYPES = [
 ]
 
 
+def nodeType(nodes):
+    """
+    Return the node type of the first given node.
+
+    The result is memoised while a mutils.QueryCache is active.
+
+    :type nodes: list[str]
+    :rtype: str
+    """
+    def query():
+        return maya.cmds.nodeType(nodes)
+
+    return mutils.QueryCache.get(str(nodes), "nodeType", query)
+
+
 class AttributeError(Exception):
     """Base class for exceptions in this module."""
     pass
@@ -135,7 +152,10 @@ class Attribute(object):
 
         :rtype: bool
         """
-        return maya.cmds.getAttr(self.fullname(), lock=True)
+        def query():
+            return maya.cmds.getAttr(self.fullname(), lock=True)
+
+        return self._query("isLocked", query)
 
     def isUnlocked(self):
         """
@@ -172,7 +192,10 @@ class Attribute(object):
 
         :rtype: bool
         """
-        return maya.cmds.objExists(self.fullname())
+        def query():
+            return maya.cmds.objExists(self.fullname())
+
+        return self._query("exists", query)
 
     def prettyPrint(self):
         """
@@ -189,6 +212,24 @@ class Attribute(object):
         self._type = None
         self._value = None
 
+    def _query(self, key, func):
+        """
+        Return the result of the given scene query for this attribute.
+
+        The result is memoised while a mutils.QueryCache is active.
+
+        :type key: str
+        :type func: func
+        :rtype: object
+        """
+        return mutils.QueryCache.get(self.fullname(), key, func)
+
+    def clearQueries(self):
+        """
+        Clear the memoised scene queries after changing keys or connections.
+        """
+        mutils.QueryCache.invalidate(self.fullname())
+
     def update(self):
         """
         This method will be deprecated.
@@ -209,7 +250,11 @@ class Attribute(object):
 
         :rtype: list[str]
         """
-        return maya.cmds.listConnections(self.fullname(), **kwargs)
+        def query():
+            return maya.cmds.listConnections(self.fullname(), **kwargs)
+
+        key = "listConnections" + str(sorted(kwargs.items()))
+        return self._query(key, query)
 
     def sourceConnection(self, **kwargs):
         """
@@ -255,16 +300,17 @@ class Attribute(object):
 
         :rtype: str
         """
-        if self._type is None:
-
+        def query():
             try:
-                self._type = maya.cmds.getAttr(self.fullname(), type=True)
-                self._type = self._type.encode('ascii')
+                return maya.cmds.getAttr(self.fullname(), type=True).encode('ascii')
             except Exception:
                 msg = 'Cannot GET attribute TYPE for "{0}"'
                 msg = msg.format(self.fullname())
                 logger.exception(msg)
 
+        if self._type is None:
+            self._type = self._query("type", query)
+
         return self._type
 
     def set(self, value, blend=100, key=False, clamp=True):
@@ -329,6 +375,7 @@ class Attribute(object):
         kwargs.setdefault("respectKeyable", respectKeyable)
 
         maya.cmds.setKeyframe(self.fullname(), **kwargs)
+        self.clearQueries()
 
     def setStaticKeyframe(self, value, time, option):
         """
@@ -340,6 +387,7 @@ class Attribute(object):
         """
         if option == "replaceCompletely":
             maya.cmds.cutKey(self.fullname())
+            self.clearQueries()
             self.set(value, key=False)
 
         # This should be changed to only look for animation.
@@ -349,6 +397,7 @@ class Attribute(object):
             # TODO: Should also support static attrs when there is animation.
             if option == "replace":
                 maya.cmds.cutKey(self.fullname(), time=time)
+                self.clearQueries()
                 self.insertStaticKeyframe(value, time)
 
             elif option == "replace":
@@ -432,6 +481,7 @@ class Attribute(object):
             # Note: If the attribute is connected to referenced
             # animation then the following command will not work.
             maya.cmds.pasteKey(fullname, option=option, time=time, connect=connect)
+            self.clearQueries()
 
             if option == "replaceCompletely":
 
@@ -458,6 +508,12 @@ class Attribute(object):
         """
         Return the connected animation curve.
 
+        :rtype: str | None
+        """
+        return self._query("animCurve", self._animCurve)
+
+    def _animCurve(self):
+        """
         :rtype: str | None
         """
         result = None
@@ -466,13 +522,13 @@ class Attribute(object):
 
             n = self.listConnections(plugs=True, destination=False)
 
-            if n and "animCurve" in maya.cmds.nodeType(n):
+            if n and "animCurve" in nodeType(n):
                 result = n
 
-            elif n and "character" in maya.cmds.nodeType(n):
+            elif n and "character" in nodeType(n):
                 n = maya.cmds.listConnections(n, plugs=True,
                                               destination=False)
-                if n and "animCurve" in maya.cmds.nodeType(n):
+                if n and "animCurve" in nodeType(n):
                     result = n
 
             if result:
@@ -494,7 +550,7 @@ class Attribute(object):
 
         if connection:
             if ignoreConnections:
-                connectionType = maya.cmds.nodeType(connection)
+                connectionType = nodeType(connection)
                 for ignoreType in ignoreConnections:
                     if connectionType.startswith(ignoreType):
                         return False
@@ -523,12 +579,15 @@ class Attribute(object):
         if not self.exists():
             return False
 
-        if not maya.cmds.listAttr(self.fullname(), unlocked=True, keyable=True, multi=True, scalar=True):
+        def query():
+            return maya.cmds.listAttr(self.fullname(), unlocked=True, keyable=True, multi=True, scalar=True)
+
+        if not self._query("isKeyable", query):
             return False
 
         connection = self.listConnections(destination=False)
         if connection:
-            connectionType = maya.cmds.nodeType(connection)
+            connectionType = nodeType(connection)
             for validType in validConnections:
                 if connectionType.startswith(validType):
                     return True
@@ -0,0 +1,499 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Compact binary container for transfer object data.
+
+The json format stores every attribute as a {"type": ..., "value": ...}
+dict with the full names repeated, so parsing is dominated by allocating
+dicts. The binary format stores each name once in a string table, all
+numeric values in one packed float64 array and each attribute as a fixed
+size record that points into those tables.
+
+Layout (little endian):
+
+    header      magic "MUTB", uint16 version
+    metadata    uint32 size, utf-8 json
+    strings     uint32 count, uint32 size, uint32[count] lengths, utf-8 blob
+    numbers     uint32 count, float64[count]
+    objects     uint32 count, then per object:
+                    uint32 name, int8[3] mirrorAxis, bool hasMirrorAxis,
+                    uint32 extra json, uint32 attrs
+                    and "attrs" records of uint32 attr, uint32 type,
+                    uint8 kind, uint32 a, uint32 b, uint32 curve
+
+Integers that do not fit in a float64 are stored in the a and b fields
+of the record as the low and high words of an int64.
+
+Example:
+    import mutils.binaryfile
+
+    mutils.binaryfile.convertToBinary("/tmp/pose.json", "/tmp/pose.bin")
+    data = mutils.binaryfile.readBinary("/tmp/pose.bin")
+    mutils.binaryfile.convertToJson("/tmp/pose.bin", "/tmp/pose.json")
+"""
+import os
+import json
+import numbers
+import struct
+import logging
+
+import mutils
+
+
+__all__ = [
+    "BinaryFileError",
+    "BINARY_EXTENSION",
+    "isBinaryPath",
+    "readBinary",
+    "readBinaryMetadata",
+    "writeBinary",
+    "convertToBinary",
+    "convertToJson",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+BINARY_EXTENSION = ".bin"
+
+MAGIC = b"MUTB"
+VERSION = 2
+
+NONE = 0xFFFFFFFF
+
+# The kind of value stored in an attribute record
+KIND_NONE = 0
+KIND_FLOAT = 1
+KIND_INT = 2
+KIND_BOOL = 3
+KIND_STRING = 4
+KIND_FLOATS = 5
+KIND_JSON = 6
+KIND_RECORD = 7
+KIND_INT64 = 8
+
+# The range of integers that are stored exactly as a float64
+MAX_FLOAT_INT = 2 ** 53
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+HEADER = struct.Struct("<4sH")
+UINT32 = struct.Struct("<I")
+OBJECT = struct.Struct("<Ibbb?II")
+ATTR = struct.Struct("<IIBIII")
+
+
+class BinaryFileError(IOError):
+    """Base class for exceptions in this module."""
+    pass
+
+
+def isBinaryPath(path):
+    """
+    Return True if the given path uses the binary file extension.
+
+    :type path: str
+    :rtype: bool
+    """
+    return path.endswith(BINARY_EXTENSION)
+
+
+def _encode(text):
+    """
+    Return the given text as utf-8 bytes.
+
+    :type text: str or unicode
+    :rtype: bytes
+    """
+    if isinstance(text, bytes):
+        return text
+    return text.encode("utf-8")
+
+
+class _Writer(object):
+
+    def __init__(self):
+        self._strings = []
+        self._stringIndex = {}
+        self._numbers = []
+        self._records = []
+
+    def string(self, text):
+        """
+        Return the index of the given text in the string table.
+
+        :type text: str or None
+        :rtype: int
+        """
+        if text is None:
+            return NONE
+
+        text = _encode(text)
+        index = self._stringIndex.get(text)
+
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(text)
+            self._stringIndex[text] = index
+
+        return index
+
+    def value(self, value):
+        """
+        Return the kind and table references for the given value.
+
+        :type value: object
+        :rtype: (int, int, int)
+        """
+        if value is None:
+            return KIND_NONE, 0, 0
+
+        if isinstance(value, bool):
+            self._numbers.append(float(value))
+            return KIND_BOOL, len(self._numbers) - 1, 0
+
+        if isinstance(value, numbers.Integral):
+            if abs(value) < MAX_FLOAT_INT:
+                self._numbers.append(float(value))
+                return KIND_INT, len(self._numbers) - 1, 0
+
+            if INT64_MIN <= value <= INT64_MAX:
+                value &= 0xFFFFFFFFFFFFFFFF
+                return KIND_INT64, value & 0xFFFFFFFF, value >> 32
+
+            return KIND_JSON, self.string(json.dumps(value)), 0
+
+        if isinstance(value, numbers.Real):
+            self._numbers.append(float(value))
+            return KIND_FLOAT, len(self._numbers) - 1, 0
+
+        if isinstance(value, basestring):
+            return KIND_STRING, self.string(value), 0
+
+        if isinstance(value, (list, tuple)) and all(
+            isinstance(v, float) for v in value
+        ):
+            offset = len(self._numbers)
+            self._numbers.extend(value)
+            return KIND_FLOATS, offset, len(value)
+
+        return KIND_JSON, self.string(json.dumps(value)), 0
+
+    def addObject(self, name, data):
+        """
+        Add the given object name and data to the tables.
+
+        :type name: str
+        :type data: dict
+        :rtype: None
+        """
+        attrs = data.get("attrs")
+        mirrorAxis = data.get("mirrorAxis")
+
+        extra = dict(
+            (key, value) for key, value in data.items()
+            if key not in ("attrs", "mirrorAxis")
+        )
+
+        # Only axes of -1, 0 or 1 fit in the packed record
+        if mirrorAxis is not None and (
+            len(mirrorAxis) != 3 or
+            not all(isinstance(v, numbers.Integral) and -1 <= v <= 1
+                    for v in mirrorAxis)
+        ):
+            extra["mirrorAxis"] = mirrorAxis
+            mirrorAxis = None
+
+        x, y, z = mirrorAxis or (0, 0, 0)
+
+        self._records.append(OBJECT.pack(
+            self.string(name),
+            x, y, z,
+            mirrorAxis is not None,
+            self.string(json.dumps(extra)) if extra else NONE,
+            NONE if attrs is None else len(attrs),
+        ))
+
+        for attr, attrData in (attrs or {}).items():
+            attrData = dict(attrData)
+
+            type_ = attrData.pop("type", None)
+            curve = attrData.pop("curve", None)
+
+            if set(attrData) != set(["value"]):
+                # Keep any unknown keys and a missing value as they are
+                kind, a, b = KIND_RECORD, self.string(json.dumps(attrData)), 0
+            else:
+                kind, a, b = self.value(attrData.get("value"))
+
+            self._records.append(ATTR.pack(
+                self.string(attr),
+                self.string(type_),
+                kind, a, b,
+                self.string(curve),
+            ))
+
+    def write(self, f, metadata, count):
+        """
+        Write all the tables to the given file object.
+
+        :type f: file
+        :type metadata: dict
+        :type count: int
+        :rtype: None
+        """
+        f.write(HEADER.pack(MAGIC, VERSION))
+
+        metadata = _encode(json.dumps(metadata))
+        f.write(UINT32.pack(len(metadata)))
+        f.write(metadata)
+
+        f.write(struct.pack("<II", len(self._strings), sum(len(s) for s in self._strings)))
+        f.write(struct.pack("<%dI" % len(self._strings), *[len(s) for s in self._strings]))
+        f.write(b"".join(self._strings))
+
+        f.write(UINT32.pack(len(self._numbers)))
+        f.write(struct.pack("<%dd" % len(self._numbers), *self._numbers))
+
+        f.write(UINT32.pack(count))
+        f.write(b"".join(self._records))
+
+
+def _decodeValue(kind, a, b, strings, numbers_):
+    """
+    Return the value for the given record kind and table references.
+
+    :type kind: int
+    :type a: int
+    :type b: int
+    :type strings: list[unicode]
+    :type numbers_: list[float]
+    :rtype: object
+    """
+    if kind == KIND_FLOAT:
+        return numbers_[a]
+
+    elif kind == KIND_INT:
+        return int(numbers_[a])
+
+    elif kind == KIND_INT64:
+        value = (b << 32) | a
+        if value > INT64_MAX:
+            value -= 2 ** 64
+        return value
+
+    elif kind == KIND_BOOL:
+        return bool(numbers_[a])
+
+    elif kind == KIND_STRING:
+        return strings[a]
+
+    elif kind == KIND_FLOATS:
+        return list(numbers_[a:a + b])
+
+    elif kind in (KIND_JSON, KIND_RECORD):
+        return json.loads(strings[a])
+
+    return None
+
+
+def writeBinary(path, data):
+    """
+    Write the given transfer object data to the given path.
+
+    :type path: str
+    :type data: dict
+    :rtype: None
+    """
+    writer = _Writer()
+    objects = data.get("objects", {})
+
+    for name, objectData in objects.items():
+        writer.addObject(name, objectData)
+
+    with mutils.atomicWrite(path, "wb") as f:
+        writer.write(f, data.get("metadata", {}), len(objects))
+
+
+def _readHeader(f, path):
+    """
+    Read the header and metadata from the given file object.
+
+    :type f: file
+    :type path: str
+    :rtype: dict
+    """
+    magic, version = HEADER.unpack(f.read(HEADER.size))
+
+    if magic != MAGIC:
+        raise BinaryFileError("Not a valid binary file {0}".format(path))
+
+    if version > VERSION:
+        msg = "Unsupported binary file version {0} for {1}"
+        raise BinaryFileError(msg.format(version, path))
+
+    size, = UINT32.unpack(f.read(UINT32.size))
+    return json.loads(f.read(size).decode("utf-8"))
+
+
+def readBinaryMetadata(path):
+    """
+    Return only the metadata from the given binary path.
+
+    :type path: str
+    :rtype: dict
+    """
+    with open(path, "rb") as f:
+        return _readHeader(f, path)
+
+
+def readBinary(path, objects=None, namespaces=None):
+    """
+    Read the given binary path and return the transfer object data.
+
+    :type path: str
+    :type objects: list[str] or None
+    :type namespaces: list[str] or None
+    :rtype: dict
+    """
+    if objects is not None:
+        objects = set(objects)
+
+    if namespaces is not None:
+        namespaces = set(namespaces)
+
+    with open(path, "rb") as f:
+        metadata = _readHeader(f, path)
+        buf = f.read()
+
+    offset = 0
+
+    # Read the string table
+    count, size = struct.unpack_from("<II", buf, offset)
+    offset += 8
+
+    lengths = struct.unpack_from("<%dI" % count, buf, offset)
+    offset += 4 * count
+
+    strings = []
+    for length in lengths:
+        strings.append(buf[offset:offset + length].decode("utf-8"))
+        offset += length
+
+    # Read the packed numbers
+    count, = UINT32.unpack_from(buf, offset)
+    offset += UINT32.size
+
+    numbers_ = struct.unpack_from("<%dd" % count, buf, offset)
+    offset += 8 * count
+
+    # Read the object and attribute records
+    count, = UINT32.unpack_from(buf, offset)
+    offset += UINT32.size
+
+    result = {}
+
+    for i in range(count):
+        nameIndex, x, y, z, hasAxis, extra, attrCount = \
+            OBJECT.unpack_from(buf, offset)
+        offset += OBJECT.size
+
+        name = strings[nameIndex]
+
+        skip = (objects is not None and name not in objects) or \
+               (namespaces is not None and
+                mutils.namespace.getFromDagPath(name) not in namespaces)
+
+        if skip:
+            if attrCount != NONE:
+                offset += ATTR.size * attrCount
+            continue
+
+        data = {}
+
+        if extra != NONE:
+            data.update(json.loads(strings[extra]))
+
+        if hasAxis:
+            data["mirrorAxis"] = [x, y, z]
+
+        if attrCount != NONE:
+            attrs = {}
+
+            for j in range(attrCount):
+                attr, type_, kind, a, b, curve = ATTR.unpack_from(buf, offset)
+                offset += ATTR.size
+
+                value = _decodeValue(kind, a, b, strings, numbers_)
+
+                if kind == KIND_RECORD:
+                    attrData = value
+                else:
+                    attrData = {"value": value}
+
+                if type_ != NONE:
+                    attrData["type"] = strings[type_]
+
+                if curve != NONE:
+                    attrData["curve"] = strings[curve]
+
+                attrs[strings[attr]] = attrData
+
+            data["attrs"] = attrs
+
+        result[name] = data
+
+    return {"metadata": metadata, "objects": result}
+
+
+def convertToBinary(srcPath, dstPath=None):
+    """
+    Convert the given json transfer file to the binary format.
+
+    :type srcPath: str
+    :type dstPath: str or None
+    :rtype: str
+    """
+    if dstPath is None:
+        dstPath = os.path.splitext(srcPath)[0] + BINARY_EXTENSION
+
+    data = mutils.TransferObject.readJson(srcPath)
+    writeBinary(dstPath, data)
+
+    return dstPath
+
+
+def convertToJson(srcPath, dstPath=None):
+    """
+    Convert the given binary transfer file to the json format.
+
+    :type srcPath: str
+    :type dstPath: str or None
+    :rtype: str
+    """
+    if dstPath is None:
+        dstPath = os.path.splitext(srcPath)[0] + ".json"
+
+    data = readBinary(srcPath)
+
+    with mutils.JsonStreamWriter(dstPath, indent=2) as writer:
+        writer.writeItem("metadata", data["metadata"])
+
+        writer.beginObject("objects")
+        for name, objectData in data["objects"].items():
+            writer.writeItem(name, objectData)
+        writer.endObject()
+
+    return dstPath
@@ -0,0 +1,301 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Bulk capture of the keyable attribute values for many objects.
+
+Querying the type and value of every attribute with maya.cmds.getAttr
+costs two commands per attribute. All the nodes are added to a single
+selection list and their attributes are listed and read with the Maya
+API instead. Only the nodes and plugs the API cannot handle fall back to
+the commands.
+
+Example:
+    import mutils
+
+    objects = maya.cmds.ls(selection=True)
+    data = mutils.captureAttrs(objects)
+    # {"pSphere1": [("translateX", "doubleLinear", 1.0), ...]}
+"""
+import logging
+
+import mutils
+
+try:
+    import maya.cmds
+except ImportError:
+    import traceback
+    traceback.print_exc()
+
+try:
+    import maya.api.OpenMaya as OpenMaya
+except ImportError:
+    OpenMaya = None
+
+
+__all__ = [
+    "captureAttrs",
+    "dependNodes",
+    "listAttrs",
+    "readPlugs",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+# The getAttr type names for the numeric data types
+NUMERIC_TYPES = {
+    "kBoolean": "bool",
+    "kShort": "short",
+    "kInt": "long",
+    "kFloat": "float",
+    "kDouble": "double",
+}
+
+
+def dependNodes(objects):
+    """
+    Return the dependency node function set for each of the given objects.
+
+    All the objects are added to a single selection list. Objects that
+    do not exist or are not unique are left out.
+
+    :type objects: list[str]
+    :rtype: dict[str, OpenMaya.MFnDependencyNode]
+    """
+    result = {}
+    names = []
+    selection = OpenMaya.MSelectionList()
+
+    for name in objects:
+        if name in names:
+            continue
+
+        count = selection.length()
+
+        try:
+            selection.add(name)
+        except Exception:
+            continue
+
+        if selection.length() > count:
+            names.append(name)
+
+    for i, name in enumerate(names):
+        result[name] = OpenMaya.MFnDependencyNode(selection.getDependNode(i))
+
+    return result
+
+
+def _isInArray(attribute):
+    """
+    Return True if the given attribute or one of its parents is an array.
+
+    :type attribute: OpenMaya.MObject
+    :rtype: bool
+    """
+    while not attribute.isNull():
+        fn = OpenMaya.MFnAttribute(attribute)
+
+        if fn.array:
+            return True
+
+        attribute = fn.parent
+
+    return False
+
+
+def _listKeyableAttrs(node):
+    """
+    Return the unlocked keyable attributes of the given node.
+
+    Return None when the node has keyable array attributes, since their
+    elements are only listed by the commands.
+
+    :type node: OpenMaya.MFnDependencyNode
+    :rtype: list[str] or None
+    """
+    attrs = []
+
+    for i in range(node.attributeCount()):
+        attribute = node.attribute(i)
+
+        if _isInArray(attribute):
+            if OpenMaya.MFnAttribute(attribute).keyable:
+                return None
+            continue
+
+        plug = node.findPlug(attribute, False)
+
+        if plug.isKeyable and not plug.isLocked and not plug.isCompound:
+            attrs.append(OpenMaya.MFnAttribute(attribute).name)
+
+    return attrs
+
+
+def listAttrs(objects, nodes=None):
+    """
+    Return the unlocked keyable attributes for the given objects.
+
+    :type objects: list[str]
+    :type nodes: dict[str, OpenMaya.MFnDependencyNode] or None
+    :rtype: list[(str, str)]
+    """
+    plugs = []
+    nodes = nodes or {}
+
+    for name in objects:
+        attrs = None
+        node = nodes.get(name)
+
+        if node is not None:
+            try:
+                attrs = _listKeyableAttrs(node)
+            except Exception:
+                attrs = None
+
+        if attrs is None:
+            attrs = maya.cmds.listAttr(name, unlocked=True, keyable=True) or []
+
+        for attr in sorted(set(attrs)):
+            plugs.append((name, attr))
+
+    return plugs
+
+
+def captureAttrs(objects):
+    """
+    Return the type and value of the unlocked keyable attributes.
+
+    The value is None for attributes with a type that cannot be saved.
+
+    :type objects: list[str]
+    :rtype: dict[str, list[(str, str, object)]]
+    """
+    result = dict((name, []) for name in objects)
+
+    nodes = None
+    if OpenMaya is not None:
+        nodes = dependNodes(objects)
+
+    plugs = listAttrs(objects, nodes)
+    values = readPlugs(plugs, nodes)
+
+    for (name, attr), (type_, value) in zip(plugs, values):
+        result[name].append((attr, type_, value))
+
+    return result
+
+
+def readPlugs(plugs, nodes=None):
+    """
+    Return the type and value for each of the given plugs.
+
+    :type plugs: list[(str, str)]
+    :type nodes: dict[str, OpenMaya.MFnDependencyNode] or None
+    :rtype: list[(str, object)]
+    """
+    result = []
+    fallback = 0
+
+    if nodes is None and OpenMaya is not None:
+        nodes = dependNodes([name for name, attr in plugs])
+
+    nodes = nodes or {}
+
+    for name, attr in plugs:
+        value = None
+        node = nodes.get(name)
+
+        if node is not None:
+            try:
+                value = _readPlug(node.findPlug(attr, False))
+            except Exception:
+                value = None
+
+        if value is None:
+            fallback += 1
+            value = _queryPlug(name, attr)
+
+        result.append(value)
+
+    logger.debug("Captured %d plugs (%d queried with commands)", len(plugs), fallback)
+
+    return result
+
+
+def _queryPlug(name, attr):
+    """
+    Return the type and value of the given plug with the Maya commands.
+
+    :type name: str
+    :type attr: str
+    :rtype: (str, object)
+    """
+    attribute = mutils.Attribute(name, attr)
+
+    if attribute.isValid():
+        return attribute.type(), attribute.value()
+
+    return attribute.type(), None
+
+
+def _readPlug(plug):
+    """
+    Return the type and value of the given plug with the Maya API.
+
+    Return None when the attribute type is not handled here. Unit
+    attributes are always reported as double types, since the API does
+    not expose whether they store a float or a double.
+
+    :type plug: OpenMaya.MPlug
+    :rtype: (str, object) or None
+    """
+    attribute = plug.attribute()
+
+    if plug.isCompound or plug.isArray:
+        return None
+
+    if attribute.hasFn(OpenMaya.MFn.kUnitAttribute):
+        unitType = OpenMaya.MFnUnitAttribute(attribute).unitType()
+
+        if unitType == OpenMaya.MFnUnitAttribute.kDistance:
+            value = plug.asMDistance().asUnits(OpenMaya.MDistance.uiUnit())
+            return "doubleLinear", value
+
+        elif unitType == OpenMaya.MFnUnitAttribute.kAngle:
+            value = plug.asMAngle().asUnits(OpenMaya.MAngle.uiUnit())
+            return "doubleAngle", value
+
+    elif attribute.hasFn(OpenMaya.MFn.kEnumAttribute):
+        return "enum", plug.asInt()
+
+    elif attribute.hasFn(OpenMaya.MFn.kNumericAttribute):
+        numericType = OpenMaya.MFnNumericAttribute(attribute).numericType()
+
+        for key, type_ in NUMERIC_TYPES.items():
+            if numericType == getattr(OpenMaya.MFnNumericData, key):
+                if type_ == "bool":
+                    return type_, plug.asBool()
+                elif type_ in ("short", "long"):
+                    return type_, plug.asInt()
+                else:
+                    return type_, plug.asDouble()
+
+    elif attribute.hasFn(OpenMaya.MFn.kTypedAttribute):
+        attrType = OpenMaya.MFnTypedAttribute(attribute).attrType()
+
+        if attrType == OpenMaya.MFnData.kString:
+            return "string", plug.asString()
+
+    return None
@@ -10,12 +10,15 @@
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import uuid
 import shutil
 import logging
 
+import mutils
 import mutils.gui
 
 import studioqt
+import studiolibrary
 
 from studioqt import QtGui
 from studioqt import QtCore
@@ -126,8 +129,22 @@ class ThumbnailCaptureMenu(QtWidgets.QMenu):
         
         :type path: str
         """
-        shutil.copy(path, self.path())
-        self.captured.emit(self.path())
+        dst = self.path()
+
+        # The thumbnail may be a link to a blob that other items share,
+        # so the image is copied to a temp file and renamed over it.
+        dirname, basename = os.path.split(dst)
+        tempPath = os.path.join(dirname, ".{0}.{1}.tmp".format(basename, uuid.uuid4().hex))
+
+        try:
+            shutil.copyfile(path, tempPath)
+            studiolibrary.replaceFile(tempPath, dst)
+        except Exception:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            raise
+
+        self.captured.emit(dst)
 
 
 def testThumbnailCaptureMenu():
@@ -0,0 +1,501 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Incremental reading and writing of large transfer object files.
+
+The reader only keeps a small window of the file in memory and decodes
+one value at a time, so the metadata block can be read without parsing
+any objects and unwanted objects can be dropped while parsing.
+
+Example:
+    import mutils.jsonstream
+
+    with mutils.jsonstream.JsonStreamReader("/tmp/pose.json") as reader:
+        for key, name, value in reader.items(expand=["objects"]):
+            print key, name
+
+    with mutils.jsonstream.JsonStreamWriter("/tmp/pose.json") as writer:
+        writer.writeItem("metadata", {"user": "hovel"})
+        writer.beginObject("objects")
+        writer.writeItem("sphere", {"attrs": {}})
+        writer.endObject()
+"""
+import io
+import re
+import json
+
+import mutils
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+__all__ = [
+    "JsonStreamError",
+    "JsonStreamReader",
+    "JsonStreamWriter",
+    "PROFILES",
+    "encode",
+]
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = " \t\n\r"
+
+# The characters that change the nesting or the string state of a value
+STRUCTURE = re.compile(r'["\\{}\[\]]')
+
+# The characters that end a number or a literal
+SCALAR_END = re.compile(r'[,:}\]\s]')
+
+
+# The serialisation profiles. Compact output is used for files that are
+# mostly read by the tools and pretty output for files people may edit.
+PROFILES = {
+    "compact": {"indent": None, "separators": (",", ":")},
+    "pretty": {"indent": 2, "separators": (",", ": ")},
+}
+
+DEFAULT_PROFILE = "compact"
+
+
+class JsonStreamError(ValueError):
+    """Base class for exceptions in this module."""
+    pass
+
+
+def _fastEncoder():
+    """
+    Return the ujson module if it writes the same values as json.
+
+    Older versions of ujson round floats to 9 digits and escape slashes,
+    so the encoder is only used when a sample survives a round trip.
+
+    :rtype: module or None
+    """
+    if ujson is None:
+        return None
+
+    sample = {"a/b": [0.1 + 0.2, 1e-300, -1.5, 123456789012, True, None, u"\u00e9"]}
+
+    try:
+        text = ujson.dumps(sample, ensure_ascii=True, escape_forward_slashes=False)
+        if json.loads(text) == sample and "\\/" not in text:
+            return ujson
+    except Exception:
+        pass
+
+    return None
+
+
+FAST_ENCODER = _fastEncoder()
+
+
+def encode(value, profile=DEFAULT_PROFILE):
+    """
+    Return the given value as json text using the given profile.
+
+    :type value: object
+    :type profile: str
+    :rtype: str
+    """
+    options = PROFILES[profile]
+
+    if options["indent"] is None and FAST_ENCODER is not None:
+        return FAST_ENCODER.dumps(value, ensure_ascii=True, escape_forward_slashes=False)
+
+    return json.dumps(value, indent=options["indent"], separators=options["separators"])
+
+
+class JsonStreamReader(object):
+
+    def __init__(self, path, chunkSize=DEFAULT_CHUNK_SIZE):
+        """
+        :type path: str
+        :type chunkSize: int
+        """
+        self._path = path
+        self._file = io.open(path, "r", encoding="utf-8")
+        self._eof = False
+        self._pos = 0
+        self._buffer = u""
+        self._decoder = json.JSONDecoder()
+        self._chunkSize = chunkSize
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the underlying file.
+
+        :rtype: None
+        """
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def path(self):
+        """
+        :rtype: str
+        """
+        return self._path
+
+    def _fill(self):
+        """
+        Read the next chunk from disc into the buffer.
+
+        Return False if the end of the file has been reached.
+
+        :rtype: bool
+        """
+        if self._eof:
+            return False
+
+        chunk = self._file.read(self._chunkSize)
+
+        if not chunk:
+            self._eof = True
+            return False
+
+        # Drop the part of the buffer that has already been parsed
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+        return True
+
+    def _peek(self):
+        """
+        Return the next non whitespace character without consuming it.
+
+        :rtype: unicode
+        """
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+
+            if not self._fill():
+                return u""
+
+    def _expect(self, char):
+        """
+        Consume the given character or raise an error.
+
+        :type char: str
+        :rtype: None
+        """
+        found = self._peek()
+
+        if found != char:
+            msg = 'Expected "{0}" but found "{1}" in {2}'
+            msg = msg.format(char, found, self.path())
+            raise JsonStreamError(msg)
+
+        self._pos += 1
+
+    def _valueEnd(self):
+        """
+        Return the end of the value at the current position.
+
+        Chunks are read until the value is complete. The scan continues
+        where it stopped after each chunk, so large values are scanned
+        once instead of being decoded again from the start.
+
+        :rtype: int
+        """
+        i = self._pos
+        depth = 0
+        inString = False
+        scalar = self._buffer[i] not in u'"{['
+
+        while True:
+            if scalar:
+                match = SCALAR_END.search(self._buffer, i)
+                if match:
+                    return match.start()
+                i = len(self._buffer)
+            else:
+                match = STRUCTURE.search(self._buffer, i)
+
+                while match:
+                    char = match.group()
+                    i = match.end()
+
+                    if inString:
+                        if char == u"\\":
+                            if i >= len(self._buffer):
+                                # The escaped character is in the next chunk
+                                i = match.start()
+                                break
+                            i += 1
+                        elif char == u'"':
+                            inString = False
+                            if depth == 0:
+                                return i
+                    elif char == u'"':
+                        inString = True
+                    elif char in u"{[":
+                        depth += 1
+                    elif char in u"}]":
+                        depth -= 1
+                        if depth == 0:
+                            return i
+
+                    match = STRUCTURE.search(self._buffer, i)
+                else:
+                    i = len(self._buffer)
+
+            # Reading a chunk drops the part of the buffer before the value
+            offset = self._pos
+
+            if not self._fill():
+                return len(self._buffer)
+
+            i -= offset
+
+    def _decode(self):
+        """
+        Decode the next complete JSON value in the file.
+
+        :rtype: object
+        """
+        if not self._peek():
+            msg = "Unexpected end of file {0}".format(self.path())
+            raise JsonStreamError(msg)
+
+        # Read the whole value into the buffer before decoding it
+        self._valueEnd()
+
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except ValueError as error:
+            msg = "Cannot decode {0}: {1}".format(self.path(), error)
+            raise JsonStreamError(msg)
+
+        self._pos = end
+        return value
+
+    def _members(self):
+        """
+        Return a generator for the key and value pairs of the current object.
+
+        The generator stops before decoding each value, so the caller must
+        call self._decode() or self._members() for every key yielded.
+
+        :rtype: collections.Iterable[unicode]
+        """
+        self._expect(u"{")
+
+        if self._peek() == u"}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self._decode()
+            self._expect(u":")
+
+            yield key
+
+            char = self._peek()
+            self._pos += 1
+
+            if char == u"}":
+                return
+
+            if char != u",":
+                msg = 'Expected "," or "}}" but found "{0}" in {1}'
+                msg = msg.format(char, self.path())
+                raise JsonStreamError(msg)
+
+    def items(self, expand=None, accept=None):
+        """
+        Return a generator for the items in the top level object.
+
+        Keys in expand are not decoded as a whole. Instead each of their
+        children is yielded separately as (key, name, value). All other
+        keys are yielded as (key, None, value).
+
+        The accept callback is called with (key, name) for every child of
+        an expanded key and the child is skipped when it returns False.
+
+        :type expand: list[str] or None
+        :type accept: func or None
+        :rtype: collections.Iterable[(unicode, unicode, object)]
+        """
+        expand = expand or []
+
+        if not self._peek():
+            return
+
+        for key in self._members():
+
+            if key in expand and self._peek() == u"{":
+                for name in self._members():
+                    value = self._decode()
+
+                    if accept is None or accept(key, name):
+                        yield key, name, value
+            else:
+                yield key, None, self._decode()
+
+    def read(self, key):
+        """
+        Return the value for the given top level key.
+
+        Stops reading the file as soon as the key has been found.
+
+        :type key: str
+        :rtype: object or None
+        """
+        for key_, name, value in self.items():
+            if key_ == key:
+                return value
+
+
+class JsonStreamWriter(object):
+
+    def __init__(self, path, indent=2, profile=None):
+        """
+        :type path: str
+        :type indent: int or None
+        :type profile: str or None
+        """
+        if profile is not None:
+            indent = PROFILES[profile]["indent"]
+
+        self._path = path
+        self._file = mutils.AtomicFile(path)
+        self._count = [0]
+        self._indent = indent
+
+        self._file.write("{")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        if t is None:
+            self.close()
+        else:
+            self.discard()
+
+    def discard(self):
+        """
+        Stop writing and leave the existing file unchanged.
+
+        :rtype: None
+        """
+        if self._file:
+            self._file.discard()
+            self._file = None
+
+    def close(self):
+        """
+        Finish the top level object and replace the file.
+
+        :rtype: None
+        """
+        if self._file:
+            while len(self._count) > 1:
+                self.endObject()
+
+            self._newline(len(self._count) - 1)
+            self._file.write("}")
+            self._file.close()
+            self._file = None
+
+    def path(self):
+        """
+        :rtype: str
+        """
+        return self._path
+
+    def _newline(self, depth):
+        """
+        Write a new line at the given depth when indenting is enabled.
+
+        :type depth: int
+        :rtype: None
+        """
+        if self._indent is not None:
+            self._file.write("\n" + " " * (self._indent * depth))
+
+    def _writeKey(self, key):
+        """
+        Write the separator and the given key for the current object.
+
+        :type key: str
+        :rtype: None
+        """
+        if self._count[-1]:
+            self._file.write(",")
+
+        self._count[-1] += 1
+
+        self._newline(len(self._count))
+        self._file.write(json.dumps(key))
+
+        if self._indent is None:
+            self._file.write(":")
+        else:
+            self._file.write(": ")
+
+    def writeItem(self, key, value):
+        """
+        Serialize the given value and write it to the current object.
+
+        :type key: str
+        :type value: object
+        :rtype: None
+        """
+        self._writeKey(key)
+
+        if self._indent is None:
+            data = encode(value, "compact")
+        else:
+            data = json.dumps(value, indent=self._indent, separators=(",", ": "))
+            data = data.replace("\n", "\n" + " " * (self._indent * len(self._count)))
+
+        self._file.write(data)
+
+    def beginObject(self, key):
+        """
+        Start a new nested object with the given key.
+
+        :type key: str
+        :rtype: None
+        """
+        self._writeKey(key)
+        self._file.write("{")
+        self._count.append(0)
+
+    def endObject(self):
+        """
+        Close the current nested object.
+
+        :rtype: None
+        """
+        count = self._count.pop()
+
+        if count:
+            self._newline(len(self._count))
+
+        self._file.write("}")
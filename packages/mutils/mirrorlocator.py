@@ -0,0 +1,220 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Find the mirror tables for an item without listing every parent folder.
+
+The mirror tables for an item are the ".mirror" items in the item folder
+and in its parent folders, nearest first, in the same order as
+studiolibrary.walkup. The folder listings are cached and only listed
+again when the modified time of the folder has changed, which is a
+single stat. The parent folders are shared by all the items in a folder,
+so another item in the same folder only lists its own folder.
+
+The loaded mirror tables are kept in a small LRU keyed by the path and
+the modified time of the file.
+
+Example:
+    import mutils
+
+    paths = mutils.findMirrorTables("/library/characters/wave.pose")
+    # ["/library/characters/character.mirror"]
+
+    mirrorTable = mutils.loadMirrorTable(paths[0] + "/mirrortable.json")
+"""
+import os
+import logging
+import threading
+import collections
+
+import mutils
+
+
+__all__ = [
+    "findMirrorTables",
+    "loadMirrorTable",
+    "clearMirrorTableCache",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_DEPTH = 10
+MAX_MIRROR_TABLES = 32
+MIRROR_EXTENSION = ".mirror"
+
+
+_lock = threading.Lock()
+
+# {dirname: (mtime, names)}
+_listings = {}
+
+# {path: ([(dirname, mtime)], paths)}
+_results = {}
+
+# {path: (mtime, mirrorTable)}
+_mirrorTables = collections.OrderedDict()
+
+
+def getmtime(path):
+    """
+    Return the modified time of the given path or None.
+
+    :type path: str
+    :rtype: float or None
+    """
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def listMirrorNames(dirname, mtime):
+    """
+    Return the names of the mirror tables in the given folder.
+
+    The folder is only listed again when its modified time has changed.
+
+    :type dirname: str
+    :type mtime: float
+    :rtype: list[str]
+    """
+    with _lock:
+        listing = _listings.get(dirname)
+
+    if listing and listing[0] == mtime:
+        return listing[1]
+
+    try:
+        names = os.listdir(dirname)
+    except OSError:
+        names = []
+
+    names = sorted(name for name in names if name.endswith(MIRROR_EXTENSION))
+
+    with _lock:
+        _listings[dirname] = (mtime, names)
+
+    return names
+
+
+def normPath(path):
+    """
+    Return a normalized path containing only forward slashes.
+
+    :type path: str
+    :rtype: str
+    """
+    return path.replace("\\", "/").rstrip("/")
+
+
+def ancestors(path, depth=MAX_DEPTH):
+    """
+    Return the given folder and its parent folders up to the given depth.
+
+    The same folders as studiolibrary.walkup, so the root of the file
+    system is not included.
+
+    :type path: str
+    :type depth: int
+    :rtype: list[str]
+    """
+    dirnames = []
+
+    for i in range(depth + 1):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+
+        dirnames.append(path)
+        path = normPath(parent)
+
+    return dirnames
+
+
+def findMirrorTables(path, depth=MAX_DEPTH):
+    """
+    Return the mirror table paths for the given item path, nearest first.
+
+    The item folder itself is searched first, then its parent folders.
+
+    :type path: str
+    :type depth: int
+    :rtype: list[str]
+    """
+    path = normPath(path)
+
+    mtimes = [(d, getmtime(d)) for d in ancestors(path, depth)]
+
+    with _lock:
+        result = _results.get(path)
+
+    if result and result[0] == mtimes:
+        return list(result[1])
+
+    paths = []
+
+    for d, mtime in mtimes:
+        if mtime is None:
+            continue
+
+        for name in listMirrorNames(d, mtime):
+            paths.append(d + "/" + name)
+
+    with _lock:
+        _results[path] = (mtimes, paths)
+
+    return list(paths)
+
+
+def loadMirrorTable(path):
+    """
+    Return the mirror table for the given path from the cache.
+
+    The file is read again when its modified time has changed.
+
+    :type path: str
+    :rtype: mutils.MirrorTable
+    """
+    mtime = getmtime(path)
+
+    with _lock:
+        cached = _mirrorTables.pop(path, None)
+
+        if cached and cached[0] == mtime:
+            _mirrorTables[path] = cached
+            return cached[1]
+
+    logger.debug("Loading mirror table %s", path)
+
+    mirrorTable = mutils.MirrorTable.fromPath(path)
+
+    with _lock:
+        _mirrorTables[path] = (mtime, mirrorTable)
+
+        while len(_mirrorTables) > MAX_MIRROR_TABLES:
+            _mirrorTables.popitem(last=False)
+
+    return mirrorTable
+
+
+def clearMirrorTableCache():
+    """
+    Clear the cached folder listings and mirror tables.
+
+    :rtype: None
+    """
+    with _lock:
+        _listings.clear()
+        _results.clear()
+        _mirrorTables.clear()
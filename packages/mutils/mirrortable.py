@@ -92,6 +92,14 @@ RE_RIGHT_SIDE = "Right|right|Rt|rt_|_rt|_r_|_R|R_|:r_|^r_|_r$|:R|^R"
 
 VALID_NODE_TYPES = ["joint", "transform"]
 
+# The attributes that are negated for each mirror axis
+MIRRORED_ATTRS = {
+    (-1, 1, 1): ("translateX", "rotateY", "rotateZ"),
+    (1, -1, 1): ("translateY", "rotateX", "rotateZ"),
+    (1, 1, -1): ("translateZ", "rotateX", "rotateY"),
+    (-1, -1, -1): ("translateX", "translateY", "translateZ"),
+}
+
 
 class MirrorPlane:
     YZ = [-1, 1, 1]
@@ -183,6 +191,8 @@ class MirrorTable(mutils.TransferObject):
         """
         return MirrorTable.findSide(objects, RE_RIGHT_SIDE)
 
+    _sidePatterns = {}
+
     @classmethod
     def findSide(cls, objects, reSides):
         """
@@ -196,7 +206,12 @@ class MirrorTable(mutils.TransferObject):
             reSides = reSides.split("|")
 
         # Compile the list of regular expressions into a re.object
-        reSides = [re.compile(side) for side in reSides]
+        key = tuple(reSides)
+
+        if key not in cls._sidePatterns:
+            cls._sidePatterns[key] = [re.compile(side) for side in reSides]
+
+        reSides = cls._sidePatterns[key]
 
         for obj in objects:
             obj = obj.split("|")[-1]
@@ -330,6 +345,43 @@ class MirrorTable(mutils.TransferObject):
 
         return dstName
 
+    def __init__(self):
+        mutils.TransferObject.__init__(self)
+
+        self._mirrorNames = {}
+        self._mirrorNamesKey = None
+
+    def setData(self, data):
+        """
+        Set the data for the mirror table and clear the mirror names.
+
+        :type data: dict
+        """
+        mutils.TransferObject.setData(self, data)
+        self._mirrorNamesKey = None
+
+    def mirrorNames(self):
+        """
+        Return the map of object names to the name of the opposite side.
+
+        The map starts with the names saved in the mirror table file and
+        any other names, like the objects in a destination namespace, are
+        added the first time they are mirrored. Center objects map to None.
+
+        :rtype: dict[str, str or None]
+        """
+        key = (self.leftSide(), self.rightSide())
+
+        if self._mirrorNamesKey != key:
+            self._mirrorNamesKey = key
+            self._mirrorNames = {}
+
+            for name, data in self.objects().items():
+                if "mirrorObject" in data:
+                    self._mirrorNames[name] = data["mirrorObject"]
+
+        return self._mirrorNames
+
     def mirrorObject(self, obj):
         """
         Return the other/opposite side for the given name.
@@ -341,9 +393,14 @@ class MirrorTable(mutils.TransferObject):
         :type obj: str
         :rtype: str or None
         """
-        leftSide = self.leftSide()
-        rightSide = self.rightSide()
-        return self._mirrorObject(obj, leftSide, rightSide)
+        names = self.mirrorNames()
+
+        if obj not in names:
+            leftSide = self.leftSide()
+            rightSide = self.rightSide()
+            names[obj] = self._mirrorObject(obj, leftSide, rightSide)
+
+        return names[obj]
 
     @staticmethod
     def _mirrorObject(obj, leftSide, rightSide):
@@ -465,22 +522,109 @@ class MirrorTable(mutils.TransferObject):
         :type mirrorAxis: list[int]
         :rtype: float
         """
-        if mirrorAxis == [-1, 1, 1]:
-            if attr == "translateX" or attr == "rotateY" or attr == "rotateZ":
-                return True
+        if mirrorAxis is None:
+            return False
 
-        elif mirrorAxis == [1, -1, 1]:
-            if attr == "translateY" or attr == "rotateX" or attr == "rotateZ":
-                return True
+        return attr in MIRRORED_ATTRS.get(tuple(mirrorAxis), ())
 
-        elif mirrorAxis == [1, 1, -1]:
-            if attr == "translateZ" or attr == "rotateX" or attr == "rotateY":
-                return True
+    _mirrorMasks = {}
 
-        elif mirrorAxis == [-1, -1, -1]:
-            if attr == "translateX" or attr == "translateY" or attr == "translateZ":
-                return True
-        return False
+    @staticmethod
+    def mirrorMask(attrs, mirrorAxis):
+        """
+        Return the value scale for each of the given attributes.
+
+        The masks are cached since most objects share the same
+        keyable attributes and mirror axis.
+
+        Example:
+            print MirrorTable.mirrorMask(["translateX", "translateY"], [-1, 1, 1])
+            # [-1, 1]
+
+        :type attrs: list[str]
+        :type mirrorAxis: list[int] or None
+        :rtype: list[int]
+        """
+        key = (tuple(attrs), tuple(mirrorAxis or ()))
+        mask = MirrorTable._mirrorMasks.get(key)
+
+        if mask is None:
+            mirrored = MIRRORED_ATTRS.get(key[1], ())
+            mask = [-1 if attr in mirrored else 1 for attr in attrs]
+            MirrorTable._mirrorMasks[key] = mask
+
+        return mask
+
+    @staticmethod
+    def mirrorValues(values, mask):
+        """
+        Return the given values negated where the mask is -1.
+
+        :type values: list
+        :type mask: list[int]
+        :rtype: list
+        """
+        return [v * -1 if s < 0 else v for v, s in zip(values, mask)]
+
+    @staticmethod
+    def keyedPlugs(obj):
+        """
+        Return the keyed plug and its anim curve for each connected attribute.
+
+        The attributes in a character set are keyed on the character, so
+        the plug of the character is returned for them. Attributes that
+        are driven by any other node, such as a constraint or a pairBlend,
+        are returned as (None, None).
+
+        :type obj: str
+        :rtype: dict[str, (str or None, str or None)]
+        """
+        result = {}
+
+        connections = maya.cmds.listConnections(
+            obj,
+            source=True,
+            destination=False,
+            connections=True,
+            plugs=True,
+            skipConversionNodes=False,
+        ) or []
+
+        for dstPlug, srcPlug in zip(connections[::2], connections[1::2]):
+            attr = dstPlug.split(".", 1)[-1]
+            node = srcPlug.split(".")[0]
+            nodeType = maya.cmds.nodeType(node)
+
+            if "animCurve" in nodeType:
+                result[attr] = (dstPlug, node)
+
+            elif nodeType == "character":
+                curves = maya.cmds.listConnections(
+                    srcPlug,
+                    source=True,
+                    destination=False,
+                    type="animCurve",
+                ) or []
+                result[attr] = (srcPlug, curves[0] if curves else None)
+
+            else:
+                result.setdefault(attr, (None, None))
+
+        return result
+
+    @staticmethod
+    def animCurves(obj):
+        """
+        Return the anim curve for each animated attribute of the given object.
+
+        Attributes that are connected to any other node are returned
+        with a value of None.
+
+        :type obj: str
+        :rtype: dict[str, str or None]
+        """
+        plugs = MirrorTable.keyedPlugs(obj)
+        return dict((attr, curve) for attr, (plug, curve) in plugs.items())
 
     @staticmethod
     def isAxisMirrored(srcObj, dstObj, axis, mirrorPlane):
@@ -607,7 +751,10 @@ class MirrorTable(mutils.TransferObject):
         :type name:
         :rtype:
         """
-        result = {"mirrorAxis": self.calculateMirrorAxis(name)}
+        result = {
+            "mirrorAxis": self.calculateMirrorAxis(name),
+            "mirrorObject": self.mirrorObject(name),
+        }
         return result
 
     def matchObjects(
@@ -721,31 +868,58 @@ class MirrorTable(mutils.TransferObject):
         :type attrs: None | list[str]
         :type option: MirrorOption
         """
-        srcValue = None
-        dstValue = None
         srcValid = self.isValidMirror(srcObj, option)
         dstValid = self.isValidMirror(dstObj, option)
 
         if attrs is None:
             attrs = maya.cmds.listAttr(srcObj, keyable=True) or []
 
-        for attr in attrs:
-            dstAttr = dstObj + "." + attr
-            srcAttr = srcObj + "." + attr
-            if maya.cmds.objExists(dstAttr):
-                if dstValid:
-                    srcValue = maya.cmds.getAttr(srcAttr)
+        attrs = self.existingAttrs(dstObj, attrs)
+        mask = self.mirrorMask(attrs, mirrorAxis)
+
+        # Read both sides before setting any values so they can be swapped
+        if dstValid:
+            srcValues = [maya.cmds.getAttr(srcObj + "." + attr) for attr in attrs]
+
+        if srcValid:
+            dstValues = [maya.cmds.getAttr(dstObj + "." + attr) for attr in attrs]
 
-                if srcValid:
-                    dstValue = maya.cmds.getAttr(dstAttr)
+        if dstValid:
+            self.setAttrs(dstObj, attrs, self.mirrorValues(srcValues, mask))
+
+        if srcValid:
+            self.setAttrs(srcObj, attrs, self.mirrorValues(dstValues, mask))
+
+    @staticmethod
+    def existingAttrs(name, attrs):
+        """
+        Return only the given attributes that exist on the given object.
 
-                if dstValid:
-                    self.setAttr(dstObj, attr, srcValue, mirrorAxis=mirrorAxis)
+        :type name: str
+        :type attrs: list[str]
+        :rtype: list[str]
+        """
+        result = []
+        existing = set(maya.cmds.listAttr(name) or [])
 
-                if srcValid:
-                    self.setAttr(srcObj, attr, dstValue, mirrorAxis=mirrorAxis)
+        for attr in attrs:
+            if attr in existing or maya.cmds.objExists(name + "." + attr):
+                result.append(attr)
             else:
-                logger.debug("Cannot find destination attribute %s" % dstAttr)
+                logger.debug("Cannot find destination attribute %s.%s" % (name, attr))
+
+        return result
+
+    def setAttrs(self, name, attrs, values):
+        """
+        Set the given values that have already been mirrored.
+
+        :type name: str
+        :type attrs: list[str]
+        :type values: list
+        """
+        for attr, value in zip(attrs, values):
+            self.setAttr(name, attr, value)
 
     def setAttr(self, name, attr, value, mirrorAxis=None):
         """
@@ -772,6 +946,22 @@ class MirrorTable(mutils.TransferObject):
         srcValid = self.isValidMirror(srcObj, option)
         dstValid = self.isValidMirror(dstObj, option)
 
+        if not time:
+            # Both sides are read before any keys are changed so that
+            # a temporary object is not needed to swap the animation
+            if dstValid:
+                srcAnimation = self.readAnimation(srcObj)
+
+            if srcValid and srcObj != dstObj:
+                dstAnimation = self.readAnimation(dstObj)
+                self.writeAnimation(srcObj, dstAnimation, mirrorAxis=mirrorAxis)
+
+            if dstValid:
+                self.writeAnimation(dstObj, srcAnimation, mirrorAxis=mirrorAxis)
+
+            return
+
+        # Pasting keys into a time range is done by Maya
         tmpObj, = maya.cmds.duplicate(srcObj, name='DELETE_ME', parentOnly=True)
         try:
             if dstValid:
@@ -783,6 +973,73 @@ class MirrorTable(mutils.TransferObject):
         finally:
             maya.cmds.delete(tmpObj)
 
+    @staticmethod
+    def readAnimation(obj):
+        """
+        Return the anim curves and static values for the keyable attributes.
+
+        :type obj: str
+        :rtype: (list[str], dict[str, mutils.AnimCurve], list)
+        """
+        attrs = maya.cmds.listAttr(obj, keyable=True) or []
+        connections = MirrorTable.animCurves(obj)
+
+        curves = {}
+        values = []
+
+        for attr in attrs:
+            curve = connections.get(attr)
+
+            if curve:
+                curves[attr] = mutils.AnimCurve.fromCurve(curve)
+
+            values.append(maya.cmds.getAttr(obj + "." + attr))
+
+        return attrs, curves, values
+
+    def writeAnimation(self, obj, animation, mirrorAxis=None):
+        """
+        Replace the animation on the given object with the given animation.
+
+        The values and keys for the mirrored attributes are negated in
+        memory and each curve is created with a single command.
+
+        :type obj: str
+        :type animation: (list[str], dict[str, mutils.AnimCurve], list)
+        :type mirrorAxis: list[int] or None
+        """
+        attrs, curves, values = animation
+        values = dict(zip(attrs, values))
+
+        attrs = self.existingAttrs(obj, attrs)
+        mask = self.mirrorMask(attrs, mirrorAxis)
+        values = self.mirrorValues([values[attr] for attr in attrs], mask)
+
+        maya.cmds.cutKey(obj, time=())  # remove keys
+
+        plugs = self.keyedPlugs(obj)
+        shortName = obj.split("|")[-1]
+
+        for attr, scale, value in zip(attrs, mask, values):
+            curve = curves.get(attr)
+            plug = plugs.get(attr, (obj + "." + attr, None))[0]
+
+            # Never break the connection of a constraint, a pairBlend or
+            # any other node that drives the attribute
+            if plug is None:
+                continue
+
+            if curve:
+                if scale < 0:
+                    curve = curve.copy()
+                    curve.negate()
+
+                node = curve.create(shortName + "_" + attr)
+                maya.cmds.connectAttr(node + ".output", plug, force=True)
+
+            elif attr not in plugs:
+                self.setAttr(obj, attr, value)
+
     def _transferAnimation(self, srcObj, dstObj, attrs=None, mirrorAxis=None, time=None):
         """
         :type srcObj: str
@@ -77,10 +77,14 @@ class Node(object):
             self._shortname = self.name().split("|")[-1]
         return self._shortname
 
-    def toShortName(self):
+    def toShortName(self, resolver=None):
         """
+        :type resolver: ShortNameResolver or None
         :rtype: None or str
         """
+        if resolver is not None:
+            return resolver.toShortName(self)
+
         # Try to reduce any long names to short names when using namespaces
         names = maya.cmds.ls(self.shortname())
         if len(names) == 1:
@@ -174,3 +178,84 @@ class Node(object):
         self._namespace = None
 
         return self.name()
+
+
+class ShortNameResolver(object):
+    """
+    Resolve the short names for many nodes with a single scene query.
+
+    Example:
+        resolver = ShortNameResolver(["|group|character:hand_L"])
+        print resolver.toShortName(Node("|group|character:hand_L")).name()
+        # character:hand_L
+    """
+
+    def __init__(self, names=None):
+        """
+        :type names: list[str] or None
+        """
+        self._index = {}
+
+        if names:
+            self.add(names)
+
+    def add(self, names):
+        """
+        Add the given names to the index with one call to maya.cmds.ls.
+
+        :type names: list[str]
+        :rtype: None
+        """
+        shortnames = set()
+
+        for name in names:
+            shortname = name.split("|")[-1]
+
+            # Wild cards can match more than one short name
+            if "*" not in shortname and shortname not in self._index:
+                shortnames.add(shortname)
+
+        if not shortnames:
+            return
+
+        for shortname in shortnames:
+            self._index[shortname] = []
+
+        for name in maya.cmds.ls(sorted(shortnames)) or []:
+            shortname = name.split("|")[-1]
+
+            if shortname in self._index:
+                self._index[shortname].append(name)
+
+    def names(self, shortname):
+        """
+        Return all the scene names for the given short name.
+
+        :type shortname: str
+        :rtype: list[str]
+        """
+        if "*" in shortname:
+            return maya.cmds.ls(shortname) or []
+
+        if shortname not in self._index:
+            self.add([shortname])
+
+        return self._index[shortname]
+
+    def toShortName(self, node):
+        """
+        Return a new node with the short name for the given node.
+
+        :type node: Node
+        :raises: mutils.MoreThanOneObjectFoundError
+        :raises: mutils.NoObjectFoundError
+        :rtype: Node
+        """
+        names = self.names(node.shortname())
+
+        if len(names) == 1:
+            return Node(names[0])
+        elif len(names) > 1:
+            raise mutils.MoreThanOneObjectFoundError("More than one object found %s" % str(names))
+        else:
+            raise mutils.NoObjectFoundError("No object found %s" % str(node.shortname()))
@@ -73,7 +73,7 @@ logger = logging.getLogger(__name__)
 _pose_ = None
 
 
-def savePose(path, objects, metadata=None):
+def savePose(path, objects, metadata=None, background=False):
     """
     Convenience function for saving a pose to disc for the given objects.
 
@@ -90,6 +90,7 @@ def savePose(path, objects, metadata=None):
     :type path: str
     :type objects: list[str]
     :type metadata: dict or None
+    :type background: bool
     :rtype: Pose
     """
     pose = mutils.Pose.fromObjects(objects)
@@ -97,7 +98,7 @@ def savePose(path, objects, metadata=None):
     if metadata:
         pose.updateMetadata(metadata)
 
-    pose.save(path)
+    pose.save(path, background=background)
 
     return pose
 
@@ -136,28 +137,44 @@ class Pose(mutils.TransferObject):
         self._mirrorTable = None
         self._autoKeyFrame = None
 
-    def createObjectData(self, name):
+    def add(self, objects):
+        """
+        Add the given objects to the pose.
+
+        The attribute values for all the objects are captured in bulk.
+
+        :type objects: str | list[str]
+        """
+        if isinstance(objects, basestring):
+            objects = [objects]
+
+        captured = mutils.captureAttrs(objects)
+
+        for name in objects:
+            self.objects()[name] = self.createObjectData(name, captured[name])
+
+    def createObjectData(self, name, attrs=None):
         """
         Create the object data for the given object name.
-        
+
         :type name: str
+        :type attrs: list[(str, str, object)] or None
         :rtype: dict
         """
-        attrs = maya.cmds.listAttr(name, unlocked=True, keyable=True) or []
-        attrs = list(set(attrs))
-        attrs = [mutils.Attribute(name, attr) for attr in attrs]
+        if attrs is None:
+            attrs = mutils.captureAttrs([name])[name]
 
         data = {"attrs": self.attrs(name)}
 
-        for attr in attrs:
-            if attr.isValid():
-                if attr.value() is None:
-                    msg = "Cannot save the attribute %s with value None."
-                    logger.warning(msg, attr.fullname())
+        for attr, type_, value in attrs:
+            if type_ in mutils.attribute.VALID_ATTRIBUTE_TYPES:
+                if value is None:
+                    msg = "Cannot save the attribute %s.%s with value None."
+                    logger.warning(msg, name, attr)
                 else:
-                    data["attrs"][attr.attr()] = {
-                        "type": attr.type(),
-                        "value": attr.value()
+                    data["attrs"][attr] = {
+                        "type": type_,
+                        "value": value
                     }
 
         return data
@@ -381,29 +398,31 @@ class Pose(mutils.TransferObject):
         if batchMode:
             key = False
 
-        self.updateCache(
-            objects=objects,
-            namespaces=namespaces,
-            attrs=attrs,
-            batchMode=batchMode,
-            clearCache=clearCache,
-            mirrorTable=mirrorTable,
-            onlyConnected=onlyConnected,
-            ignoreConnected=ignoreConnected,
-            search=search,
-            replace=replace,
-        )
-
-        self.beforeLoad(clearSelection=clearSelection)
-
-        try:
-            self.loadCache(blend=blend, key=key, mirror=mirror)
-        finally:
-            if not batchMode:
-                self.afterLoad()
-
-                # Return the focus to the Maya window
-                maya.cmds.setFocus("MayaWindow")
+        # Remember the connection and lock state of each plug while loading
+        with mutils.QueryCache():
+            self.updateCache(
+                objects=objects,
+                namespaces=namespaces,
+                attrs=attrs,
+                batchMode=batchMode,
+                clearCache=clearCache,
+                mirrorTable=mirrorTable,
+                onlyConnected=onlyConnected,
+                ignoreConnected=ignoreConnected,
+                search=search,
+                replace=replace,
+            )
+
+            self.beforeLoad(clearSelection=clearSelection)
+
+            try:
+                self.loadCache(blend=blend, key=key, mirror=mirror)
+            finally:
+                if not batchMode:
+                    self.afterLoad()
+
+                    # Return the focus to the Maya window
+                    maya.cmds.setFocus("MayaWindow")
 
         if refresh:
             maya.cmds.refresh(cv=True)
@@ -459,13 +478,21 @@ class Pose(mutils.TransferObject):
             if mirrorTable:
                 self.setMirrorTable(mirrorTable)
 
-            matches = mutils.matchNames(
+            matches = list(mutils.matchNames(
                 srcObjects,
                 dstObjects=dstObjects,
                 dstNamespaces=namespaces,
                 search=search,
                 replace=replace,
-            )
+            ))
+
+            resolver = None
+
+            if usingNamespaces:
+                # Resolve all the short names with a single scene query
+                resolver = mutils.ShortNameResolver(
+                    [dstNode.name() for srcNode, dstNode in matches]
+                )
 
             for srcNode, dstNode in matches:
                 self.cacheNode(
@@ -475,6 +502,7 @@ class Pose(mutils.TransferObject):
                     onlyConnected=onlyConnected,
                     ignoreConnected=ignoreConnected,
                     usingNamespaces=usingNamespaces,
+                    resolver=resolver,
                 )
 
         if not self.cache():
@@ -490,7 +518,8 @@ class Pose(mutils.TransferObject):
             attrs=None,
             ignoreConnected=None,
             onlyConnected=None,
-            usingNamespaces=None
+            usingNamespaces=None,
+            resolver=None,
     ):
         """
         Cache the given pair of nodes.
@@ -501,6 +530,7 @@ class Pose(mutils.TransferObject):
         :type ignoreConnected: bool or None
         :type onlyConnected: bool or None
         :type usingNamespaces: none or list[str]
+        :type resolver: mutils.ShortNameResolver or None
         """
         mirrorAxis = None
         mirrorObject = None
@@ -530,7 +560,7 @@ class Pose(mutils.TransferObject):
             # Try and use the short name.
             # Much faster than the long name when setting attributes.
             try:
-                dstNode = dstNode.toShortName()
+                dstNode = dstNode.toShortName(resolver)
             except mutils.NoObjectFoundError as msg:
                 logger.debug(msg)
                 return
@@ -0,0 +1,199 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Scoped memoisation of scene queries.
+
+While a query cache is active, mutils.Attribute remembers whether a plug
+exists, is locked, is settable, its type and its connections. The values
+are cleared when the scope ends, when the scene changes or undo/redo is
+called and when an Attribute changes its own keys or connections.
+
+Example:
+    import mutils
+
+    with mutils.QueryCache():
+        pose.load(objects=objects)
+"""
+import logging
+
+import mutils
+
+
+__all__ = [
+    "QueryCache",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+# The Maya events that clear the active query cache
+INVALIDATE_EVENTS = [
+    "Undo",
+    "Redo",
+    "SceneOpened",
+    "NewSceneOpened",
+]
+
+
+class QueryCache(object):
+
+    _active = None
+
+    @classmethod
+    def active(cls):
+        """
+        Return the query cache for the current scope.
+
+        :rtype: QueryCache or None
+        """
+        return cls._active
+
+    @classmethod
+    def get(cls, key, attr, func):
+        """
+        Return the memoised result of the given function for the given key.
+
+        The function is called directly when no query cache is active.
+
+        :type key: str
+        :type attr: str
+        :type func: func
+        :rtype: object
+        """
+        cache = cls._active
+
+        if cache is None:
+            return func()
+
+        return cache.query(key, attr, func)
+
+    @classmethod
+    def invalidate(cls, key):
+        """
+        Remove all the queries for the given plug or node name.
+
+        :type key: str
+        :rtype: None
+        """
+        if cls._active is not None:
+            cls._active._data.pop(key, None)
+
+    def __init__(self):
+        self._data = {}
+        self._hits = 0
+        self._misses = 0
+        self._depth = 0
+        self._scriptJobs = []
+
+    def query(self, key, attr, func):
+        """
+        :type key: str
+        :type attr: str
+        :type func: func
+        :rtype: object
+        """
+        queries = self._data.setdefault(key, {})
+
+        if attr in queries:
+            self._hits += 1
+        else:
+            self._misses += 1
+            queries[attr] = func()
+
+        return queries[attr]
+
+    def clear(self):
+        """
+        Remove all memoised queries.
+
+        :rtype: None
+        """
+        self._data = {}
+
+    def hits(self):
+        """
+        :rtype: int
+        """
+        return self._hits
+
+    def misses(self):
+        """
+        :rtype: int
+        """
+        return self._misses
+
+    def hitRate(self):
+        """
+        Return the fraction of queries that were answered from the cache.
+
+        :rtype: float
+        """
+        total = self._hits + self._misses
+        if total:
+            return self._hits / float(total)
+        return 0.0
+
+    def _createScriptJobs(self):
+        """
+        Clear the cache when the scene changes outside of the scope.
+
+        :rtype: None
+        """
+        for event in INVALIDATE_EVENTS:
+            try:
+                scriptJob = mutils.ScriptJob(event=[event, self.clear])
+                self._scriptJobs.append(scriptJob)
+            except Exception as error:
+                logger.debug("Cannot create script job for %s: %s", event, error)
+
+    def _killScriptJobs(self):
+        """
+        :rtype: None
+        """
+        for scriptJob in self._scriptJobs:
+            scriptJob.kill()
+
+        self._scriptJobs = []
+
+    def __enter__(self):
+        """
+        Activate the query cache or reuse the one that is already active.
+
+        :rtype: QueryCache
+        """
+        cache = QueryCache._active
+
+        if cache is None:
+            cache = self
+            QueryCache._active = self
+            self._createScriptJobs()
+
+        cache._depth += 1
+        return cache
+
+    def __exit__(self, t, v, tb):
+        """
+        :rtype: None
+        """
+        cache = QueryCache._active
+        cache._depth -= 1
+
+        if cache._depth == 0:
+            QueryCache._active = None
+            cache._killScriptJobs()
+            cache.clear()
+
+            if logger.isEnabledFor(logging.DEBUG):
+                msg = "Query cache: %d hits, %d misses (%0.1f%%)"
+                logger.debug(msg, cache.hits(), cache.misses(), cache.hitRate() * 100)
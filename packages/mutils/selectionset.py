@@ -60,10 +60,15 @@ class SelectionSet(mutils.TransferObject):
         dstObjects = objects
         srcObjects = self.objects()
 
-        matches = mutils.matchNames(
+        matches = list(mutils.matchNames(
                 srcObjects,
                 dstObjects=dstObjects,
                 dstNamespaces=namespaces
+        ))
+
+        # Resolve all the short names with a single scene query
+        resolver = mutils.ShortNameResolver(
+            [dstNode.name() for srcNode, dstNode in matches]
         )
 
         for srcNode, dstNode in matches:
@@ -77,7 +82,7 @@ class SelectionSet(mutils.TransferObject):
                 # Try to get the short name. Much faster than the long
                 # name when selecting objects.
                 try:
-                    dstNode = dstNode.toShortName()
+                    dstNode = dstNode.toShortName(resolver)
 
                 except mutils.NoObjectFoundError as error:
                     logger.debug(error)
@@ -0,0 +1,160 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmarks for the mutils file formats.
+
+The benchmarks do not need a Maya scene. They create synthetic pose data
+that is similar to a large facial rig.
+
+# Example:
+import mutils.tests.benchmark
+reload(mutils.tests.benchmark)
+mutils.tests.benchmark.run()
+"""
+import os
+import json
+import time
+import random
+
+import mutils
+
+
+ATTRS = [
+    ("translateX", "doubleLinear"),
+    ("translateY", "doubleLinear"),
+    ("translateZ", "doubleLinear"),
+    ("rotateX", "doubleAngle"),
+    ("rotateY", "doubleAngle"),
+    ("rotateZ", "doubleAngle"),
+    ("scaleX", "double"),
+    ("scaleY", "double"),
+    ("scaleZ", "double"),
+    ("visibility", "bool"),
+]
+
+
+def createPoseData(objectCount=1500, attrCount=20, namespace="face"):
+    """
+    Return synthetic pose data for the given number of objects and attributes.
+
+    :type objectCount: int
+    :type attrCount: int
+    :type namespace: str
+    :rtype: dict
+    """
+    objects = {}
+
+    for i in range(objectCount):
+        attrs = {}
+
+        for j in range(attrCount):
+            attr, type_ = ATTRS[j % len(ATTRS)]
+
+            if j >= len(ATTRS):
+                attr = "custom{0}_{1}".format(j, attr)
+
+            if type_ == "bool":
+                value = bool(random.randint(0, 1))
+            else:
+                value = random.uniform(-100, 100)
+
+            attrs[attr] = {"type": type_, "value": value}
+
+        name = "{0}:ctrl{1}_CON".format(namespace, i)
+        objects[name] = {"attrs": attrs}
+
+    metadata = {"user": "benchmark", "version": "1.0.0"}
+
+    return {"metadata": metadata, "objects": objects}
+
+
+def timeit(func, repeat=3):
+    """
+    Return the best time in seconds for calling the given function.
+
+    :type func: func
+    :type repeat: int
+    :rtype: float
+    """
+    result = None
+
+    for i in range(repeat):
+        start = time.time()
+        func()
+        duration = time.time() - start
+
+        if result is None or duration < result:
+            result = duration
+
+    return result
+
+
+def benchmarkFormats(objectCount=1500, attrCount=20):
+    """
+    Compare the read time and file size of the json and binary formats.
+
+    :type objectCount: int
+    :type attrCount: int
+    :rtype: dict
+    """
+    dirname = mutils.createTempPath("benchmark")
+
+    jsonPath = os.path.join(dirname, "pose.json")
+    binaryPath = os.path.join(dirname, "pose" + mutils.BINARY_EXTENSION)
+
+    data = createPoseData(objectCount, attrCount)
+
+    with open(jsonPath, "w") as f:
+        json.dump(data, f, indent=2)
+
+    mutils.writeBinary(binaryPath, data)
+
+    def readJsonModule():
+        with open(jsonPath, "r") as f:
+            json.load(f)
+
+    results = {
+        "jsonSize": os.path.getsize(jsonPath),
+        "binarySize": os.path.getsize(binaryPath),
+        "jsonModule": timeit(readJsonModule),
+        "jsonStream": timeit(lambda: mutils.TransferObject.readJson(jsonPath)),
+        "binary": timeit(lambda: mutils.readBinary(binaryPath)),
+        "jsonMetadata": timeit(lambda: mutils.TransferObject.readMetadata(jsonPath)),
+        "binaryMetadata": timeit(lambda: mutils.readBinaryMetadata(binaryPath)),
+    }
+
+    msg = "{0} objects x {1} attrs\n".format(objectCount, attrCount)
+    msg += "  size json:       {jsonSize:>12} bytes\n"
+    msg += "  size binary:     {binarySize:>12} bytes\n"
+    msg += "  read json:       {jsonModule:>12.4f} sec (json module)\n"
+    msg += "  read json:       {jsonStream:>12.4f} sec (streamed)\n"
+    msg += "  read binary:     {binary:>12.4f} sec\n"
+    msg += "  metadata json:   {jsonMetadata:>12.4f} sec\n"
+    msg += "  metadata binary: {binaryMetadata:>12.4f} sec"
+
+    print(msg.format(**results))
+
+    return results
+
+
+def run():
+    """
+    Run all the benchmarks.
+    """
+    benchmarkFormats(objectCount=100, attrCount=10)
+    benchmarkFormats(objectCount=1500, attrCount=20)
+    benchmarkFormats(objectCount=10000, attrCount=20)
+
+
+if __name__ == "__main__":
+    run()
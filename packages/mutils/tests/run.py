@@ -38,9 +38,17 @@ def testSuite():
     import test_pose
     import test_anim
     import test_match
+    import test_node
     import test_utils
+    import test_capture
+    import test_atomicwrite
+    import test_querycache
+    import test_animcurve
     import test_attribute
     import test_mirrortable
+    import test_mirrorlocator
+    import test_transferobject
+    import test_transfercache
 
     suite = unittest.TestSuite()
 
@@ -62,6 +70,30 @@ def testSuite():
     s = unittest.makeSuite(test_mirrortable.TestMirrorTable, 'test')
     suite.addTest(s)
 
+    s = unittest.makeSuite(test_mirrorlocator.TestMirrorLocator, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_transferobject.TestTransferObject, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_transfercache.TestTransferCache, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_animcurve.TestAnimCurve, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_node.TestNode, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_querycache.TestQueryCache, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_capture.TestCapture, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_atomicwrite.TestAtomicWrite, 'test')
+    suite.addTest(s)
+
     return suite
 
 
@@ -52,6 +52,22 @@ class TestAnim(test_base.TestBase):
 
         self.assertEqualAnimation()
 
+    def test_load_anim_curves(self):
+        """
+        Test saving and loading the animation as packed curve data.
+        """
+        self.srcPath = self.dataPath("test_anim.ma")
+        self.dstPath = self.dataPath("test_load_anim_curves.anim")
+
+        self.open()
+        anim = mutils.Animation.fromObjects(self.srcObjects)
+        anim.save(self.dstPath, fileType="animCurves", bakeConnected=False)
+
+        anim = mutils.Animation.fromPath(self.dstPath)
+        anim.load(self.dstObjects)
+
+        self.assertEqualAnimation()
+
     def test_bake_connected(self):
         """
         Test saving animation with the option bake connected.
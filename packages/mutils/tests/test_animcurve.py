@@ -0,0 +1,290 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+These tests do not need a Maya scene. The Maya commands are replaced
+with a stand-in that returns fixed key data and records the edits.
+
+# Example:
+import mutils.tests.test_animcurve
+reload(mutils.tests.test_animcurve)
+mutils.tests.test_animcurve.run()
+"""
+import unittest
+
+import mutils
+import mutils.animcurve
+
+
+class FakeCmds(object):
+
+    def __init__(self):
+        self.calls = []
+
+        self.times = [1.0, 5.0, 10.0]
+        self.values = [0.0, 2.5, -1.0]
+
+    def nodeType(self, node):
+        return "animCurveTL"
+
+    def getAttr(self, plug):
+        attr = plug.split(".")[-1]
+        return {
+            "preInfinity": 0,
+            "postInfinity": 4,
+            "curveColor": [(1.0, 0.5, 0.0)],
+            "useCurveColor": True,
+        }[attr]
+
+    def inRange(self, values, time):
+        """Return only the values for the keys within the inclusive time range."""
+        if not time:
+            return values
+        start, end = time
+        return [v for t, v in zip(self.times, values) if start <= t <= end]
+
+    def keyframe(self, curve, query=False, time=None, timeChange=False, valueChange=False):
+        if timeChange:
+            return self.inRange(self.times, time)
+        return self.inRange(self.values, time)
+
+    def keyTangent(self, curve, query=False, edit=False, time=None, **kwargs):
+        if edit:
+            self.calls.append(("keyTangent", kwargs))
+            return
+
+        if kwargs.get("weightedTangents"):
+            return [True]
+        elif kwargs.get("inTangentType"):
+            values = ["spline", "fixed", "step"]
+        elif kwargs.get("outTangentType"):
+            values = ["spline", "fixed", "step"]
+        elif kwargs.get("inAngle"):
+            values = [0.0, 45.0, 0.0]
+        elif kwargs.get("outAngle"):
+            values = [0.0, -45.0, 0.0]
+        elif kwargs.get("inWeight") or kwargs.get("outWeight"):
+            values = [1.0, 2.0, 1.0]
+        elif kwargs.get("lock"):
+            values = [True, False, True]
+        elif kwargs.get("weightLock"):
+            values = [False, False, False]
+
+        return self.inRange(values, time)
+
+    def createNode(self, nodeType, name=None, skipSelect=False):
+        self.calls.append(("createNode", nodeType, name))
+        return name
+
+    def setAttr(self, plug, *args, **kwargs):
+        self.calls.append(("setAttr", plug, args, kwargs))
+
+
+class FakeMaya(object):
+
+    def __init__(self):
+        self.cmds = FakeCmds()
+
+
+class TestAnimCurve(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.path = mutils.createTempPath("test_animcurve") + "/animation.curves"
+
+        self._maya = getattr(mutils.animcurve, "maya", None)
+        self.maya = FakeMaya()
+        mutils.animcurve.maya = self.maya
+
+    def tearDown(self):
+        """
+        """
+        mutils.animcurve.maya = self._maya
+
+    def createCurve(self):
+        """
+        :rtype: mutils.AnimCurve
+        """
+        return mutils.AnimCurve.fromCurve("pSphere1_translateX", time=(1, 10))
+
+    def test_from_curve(self):
+        """
+        Test querying the key data from a Maya anim curve.
+        """
+        curve = self.createCurve()
+
+        self.assertEqual("animCurveTL", curve.type())
+        self.assertEqual([1.0, 5.0, 10.0], curve.times())
+        self.assertEqual([0.0, 2.5, -1.0], curve.values())
+        self.assertEqual(["spline", "fixed", "step"], curve.keys("inTypes"))
+        self.assertEqual((1.0, 10.0), curve.frameRange())
+        self.assertEqual(4, curve.attrs()["postInfinity"])
+        self.assertTrue(curve.isWeighted())
+
+    def test_exclude_upper_bound(self):
+        """
+        Test the keys just before the end time are kept and the key on the end time is not.
+        """
+        self.maya.cmds.times = [1.0, 9.5, 10.0]
+
+        curve = mutils.AnimCurve.fromCurve(
+            "pSphere1_translateX",
+            time=(1, 10),
+            includeUpperBound=False,
+        )
+
+        self.assertEqual([1.0, 9.5], curve.times())
+        self.assertEqual([0.0, 2.5], curve.values())
+        self.assertEqual(["spline", "fixed"], curve.keys("outTypes"))
+        self.assertEqual([0.0, -45.0], curve.keys("outAngles"))
+
+        curve = mutils.AnimCurve.fromCurve("pSphere1_translateX", time=(1, 10))
+        self.assertEqual([1.0, 9.5, 10.0], curve.times())
+
+    def test_save_read(self):
+        """
+        Test saving and reading the packed curve data without Maya.
+        """
+        curve1 = self.createCurve()
+        curve2 = mutils.AnimCurve("animCurveTA")
+        curve2.setKeys([0.0, 24.0], [90.0, -90.0])
+
+        mutils.saveAnimCurves(self.path, {"CURVE1": curve1, "CURVE2": curve2})
+
+        curves = mutils.readAnimCurves(self.path)
+        self.assertEqual(["CURVE1", "CURVE2"], sorted(curves.keys()))
+
+        for name, expected in [("CURVE1", curve1), ("CURVE2", curve2)]:
+            result = curves[name]
+            self.assertEqual(expected.type(), result.type())
+            self.assertEqual(expected.attrs(), result.attrs())
+
+            for key in mutils.animcurve.FLOAT_ARRAYS + mutils.animcurve.BYTE_ARRAYS:
+                self.assertEqual(expected.keys(key), result.keys(key))
+
+        curves = mutils.readAnimCurves(self.path, names=["CURVE2"])
+        self.assertEqual(["CURVE2"], list(curves.keys()))
+
+        toc = mutils.animcurve.readAnimCurvesToc(self.path)
+        self.assertEqual(3, toc["curves"]["CURVE1"]["count"])
+        self.assertEqual([0.0, 24.0], toc["curves"]["CURVE2"]["frameRange"])
+
+    def test_read_time_range(self):
+        """
+        Test only the keys around the time range are decoded.
+        """
+        curve = mutils.AnimCurve("animCurveTU")
+        curve.setKeys(range(0, 100, 10), range(10))
+
+        mutils.saveAnimCurves(self.path, {"CURVE1": curve})
+
+        curves = mutils.readAnimCurves(self.path, time=(35, 45))
+        self.assertEqual([20.0, 30.0, 40.0, 50.0, 60.0], curves["CURVE1"].times())
+        self.assertEqual([2.0, 3.0, 4.0, 5.0, 6.0], curves["CURVE1"].values())
+
+        curves = mutils.readAnimCurves(self.path, time=(200, 300))
+        self.assertEqual([80.0, 90.0], curves["CURVE1"].times())
+
+        self.assertEqual((0, 2), mutils.animcurve.keySpan([0, 10, 20], (-20, -10)))
+        self.assertEqual((1, 4), mutils.animcurve.keySpan(range(0, 30, 5), (9, 11), margin=1))
+
+    def test_read_threads(self):
+        """
+        Test reading the curves with a pool of threads.
+        """
+        curves = {}
+
+        for i in range(50):
+            curve = mutils.AnimCurve("animCurveTL")
+            curve.setKeys([0.0, 10.0, float(i)], [float(i), 1.0, 2.0])
+            curves["CURVE{0}".format(i)] = curve
+
+        mutils.saveAnimCurves(self.path, curves)
+
+        expected = mutils.readAnimCurves(self.path, threads=1)
+        result = mutils.readAnimCurves(self.path, threads=4)
+
+        self.assertEqual(sorted(expected.keys()), sorted(result.keys()))
+
+        for name in expected:
+            self.assertEqual(expected[name].values(), result[name].values())
+
+        names = ["CURVE3", "CURVE7"]
+        result = mutils.readAnimCurves(self.path, names=names, threads=4)
+        self.assertEqual(names, sorted(result.keys()))
+
+    def test_preview(self):
+        """
+        Test evaluating and slicing the curve without Maya.
+        """
+        curve = self.createCurve()
+
+        self.assertEqual(0.0, curve.valueAt(-10))
+        self.assertEqual(1.25, curve.valueAt(3))
+        self.assertAlmostEqual(1.1, curve.valueAt(7))
+        self.assertEqual(-1.0, curve.valueAt(100))
+
+        curve = curve.slice(2, 10)
+        self.assertEqual([5.0, 10.0], curve.times())
+        self.assertEqual(["fixed", "step"], curve.keys("outTypes"))
+
+    def test_create(self):
+        """
+        Test the curve is created with batched commands.
+        """
+        self.createCurve().create("REMOVE_IMPORT:CURVE1")
+        calls = self.maya.cmds.calls
+
+        self.assertEqual(("createNode", "animCurveTL", "REMOVE_IMPORT:CURVE1"), calls[0])
+
+        # All keys are set with a single command
+        setAttrs = [call for call in calls if call[0] == "setAttr"]
+        self.assertEqual("REMOVE_IMPORT:CURVE1.ktv[0:2]", setAttrs[0][1])
+        self.assertEqual((1.0, 0.0, 5.0, 2.5, 10.0, -1.0), setAttrs[0][2])
+        self.assertEqual({"size": 3}, setAttrs[0][3])
+
+        tangents = [call[1] for call in calls if call[0] == "keyTangent"]
+
+        # Only the fixed tangent needs the angle and weight
+        self.assertIn({
+            "absolute": True,
+            "index": (1, 1),
+            "inAngle": 45.0,
+            "inWeight": 2.0,
+            "outAngle": -45.0,
+            "outWeight": 2.0,
+        }, tangents)
+
+        self.assertIn({"index": [(0, 0)], "inTangentType": "spline"}, tangents)
+        self.assertIn({"index": [(2, 2)], "outTangentType": "step"}, tangents)
+        self.assertIn({"index": [(0, 0), (2, 2)], "lock": True}, tangents)
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestAnimCurve, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,104 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+import mutils.tests.test_atomicwrite
+reload(mutils.tests.test_atomicwrite)
+mutils.tests.test_atomicwrite.run()
+"""
+import os
+import json
+import unittest
+import multiprocessing
+
+import mutils
+
+
+WRITER_COUNT = 8
+WRITE_COUNT = 25
+
+
+def writeMany(path, index):
+    """
+    Write the given path many times from a separate process.
+
+    :type path: str
+    :type index: int
+    :rtype: None
+    """
+    for i in range(WRITE_COUNT):
+        data = {"writer": index, "count": i, "values": [index] * 5000}
+
+        with mutils.JsonStreamWriter(path, indent=None) as writer:
+            for key, value in data.items():
+                writer.writeItem(key, value)
+
+
+class TestAtomicWrite(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.dirname = mutils.createTempPath("test_atomicwrite")
+        self.path = self.dirname + "/pose.json"
+
+    @unittest.skipIf(os.name == "nt", "Requires fork")
+    def test_concurrent_writers(self):
+        """
+        Test many json stream writer processes while reading the file.
+
+        The atomic write itself is tested in studiolibrary.tests.
+        """
+        processes = []
+
+        for i in range(WRITER_COUNT):
+            process = multiprocessing.Process(target=writeMany, args=(self.path, i))
+            processes.append(process)
+            process.start()
+
+        reads = 0
+
+        while any(process.is_alive() for process in processes):
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+
+                self.assertEqual([data["writer"]] * 5000, data["values"])
+                reads += 1
+
+        for process in processes:
+            process.join()
+            self.assertEqual(0, process.exitcode)
+
+        self.assertGreater(reads, 0)
+        self.assertEqual(["pose.json"], os.listdir(self.dirname))
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestAtomicWrite, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
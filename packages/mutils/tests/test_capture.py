@@ -0,0 +1,170 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+These tests do not need a Maya scene. The Maya commands are replaced
+with a stand-in and the values are read with the command fallback.
+
+# Example:
+import mutils.tests.test_capture
+reload(mutils.tests.test_capture)
+mutils.tests.test_capture.run()
+"""
+import os
+import unittest
+
+import mutils
+import mutils.capture
+import mutils.attribute
+import mutils.decorators
+import mutils.transferobject
+
+
+class FakeCmds(object):
+
+    def __init__(self):
+        self.plugs = {
+            "sphere.translateX": ("doubleLinear", 1.5),
+            "sphere.rotateX": ("doubleAngle", 90.0),
+            "sphere.visibility": ("bool", True),
+            "sphere.message": ("message", None),
+            "cube.blink": ("double", None),
+            "cube.rotateOrder": ("enum", 2),
+        }
+
+    def listAttr(self, name, unlocked=False, keyable=False):
+        return [plug.split(".")[1] for plug in self.plugs if plug.startswith(name + ".")]
+
+    def getAttr(self, plug, type=False):
+        if type:
+            return self.plugs[plug][0]
+        return self.plugs[plug][1]
+
+    def waitCursor(self, state=False):
+        pass
+
+    def about(self, v=False):
+        return "2017"
+
+    def file(self, q=False, sn=False):
+        return ""
+
+
+class FakeMaya(object):
+
+    def __init__(self):
+        self.cmds = FakeCmds()
+
+
+class TestCapture(unittest.TestCase):
+
+    MODULES = [
+        mutils.capture,
+        mutils.attribute,
+        mutils.decorators,
+        mutils.transferobject,
+    ]
+
+    def setUp(self):
+        """
+        """
+        self.path = mutils.createTempPath("test_capture") + "/pose.json"
+
+        self._maya = [getattr(module, "maya", None) for module in self.MODULES]
+        self._openMaya = mutils.capture.OpenMaya
+
+        self.maya = FakeMaya()
+        for module in self.MODULES:
+            module.maya = self.maya
+
+        mutils.capture.OpenMaya = None
+
+    def tearDown(self):
+        """
+        """
+        for module, maya in zip(self.MODULES, self._maya):
+            if maya is None:
+                del module.maya
+            else:
+                module.maya = maya
+
+        mutils.capture.OpenMaya = self._openMaya
+
+    def test_capture_attrs(self):
+        """
+        Test capturing the attribute values for many objects.
+        """
+        result = mutils.captureAttrs(["sphere", "cube"])
+
+        self.assertEqual(["cube", "sphere"], sorted(result.keys()))
+        self.assertIn(("translateX", "doubleLinear", 1.5), result["sphere"])
+        self.assertIn(("message", "message", None), result["sphere"])
+        self.assertIn(("rotateOrder", "enum", 2), result["cube"])
+
+    def test_pose_from_objects(self):
+        """
+        Test the pose data created from the captured values.
+        """
+        pose = mutils.Pose.fromObjects(["sphere", "cube"])
+
+        expected = {
+            "translateX": {"type": "doubleLinear", "value": 1.5},
+            "rotateX": {"type": "doubleAngle", "value": 90.0},
+            "visibility": {"type": "bool", "value": True},
+        }
+
+        self.assertEqual(expected, pose.attrs("sphere"))
+        self.assertEqual({"rotateOrder": {"type": "enum", "value": 2}}, pose.attrs("cube"))
+
+    def test_save_background(self):
+        """
+        Test writing the pose file in a worker thread.
+        """
+        pose = mutils.Pose.fromObjects(["sphere", "cube"])
+
+        thread = pose.save(self.path, background=True)
+        pose.objects().clear()
+        thread.join()
+
+        data = mutils.TransferObject.readJson(self.path)
+        self.assertEqual(["cube", "sphere"], sorted(data["objects"].keys()))
+        self.assertEqual("2017", data["metadata"]["mayaVersion"])
+
+        self.assertIsNone(pose.save(self.path))
+
+        # The error of the worker is raised when the thread is joined
+        dirname = mutils.createTempPath("test_capture") + "/folder.json"
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+
+        thread = pose.save(dirname, background=True)
+        self.assertRaises(EnvironmentError, thread.join)
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestCapture, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,172 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+import mutils.tests.test_mirrorlocator
+reload(mutils.tests.test_mirrorlocator)
+mutils.tests.test_mirrorlocator.run()
+"""
+import os
+import time
+import shutil
+import unittest
+
+import mutils
+import mutils.mirrorlocator
+
+
+class FakeMirrorTable(object):
+
+    loaded = []
+
+    @classmethod
+    def fromPath(cls, path):
+        cls.loaded.append(path)
+        return cls()
+
+
+class FakeMutils(object):
+
+    MirrorTable = FakeMirrorTable
+
+
+class TestMirrorLocator(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.root = mutils.createTempPath("test_mirrorlocator")
+
+        if os.path.exists(self.root):
+            shutil.rmtree(self.root)
+
+        os.makedirs(self.root + "/characters/hero/poses/wave.pose")
+        os.makedirs(self.root + "/characters/hero/poses/run.pose")
+        os.makedirs(self.root + "/characters/hero/hero.mirror")
+        os.makedirs(self.root + "/characters/all.mirror")
+
+        self.listed = []
+        self.listdir = os.listdir
+
+        def listdir(path):
+            self.listed.append(path)
+            return self.listdir(path)
+
+        mutils.mirrorlocator.os.listdir = listdir
+        mutils.mirrorlocator.clearMirrorTableCache()
+
+        self._mutils = mutils.mirrorlocator.mutils
+        mutils.mirrorlocator.mutils = FakeMutils()
+        FakeMirrorTable.loaded = []
+
+    def tearDown(self):
+        """
+        """
+        os.listdir = self.listdir
+        mutils.mirrorlocator.mutils = self._mutils
+        mutils.mirrorlocator.clearMirrorTableCache()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_find(self):
+        """
+        Test the nearest mirror table is returned first.
+        """
+        paths = mutils.findMirrorTables(self.root + "/characters/hero/poses/wave.pose")
+
+        expected = [
+            self.root + "/characters/hero/hero.mirror",
+            self.root + "/characters/all.mirror",
+        ]
+
+        self.assertEqual(expected, paths[:2])
+
+    def test_shared_per_folder(self):
+        """
+        Test the parent folders are only listed once for all items in a folder.
+        """
+        mutils.findMirrorTables(self.root + "/characters/hero/poses/wave.pose")
+
+        self.listed = []
+        paths = mutils.findMirrorTables(self.root + "/characters/hero/poses/run.pose")
+
+        self.assertEqual([self.root + "/characters/hero/poses/run.pose"], self.listed)
+        self.assertEqual(2, len([p for p in paths if p.startswith(self.root)]))
+
+    def test_folder_changed(self):
+        """
+        Test only the changed folder is listed again.
+        """
+        path = self.root + "/characters/hero/poses/wave.pose"
+        mutils.findMirrorTables(path)
+
+        os.rmdir(self.root + "/characters/hero/hero.mirror")
+
+        # Make sure the modified time changes on coarse file systems
+        mtime = time.time() + 10
+        os.utime(self.root + "/characters/hero", (mtime, mtime))
+
+        self.listed = []
+        paths = mutils.findMirrorTables(path)
+
+        self.assertEqual([self.root + "/characters/hero"], self.listed)
+        self.assertEqual(self.root + "/characters/all.mirror", paths[0])
+
+    def test_item_folder(self):
+        """
+        Test the item folder is searched first, like studiolibrary.walkup.
+        """
+        path = self.root + "/characters/hero/poses/wave.pose"
+        os.makedirs(path + "/wave.mirror")
+
+        paths = mutils.findMirrorTables(path + "/")
+
+        self.assertEqual(path + "/wave.mirror", paths[0])
+
+    def test_load(self):
+        """
+        Test the mirror table is only read again when the file changes.
+        """
+        path = self.root + "/characters/all.mirror/mirrortable.json"
+
+        with open(path, "w") as f:
+            f.write("{}")
+
+        mirrorTable = mutils.loadMirrorTable(path)
+        self.assertTrue(mirrorTable is mutils.loadMirrorTable(path))
+        self.assertEqual(1, len(FakeMirrorTable.loaded))
+
+        mtime = time.time() + 10
+        os.utime(path, (mtime, mtime))
+
+        self.assertFalse(mirrorTable is mutils.loadMirrorTable(path))
+        self.assertEqual(2, len(FakeMirrorTable.loaded))
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestMirrorLocator, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -156,6 +156,78 @@ class TestMirrorTable(unittest.TestCase):
         # result = MirrorTable._mirrorObject("Group|Ch1:RIG:RExtra|Ch1:RIG:RRoll", "R*", "L*")
         # assert "Group|Ch1:RIG:LExtra|Ch1:RIG:LRoll" == result, msg
 
+    def test_mirror_mask(self):
+
+        msg = "Incorrect mirror mask for attributes"
+
+        attrs = [
+            "translateX", "translateY", "translateZ",
+            "rotateX", "rotateY", "rotateZ",
+            "scaleX", "visibility",
+        ]
+
+        result = MirrorTable.mirrorMask(attrs, [-1, 1, 1])
+        assert [-1, 1, 1, 1, -1, -1, 1, 1] == result, msg
+
+        result = MirrorTable.mirrorMask(attrs, [1, -1, 1])
+        assert [1, -1, 1, -1, 1, -1, 1, 1] == result, msg
+
+        result = MirrorTable.mirrorMask(attrs, [1, 1, -1])
+        assert [1, 1, -1, -1, -1, 1, 1, 1] == result, msg
+
+        result = MirrorTable.mirrorMask(attrs, [-1, -1, -1])
+        assert [-1, -1, -1, 1, 1, 1, 1, 1] == result, msg
+
+        result = MirrorTable.mirrorMask(attrs, [1, 1, 1])
+        assert [1] * len(attrs) == result, msg
+
+        result = MirrorTable.mirrorMask(attrs, None)
+        assert [1] * len(attrs) == result, msg
+
+        # The mask must match mirroring one attribute at a time
+        for mirrorAxis in [[-1, 1, 1], [1, -1, 1], [1, 1, -1], [-1, -1, -1]]:
+            values = range(1, len(attrs) + 1)
+            mask = MirrorTable.mirrorMask(attrs, mirrorAxis)
+
+            expected = [
+                MirrorTable.formatValue(attr, value, mirrorAxis)
+                for attr, value in zip(attrs, values)
+            ]
+
+            assert expected == MirrorTable.mirrorValues(values, mask), msg
+
+    def test_mirror_names(self):
+
+        msg = "Incorrect mirror name from the mirror name map"
+
+        mirrorTable = MirrorTable()
+        mirrorTable.setData({
+            "metadata": {"left": "*_L", "right": "*_R"},
+            "objects": {
+                "arm_L": {"mirrorObject": "arm_R"},
+                "arm_R": {"mirrorObject": "arm_L"},
+                "hips": {"mirrorObject": None},
+                "leg_L": {},
+            },
+        })
+
+        assert "arm_R" == mirrorTable.mirrorObject("arm_L"), msg
+        assert mirrorTable.mirrorObject("hips") is None, msg
+
+        # Names that are not saved are mirrored once and then remembered
+        assert "leg_R" == mirrorTable.mirrorObject("leg_L"), msg
+        assert "ns:leg_L" == mirrorTable.mirrorObject("ns:leg_R"), msg
+        assert "ns:leg_R" in mirrorTable.mirrorNames(), msg
+
+        # The saved names are used instead of the naming convention
+        mirrorTable.objects()["arm_L"]["mirrorObject"] = "other_R"
+        mirrorTable.setData(mirrorTable.data())
+        assert "other_R" == mirrorTable.mirrorObject("arm_L"), msg
+
+        # Changing the sides clears the map
+        mirrorTable.setMetadata("left", "*_l")
+        assert "ns:leg_R" not in mirrorTable.mirrorNames(), msg
+
 
 def testSuite():
     """
@@ -0,0 +1,146 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+These tests do not need a Maya scene. The ls command is replaced with a
+stand-in that lists the names from a fixed scene.
+
+# Example:
+import mutils.tests.test_node
+reload(mutils.tests.test_node)
+mutils.tests.test_node.run()
+"""
+import fnmatch
+import unittest
+
+import mutils
+import mutils.node
+
+
+SCENE = [
+    "character:hand_L",
+    "group1|character:hips",
+    "group2|character:hips",
+    "prop:hand_L",
+]
+
+
+class FakeCmds(object):
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.calls = []
+
+    def ls(self, names=None):
+        self.calls.append(names)
+
+        if isinstance(names, basestring):
+            names = [names]
+
+        result = []
+        for name in self.scene:
+            shortname = name.split("|")[-1]
+            if any(fnmatch.fnmatch(shortname, n) for n in names):
+                result.append(name)
+
+        return result
+
+
+class FakeMaya(object):
+
+    def __init__(self, scene):
+        self.cmds = FakeCmds(scene)
+
+
+class TestNode(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self._maya = getattr(mutils.node, "maya", None)
+        self.maya = FakeMaya(SCENE)
+        mutils.node.maya = self.maya
+
+    def tearDown(self):
+        """
+        """
+        mutils.node.maya = self._maya
+
+    def test_short_name_resolver(self):
+        """
+        Test the resolver gives the same result as Node.toShortName.
+        """
+        names = [
+            "|group|character:hand_L",
+            "character:hips",
+            "character:foot_L",
+            "prop:hand_L",
+        ]
+
+        resolver = mutils.ShortNameResolver(names)
+
+        # Only one scene query for all the names
+        self.assertEqual(1, len(self.maya.cmds.calls))
+
+        for name in names:
+            try:
+                expected = mutils.Node(name).toShortName().name()
+            except mutils.MayaUtilsError as error:
+                expected = type(error)
+
+            try:
+                result = mutils.Node(name).toShortName(resolver).name()
+            except mutils.MayaUtilsError as error:
+                result = type(error)
+
+            self.assertEqual(expected, result)
+
+        self.assertEqual(1 + len(names), len(self.maya.cmds.calls))
+
+    def test_short_name_errors(self):
+        """
+        Test the errors for missing and duplicate short names.
+        """
+        resolver = mutils.ShortNameResolver(["character:hips", "missing"])
+
+        node = mutils.Node("character:hand_L")
+        self.assertEqual("character:hand_L", node.toShortName(resolver).name())
+
+        with self.assertRaises(mutils.MoreThanOneObjectFoundError):
+            mutils.Node("character:hips").toShortName(resolver)
+
+        with self.assertRaises(mutils.NoObjectFoundError):
+            mutils.Node("missing").toShortName(resolver)
+
+        # Wild cards are passed to the scene query
+        with self.assertRaises(mutils.MoreThanOneObjectFoundError):
+            mutils.Node("*:hand_L").toShortName(resolver)
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestNode, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,155 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+These tests do not need a Maya scene. The Maya commands are replaced
+with a stand-in that counts the scene queries.
+
+# Example:
+import mutils.tests.test_querycache
+reload(mutils.tests.test_querycache)
+mutils.tests.test_querycache.run()
+"""
+import unittest
+
+import mutils
+import mutils.attribute
+
+
+class FakeCmds(object):
+
+    def __init__(self):
+        self.calls = []
+        self.connections = {"sphere.translateX": ["sphere_translateX.output"]}
+
+    def objExists(self, name):
+        self.calls.append("objExists")
+        return True
+
+    def getAttr(self, name, lock=False, type=False):
+        self.calls.append("getAttr")
+
+        if type:
+            return u"doubleLinear"
+        elif lock:
+            return False
+
+        return 0.0
+
+    def setAttr(self, name, *args, **kwargs):
+        pass
+
+    def listConnections(self, name, **kwargs):
+        self.calls.append("listConnections")
+        return self.connections.get(name)
+
+    def nodeType(self, nodes):
+        self.calls.append("nodeType")
+        return "animCurveTL"
+
+    def cutKey(self, name, **kwargs):
+        self.connections.pop(name, None)
+
+    def scriptJob(self, *args, **kwargs):
+        return None
+
+
+class FakeMaya(object):
+
+    def __init__(self):
+        self.cmds = FakeCmds()
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self._maya = getattr(mutils.attribute, "maya", None)
+        self.maya = FakeMaya()
+        mutils.attribute.maya = self.maya
+
+    def tearDown(self):
+        """
+        """
+        mutils.attribute.maya = self._maya
+
+    def queryAll(self):
+        """
+        Query the attribute the same way as loading a pose.
+        """
+        attr = mutils.Attribute("sphere", "translateX")
+        attr.exists()
+        attr.isLocked()
+        attr.isConnected()
+        return attr.animCurve()
+
+    def test_without_cache(self):
+        """
+        Test the queries are not memoised outside of a scope.
+        """
+        self.queryAll()
+        count = len(self.maya.cmds.calls)
+
+        self.queryAll()
+        self.assertEqual(count * 2, len(self.maya.cmds.calls))
+
+    def test_cache(self):
+        """
+        Test the queries are memoised and cleared after the scope.
+        """
+        with mutils.QueryCache() as cache:
+            self.assertEqual("sphere_translateX", self.queryAll())
+            count = len(self.maya.cmds.calls)
+
+            self.assertEqual("sphere_translateX", self.queryAll())
+            self.assertEqual(count, len(self.maya.cmds.calls))
+            self.assertTrue(cache.hits() > 0)
+
+            # Nested scopes use the same cache
+            with mutils.QueryCache() as nested:
+                self.assertIs(cache, nested)
+
+            self.assertIs(cache, mutils.QueryCache.active())
+
+        self.assertIsNone(mutils.QueryCache.active())
+
+    def test_invalidate(self):
+        """
+        Test cutting keys clears the queries for the attribute.
+        """
+        with mutils.QueryCache():
+            attr = mutils.Attribute("sphere", "translateX")
+            self.assertEqual("sphere_translateX", attr.animCurve())
+
+            attr.setStaticKeyframe(1.0, (1, 10), "replaceCompletely")
+            self.assertIsNone(attr.animCurve())
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestQueryCache, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,205 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+import mutils.tests.test_transfercache
+reload(mutils.tests.test_transfercache)
+mutils.tests.test_transfercache.run()
+"""
+import os
+import time
+import shutil
+import unittest
+
+import mutils
+
+
+class FakeTransferObject(object):
+
+    paths = []
+
+    @classmethod
+    def fromPath(cls, path):
+        cls.paths.append(path)
+        time.sleep(0.01)
+        t = cls()
+        t.setPath(path)
+        t.setData({"metadata": {}, "objects": {"obj1": {"attrs": {}}}})
+        return t
+
+    def __init__(self):
+        self._path = None
+        self._data = None
+
+    def path(self):
+        return self._path
+
+    def setPath(self, path):
+        self._path = path
+
+    def data(self):
+        return self._data
+
+    def setData(self, data):
+        self._data = data
+
+
+class TestTransferCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.dirname = mutils.createTempPath("test_transfercache")
+
+        if os.path.exists(self.dirname):
+            shutil.rmtree(self.dirname)
+
+        os.makedirs(self.dirname)
+
+        self.paths = []
+        for i in range(5):
+            path = self.dirname + "/pose{0}.json".format(i)
+            with open(path, "w") as f:
+                f.write("x" * 100)
+            self.paths.append(path)
+
+        FakeTransferObject.paths = []
+        self.cache = mutils.TransferCache()
+
+    def tearDown(self):
+        """
+        """
+        shutil.rmtree(self.dirname, ignore_errors=True)
+
+    def test_get(self):
+        """
+        Test the file is only read again when it has changed.
+        """
+        path = self.paths[0]
+
+        self.cache.get(FakeTransferObject, path)
+        self.cache.get(FakeTransferObject, path)
+        self.assertEqual((1, 1), self.cache.stats())
+        self.assertEqual(1, len(FakeTransferObject.paths))
+
+        with open(path, "w") as f:
+            f.write("y" * 50)
+
+        self.cache.get(FakeTransferObject, path)
+        self.assertEqual(2, len(FakeTransferObject.paths))
+        self.assertEqual(50, self.cache.size())
+
+    def test_not_shared(self):
+        """
+        Test each get returns a new object that can be changed.
+        """
+        path = self.paths[0]
+
+        t1 = self.cache.get(FakeTransferObject, path)
+        t2 = self.cache.get(FakeTransferObject, path)
+
+        self.assertFalse(t1 is t2)
+        self.assertEqual(path, t2.path())
+
+        t1.data()["objects"]["obj1"]["mirrorAxis"] = [-1, 1, 1]
+        t1.data()["metadata"]["user"] = "test"
+
+        self.assertEqual({"attrs": {}}, t2.data()["objects"]["obj1"])
+        self.assertEqual({}, t2.data()["metadata"])
+
+    def test_resolve_path(self):
+        """
+        Test binary and legacy items are read through the json path.
+        """
+        data = {
+            "metadata": {},
+            "objects": {"obj1": {"attrs": {"tx": {"type": "doubleLinear", "value": 1.0}}}},
+        }
+
+        dirname = self.dirname + "/binary.pose"
+        os.makedirs(dirname)
+        mutils.writeBinary(dirname + "/pose.bin", data)
+
+        dirname = self.dirname + "/legacy_dict.pose"
+        os.makedirs(dirname)
+        with open(dirname + "/pose.dict", "w") as f:
+            f.write(str({"obj1": {"tx": ("doubleLinear", 1.0)}}))
+
+        dirname = self.dirname + "/legacy_list.pose"
+        os.makedirs(dirname)
+        with open(dirname + "/pose.list", "w") as f:
+            f.write(str(["obj1"]))
+
+        for name, ext in [("binary", ".bin"), ("legacy_dict", ".dict"), ("legacy_list", ".list")]:
+            path = self.dirname + "/" + name + ".pose/pose.json"
+
+            t = self.cache.get(mutils.TransferObject, path)
+
+            self.assertEqual(path.replace(".json", ext), t.path())
+            self.assertEqual(["obj1"], list(t.objects().keys()))
+            self.assertTrue(self.cache.contains(mutils.TransferObject, path))
+
+        t = self.cache.get(mutils.TransferObject, self.dirname + "/binary.pose/pose.json")
+        self.assertEqual(data["objects"], t.objects())
+
+    def test_evict(self):
+        """
+        Test the least recently used objects are removed over budget.
+        """
+        self.cache.setMaxSize(300)
+
+        for path in self.paths[:3]:
+            self.cache.get(FakeTransferObject, path)
+
+        # Use the first so that the second is the least recently used
+        self.cache.get(FakeTransferObject, self.paths[0])
+        self.cache.get(FakeTransferObject, self.paths[3])
+
+        self.assertEqual(300, self.cache.size())
+        self.assertTrue(self.cache.contains(FakeTransferObject, self.paths[0]))
+        self.assertFalse(self.cache.contains(FakeTransferObject, self.paths[1]))
+
+    def test_prefetch(self):
+        """
+        Test prefetched objects are read once and counted as hits.
+        """
+        self.cache.prefetch(FakeTransferObject, self.paths)
+
+        for path in self.paths:
+            t = self.cache.get(FakeTransferObject, path)
+            self.assertEqual(path, t.path())
+
+        self.assertEqual(sorted(self.paths), sorted(FakeTransferObject.paths))
+
+        hits, misses = self.cache.stats()
+        self.assertEqual(5, hits + misses)
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestTransferCache, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,241 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+import mutils.tests.test_transferobject
+reload(mutils.tests.test_transferobject)
+mutils.tests.test_transferobject.run()
+"""
+import os
+import json
+import unittest
+
+import mutils
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(mutils.__file__), "tests", "data")
+
+
+class TestTransferObject(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.srcPath = os.path.join(TEST_DATA_DIR, "pose.json")
+        self.dstPath = mutils.createTempPath("test_transferobject") + "/pose.json"
+
+        with open(self.srcPath, "r") as f:
+            self.expected = json.load(f)
+
+    def test_read_json(self):
+        """
+        Test the streamed reader returns the same data as the json module.
+        """
+        data = mutils.TransferObject.readJson(self.srcPath)
+        self.assertEqual(self.expected, data)
+
+    def test_read_metadata(self):
+        """
+        Test reading only the metadata block.
+        """
+        metadata = mutils.TransferObject.readMetadata(self.srcPath)
+        self.assertEqual(self.expected["metadata"], metadata)
+
+    def test_read_filtered(self):
+        """
+        Test filtering the objects by name and namespace while parsing.
+        """
+        objects = ["srcSphere:sphere"]
+
+        data = mutils.TransferObject.readJson(self.srcPath, objects=objects)
+        self.assertEqual(objects, list(data["objects"].keys()))
+
+        data = mutils.TransferObject.readJson(self.srcPath, namespaces=["srcSphere"])
+        self.assertEqual(self.expected["objects"], data["objects"])
+
+        data = mutils.TransferObject.readJson(self.srcPath, namespaces=["dstSphere"])
+        self.assertEqual({}, data["objects"])
+
+    def test_iter_objects(self):
+        """
+        Test iterating the objects without reading the whole file.
+        """
+        names = [name for name, data in mutils.TransferObject.iterObjects(self.srcPath)]
+        self.assertEqual(sorted(self.expected["objects"].keys()), sorted(names))
+
+    def test_small_chunks(self):
+        """
+        Test values that are split across the reader's buffer boundaries.
+        """
+        with mutils.JsonStreamReader(self.srcPath, chunkSize=3) as reader:
+            data = {"objects": {}}
+            for key, name, value in reader.items(expand=["objects"]):
+                if name is None:
+                    data[key] = value
+                else:
+                    data[key][name] = value
+
+        self.assertEqual(self.expected, data)
+
+    def test_chunked_values(self):
+        """
+        Test strings, escapes and nested values that span many chunks.
+        """
+        expected = {
+            "metadata": {"text": 'a "quoted" [value] {with} \\ slashes', "n": 12345},
+            "objects": {"a": [[1, 2.5, None], {"b]": "}"}, True, -1e-10]},
+        }
+
+        with open(self.dstPath, "w") as f:
+            json.dump(expected, f)
+
+        for chunkSize in [1, 2, 5, 1024]:
+            with mutils.JsonStreamReader(self.dstPath, chunkSize=chunkSize) as reader:
+                data = dict((key, value) for key, name, value in reader.items())
+
+            self.assertEqual(expected, data)
+
+        # A truncated file raises an error instead of reading forever
+        with open(self.dstPath, "w") as f:
+            f.write('{"metadata": {"text": "abc')
+
+        with mutils.JsonStreamReader(self.dstPath, chunkSize=4) as reader:
+            self.assertRaises(mutils.jsonstream.JsonStreamError, reader.read, "metadata")
+
+    def test_write_stream(self):
+        """
+        Test the streamed writer produces valid json that can be read back.
+        """
+        for indent in [2, None]:
+            with mutils.JsonStreamWriter(self.dstPath, indent=indent) as writer:
+                writer.writeItem("metadata", self.expected["metadata"])
+
+                writer.beginObject("objects")
+                for name, data in self.expected["objects"].items():
+                    writer.writeItem(name, data)
+                writer.endObject()
+
+            with open(self.dstPath, "r") as f:
+                self.assertEqual(self.expected, json.load(f))
+
+            data = mutils.TransferObject.readJson(self.dstPath)
+            self.assertEqual(self.expected, data)
+
+    def test_binary(self):
+        """
+        Test writing and reading the binary format.
+        """
+        path = self.dstPath.replace(".json", mutils.BINARY_EXTENSION)
+
+        mutils.writeBinary(path, self.expected)
+
+        self.assertEqual(self.expected, mutils.readBinary(path))
+        self.assertEqual(self.expected["metadata"], mutils.readBinaryMetadata(path))
+        self.assertEqual(self.expected["metadata"], mutils.TransferObject.readMetadata(path))
+
+        data = mutils.readBinary(path, objects=["srcSphere:sphere"])
+        self.assertEqual(["srcSphere:sphere"], list(data["objects"].keys()))
+
+        data = mutils.readBinary(path, namespaces=["dstSphere"])
+        self.assertEqual({}, data["objects"])
+
+    def test_binary_values(self):
+        """
+        Test the value types supported by the binary format.
+        """
+        path = self.dstPath.replace(".json", mutils.BINARY_EXTENSION)
+
+        expected = {
+            "metadata": {"mirrorPlane": [-1, 1, 1]},
+            "objects": {
+                "offset": {"mirrorAxis": [-1, 1, 1]},
+                "ns:sphere": {
+                    "attrs": {
+                        "visibility": {"type": "bool", "value": True},
+                        "rotateOrder": {"type": "enum", "value": 3},
+                        "translateX": {"type": "doubleLinear", "value": 1.5},
+                        "label": {"type": "string", "value": u"left \u00e9"},
+                        "matrix": {"type": "matrix", "value": [1.0, 0.0, 0.5]},
+                        "nested": {"type": "list", "value": [[1, 2], "a"]},
+                        "rotateX": {"curve": "CURVE1", "type": "doubleAngle", "value": -90.0},
+                        "empty": {"type": "float", "value": None},
+                        "missing": {"type": "float"},
+                        "large": {"type": "long", "value": 2 ** 53 + 1},
+                        "negative": {"type": "long", "value": -2 ** 62 - 3},
+                        "huge": {"type": "long", "value": 2 ** 70},
+                        "extra": {"type": "float", "value": 1.0, "other": 2},
+                    }
+                }
+            }
+        }
+
+        mutils.writeBinary(path, expected)
+        self.assertEqual(expected, mutils.readBinary(path))
+
+    def test_convert(self):
+        """
+        Test converting between the json and binary formats.
+        """
+        binaryPath = self.dstPath.replace(".json", mutils.BINARY_EXTENSION)
+
+        mutils.binaryfile.convertToBinary(self.srcPath, binaryPath)
+        mutils.binaryfile.convertToJson(binaryPath, self.dstPath)
+
+        with open(self.dstPath, "r") as f:
+            self.assertEqual(self.expected, json.load(f))
+
+        t = mutils.TransferObject.fromPath(binaryPath)
+        self.assertEqual(self.expected, t.data())
+
+    def test_profiles(self):
+        """
+        Test the files written with each profile can be read by json.
+        """
+        for profile in mutils.jsonstream.PROFILES:
+            mutils.TransferObject.write(self.dstPath, self.expected, profile=profile)
+
+            with open(self.dstPath, "r") as f:
+                text = f.read()
+
+            self.assertEqual(self.expected, json.loads(text))
+            self.assertEqual(self.expected, mutils.TransferObject.readJson(self.dstPath))
+
+            if profile == "compact":
+                self.assertNotIn("\n", text)
+                self.assertNotIn(": ", text)
+
+        # The encoder must match the json module for the stored values
+        value = {"path": "a/b", "value": 0.1 + 0.2, "name": u"\u00e9"}
+        text = mutils.jsonstream.encode(value, "compact")
+        self.assertEqual(value, json.loads(text))
+        self.assertNotIn("\\/", text)
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestTransferObject, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,338 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+A process wide cache of the parsed transfer data.
+
+The items are created again every time the library is refreshed, so a
+transfer object kept on the item is read again after each refresh. The
+cache keeps the parsed data by path and only reads a file again when
+its modified time or size has changed.
+
+Each get returns a new transfer object for the cached data, so the state
+of a loaded object, such as the attribute cache and the mirror table of
+a pose, is never shared between items.
+
+The size of the parsed files is used as the cost of each entry. The
+least recently used entries are removed when the total is over budget.
+
+Files can be read ahead in a worker thread with prefetch. A get for a
+path that the worker is reading waits for it instead of reading the
+file a second time.
+
+Example:
+    import mutils
+
+    cache = mutils.transferCache()
+    cache.prefetch(mutils.Pose, ["/library/run.pose/pose.json"])
+
+    pose = cache.get(mutils.Pose, "/library/wave.pose/pose.json")
+"""
+import os
+import Queue
+import logging
+import threading
+import collections
+
+import mutils
+
+
+__all__ = [
+    "TransferCache",
+    "transferCache",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+# The maximum total size in bytes of the cached files
+MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+# The extensions of the files that are parsed in a folder item
+PARSED_EXTENSIONS = (".json", ".dict", ".list", ".bin")
+
+
+_transferCache = None
+
+
+def transferCache():
+    """
+    Return the transfer cache for this process.
+
+    :rtype: TransferCache
+    """
+    global _transferCache
+
+    if _transferCache is None:
+        _transferCache = TransferCache()
+
+    return _transferCache
+
+
+def fileKey(path):
+    """
+    Return the modified time and the size of the given path.
+
+    The path is resolved to the binary or legacy file that is read when
+    the json file does not exist. For a folder item the files that are
+    parsed are used, since they can be replaced without changing the
+    modified time of the folder.
+
+    :type path: str
+    :rtype: (float, int)
+    """
+    path = mutils.resolveTransferPath(path)
+    stat = os.stat(path)
+    mtime = stat.st_mtime
+    size = stat.st_size
+
+    if os.path.isdir(path):
+        size = 0
+        for name in os.listdir(path):
+            if name.endswith(PARSED_EXTENSIONS):
+                stat = os.stat(os.path.join(path, name))
+                mtime = max(mtime, stat.st_mtime)
+                size += stat.st_size
+
+    return mtime, size
+
+
+def copyData(data):
+    """
+    Return a copy of the given transfer data that can be changed.
+
+    Only the dictionaries that the transfer objects change in place are
+    copied, the attribute values are shared.
+
+    :type data: dict
+    :rtype: dict
+    """
+    data = dict(data)
+    data["metadata"] = dict(data.get("metadata", {}))
+
+    objects = data.get("objects") or {}
+    data["objects"] = dict((name, dict(value)) for name, value in objects.items())
+
+    return data
+
+
+def createObject(cls, path, data):
+    """
+    Return a new transfer object of the given class for the cached data.
+
+    :type cls: type
+    :type path: str
+    :type data: dict
+    :rtype: mutils.TransferObject
+    """
+    transferObject = cls()
+    transferObject.setPath(path)
+    transferObject.setData(copyData(data))
+    return transferObject
+
+
+class TransferCache(object):
+
+    def __init__(self, maxSize=MAX_CACHE_SIZE):
+        """
+        :type maxSize: int
+        """
+        self._maxSize = maxSize
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+        # {(cls, path): (key, size, data)}
+        self._objects = collections.OrderedDict()
+        self._loading = {}
+
+        self._lock = threading.Lock()
+        self._queue = Queue.Queue()
+        self._worker = None
+
+    def size(self):
+        """
+        Return the total size of the cached files in bytes.
+
+        :rtype: int
+        """
+        return self._size
+
+    def maxSize(self):
+        """
+        :rtype: int
+        """
+        return self._maxSize
+
+    def setMaxSize(self, maxSize):
+        """
+        :type maxSize: int
+        :rtype: None
+        """
+        with self._lock:
+            self._maxSize = maxSize
+            self._evict()
+
+    def stats(self):
+        """
+        Return the number of hits and misses since the cache was cleared.
+
+        :rtype: (int, int)
+        """
+        return self._hits, self._misses
+
+    def clear(self):
+        """
+        :rtype: None
+        """
+        with self._lock:
+            self._objects.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+
+    def contains(self, cls, path):
+        """
+        Return True if up to date data for the path is cached.
+
+        :type cls: type
+        :type path: str
+        :rtype: bool
+        """
+        try:
+            key = fileKey(path)
+        except OSError:
+            return False
+
+        with self._lock:
+            cached = self._objects.get((cls, path))
+
+        return cached is not None and cached[0] == key
+
+    def get(self, cls, path):
+        """
+        Return a new transfer object of the given class for the given path.
+
+        :type cls: type
+        :type path: str
+        :rtype: mutils.TransferObject
+        """
+        data = self.data(cls, path, count=True)
+        return createObject(cls, path, data)
+
+    def data(self, cls, path, count=False):
+        """
+        Return the cached data for the given path and read it if needed.
+
+        The returned data is shared and must not be changed.
+
+        :type cls: type
+        :type path: str
+        :type count: bool
+        :rtype: dict
+        """
+        while True:
+            key = fileKey(path)
+
+            with self._lock:
+                cached = self._objects.pop((cls, path), None)
+
+                if cached is not None:
+                    if cached[0] == key:
+                        self._objects[(cls, path)] = cached
+                        if count:
+                            self._hits += 1
+                        return cached[2]
+
+                    self._size -= cached[1]
+
+                event = self._loading.get((cls, path))
+
+                if event is None:
+                    event = threading.Event()
+                    self._loading[(cls, path)] = event
+                    if count:
+                        self._misses += 1
+                    break
+
+            # Another thread is reading the same path
+            event.wait()
+
+        try:
+            logger.debug("Reading transfer object %s", path)
+            data = cls.fromPath(path).data()
+            size = key[1]
+
+            with self._lock:
+                self._objects[(cls, path)] = (key, size, data)
+                self._size += size
+                self._evict()
+        finally:
+            with self._lock:
+                del self._loading[(cls, path)]
+            event.set()
+
+        return data
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until within budget.
+
+        Must be called with the lock held. The newest entry is always
+        kept, even when it is larger than the budget.
+
+        :rtype: None
+        """
+        while self._size > self._maxSize and len(self._objects) > 1:
+            key, cached = self._objects.popitem(last=False)
+            self._size -= cached[1]
+
+    def prefetch(self, cls, paths):
+        """
+        Read the given paths in a worker thread.
+
+        The paths of a previous prefetch that have not been read yet are
+        replaced by the given paths.
+
+        :type cls: type
+        :type paths: list[str]
+        :rtype: None
+        """
+        try:
+            while True:
+                self._queue.get_nowait()
+        except Queue.Empty:
+            pass
+
+        for path in paths:
+            self._queue.put((cls, path))
+
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._prefetchWorker)
+            self._worker.daemon = True
+            self._worker.start()
+
+    def _prefetchWorker(self):
+        """
+        The starting point for the prefetch thread.
+
+        :rtype: None
+        """
+        while True:
+            cls, path = self._queue.get()
+
+            try:
+                if not self.contains(cls, path):
+                    self.data(cls, path)
+            except Exception as error:
+                logger.debug("Cannot prefetch %s: %s", path, error)
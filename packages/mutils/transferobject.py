@@ -25,13 +25,25 @@ Example:
     
     t.save("/tmp/pose.json")
     t.read("/tmp/pose.json")
+
+    # Only read the objects in the given namespace
+    t.read("/tmp/pose.json", namespaces=["character1"])
+
+    # Read the metadata without parsing any objects
+    metadata = mutils.TransferObject.readMetadata("/tmp/pose.json")
+
+    # Save and read the compact binary format
+    t.save("/tmp/pose.bin")
+    t = mutils.TransferObject.fromPath("/tmp/pose.bin")
 """
 import os
 import abc
+import copy
 import json
 import time
 import getpass
 import logging
+import threading
 
 
 import mutils
@@ -46,6 +58,83 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 
+# Transfer files are read by the tools far more often than by people
+JSON_PROFILE = "compact"
+
+
+def resolveTransferPath(path):
+    """
+    Return the file that is read for the given json transfer path.
+
+    When the json file does not exist the binary file or the legacy
+    dict or list file is used instead.
+
+    :type path: str
+    :rtype: str
+    """
+    if os.path.exists(path):
+        return path
+
+    for ext in (mutils.BINARY_EXTENSION, ".dict", ".list"):
+        altPath = path.replace(".json", ext)
+        if os.path.exists(altPath):
+            return altPath
+
+    return path
+
+
+class WriteThread(threading.Thread):
+
+    """Write a transfer file in the background and raise its error on join."""
+
+    def __init__(self, write, path, data):
+        """
+        :type write: func
+        :type path: str
+        :type data: dict
+        """
+        threading.Thread.__init__(self)
+
+        self.daemon = True
+
+        self._write = write
+        self._path = path
+        self._data = data
+        self._error = None
+
+    def error(self):
+        """
+        Return the exception raised while writing the file, if any.
+
+        :rtype: Exception or None
+        """
+        return self._error
+
+    def run(self):
+        """
+        The starting point for the thread.
+
+        :rtype: None
+        """
+        try:
+            self._write(self._path, self._data)
+        except Exception as error:
+            logger.exception("Cannot save pose: %s", self._path)
+            self._error = error
+
+    def join(self, timeout=None):
+        """
+        Wait for the file to be written and raise any error.
+
+        :type timeout: float or None
+        :rtype: None
+        """
+        threading.Thread.join(self, timeout)
+
+        if self._error is not None and not self.is_alive():
+            raise self._error
+
+
 class TransferObject(object):
 
     @classmethod
@@ -70,25 +159,111 @@ class TransferObject(object):
         :rtype: TransferObject
         """
         t = cls(**kwargs)
-        for obj in objects:
-            t.add(obj)
+        t.add(objects)
         return t
 
     @staticmethod
-    def readJson(path):
+    def readJson(path, objects=None, namespaces=None):
         """
-        Read the given json path
+        Read the given json path.
+
+        The file is parsed incrementally so that objects which do not
+        match the given objects or namespaces are never kept in memory.
 
         :type path: str
+        :type objects: list[str] or None
+        :type namespaces: list[str] or None
         :rtype: dict
         """
-        with open(path, "r") as f:
-            data = f.read() or "{}"
+        data = {"metadata": {}, "objects": {}}
+
+        items = TransferObject.iterJson(
+            path,
+            objects=objects,
+            namespaces=namespaces
+        )
 
-        data = json.loads(data)
+        for key, name, value in items:
+            if name is None:
+                data[key] = value
+            else:
+                data[key][name] = value
 
         return data
 
+    @staticmethod
+    def iterJson(path, objects=None, namespaces=None):
+        """
+        Return a generator for the items in the given json path.
+
+        Each object is yielded as ("objects", name, data) and all other
+        keys as (key, None, value), in the order they appear in the file.
+
+        :type path: str
+        :type objects: list[str] or None
+        :type namespaces: list[str] or None
+        :rtype: collections.Iterable[(str, str, object)]
+        """
+        if objects is not None:
+            objects = set(objects)
+
+        if namespaces is not None:
+            namespaces = set(namespaces)
+
+        def accept(key, name):
+            if objects is not None and name not in objects:
+                return False
+
+            if namespaces is not None:
+                return mutils.namespace.getFromDagPath(name) in namespaces
+
+            return True
+
+        with mutils.JsonStreamReader(path) as reader:
+            for item in reader.items(expand=["objects"], accept=accept):
+                yield item
+
+    @staticmethod
+    def iterObjects(path, objects=None, namespaces=None):
+        """
+        Return a generator for the object names and data in the given path.
+
+        Example:
+            for name, data in TransferObject.iterObjects(path):
+                print name, data["attrs"].keys()
+
+        :type path: str
+        :type objects: list[str] or None
+        :type namespaces: list[str] or None
+        :rtype: collections.Iterable[(str, dict)]
+        """
+        items = TransferObject.iterJson(
+            path,
+            objects=objects,
+            namespaces=namespaces
+        )
+
+        for key, name, value in items:
+            if name is not None:
+                yield name, value
+
+    @staticmethod
+    def readMetadata(path):
+        """
+        Return only the metadata from the given json path.
+
+        The metadata is saved at the top of the file so the objects
+        are not parsed at all.
+
+        :type path: str
+        :rtype: dict
+        """
+        if mutils.isBinaryPath(path):
+            return mutils.readBinaryMetadata(path)
+
+        with mutils.JsonStreamReader(path) as reader:
+            return reader.read("metadata") or {}
+
     @staticmethod
     def readList(path):
         """
@@ -145,18 +320,7 @@ class TransferObject(object):
 
         :type path: str
         """
-        dictPath = path.replace(".json", ".dict")
-        listPath = path.replace(".json", ".list")
-
-        if not os.path.exists(path):
-
-            if os.path.exists(dictPath):
-                path = dictPath
-
-            elif os.path.exists(listPath):
-                path = listPath
-
-        self._path = path
+        self._path = resolveTransferPath(path)
 
     def mtime(self):
         """
@@ -293,11 +457,16 @@ class TransferObject(object):
         """
         return self.data().get("metadata", {})
 
-    def read(self, path=""):
+    def read(self, path="", objects=None, namespaces=None):
         """
         Return the data from the path set on the Transfer object.
 
+        The objects and namespaces can be used to only read a subset
+        of the objects when reading a json file.
+
         :type path: str
+        :type objects: list[str] or None
+        :type namespaces: list[str] or None
         :rtype: dict
         """
         path = path or self.path()
@@ -308,8 +477,11 @@ class TransferObject(object):
         elif path.endswith(".list"):
             data = self.readList(path)
 
+        elif mutils.isBinaryPath(path):
+            data = mutils.readBinary(path, objects=objects, namespaces=namespaces)
+
         else:
-            data = self.readJson(path)
+            data = self.readJson(path, objects=objects, namespaces=namespaces)
 
         self.setData(data)
 
@@ -318,15 +490,14 @@ class TransferObject(object):
         pass
 
     @mutils.showWaitCursor
-    def save(self, path):
+    def updateSceneMetadata(self):
         """
-        Save the current metadata and object data to the given path.
-        
-        :type path: str
+        Set the user, time and Maya scene metadata for saving.
+
+        This queries the scene and must be called in the main thread.
+
         :rtype: None
         """
-        logger.info("Saving pose: %s" % path)
-
         user = getpass.getuser()
         ctime = str(time.time()).split(".")[0]
 
@@ -336,30 +507,74 @@ class TransferObject(object):
         self.setMetadata("mayaVersion", maya.cmds.about(v=True))
         self.setMetadata("mayaSceneFile", maya.cmds.file(q=True, sn=True))
 
-        # Move the metadata information to the top of the file
-        metadata = {"metadata": self.metadata()}
-        data = self.dump(metadata)[:-1] + ","
+    def save(self, path, background=False):
+        """
+        Save the current metadata and object data to the given path.
+
+        The scene is only queried in the calling thread. When background
+        is True the file is serialised and written by a worker thread and
+        the started thread is returned so that the caller can join it.
+        Joining the thread raises the error if the file was not written.
+
+        :type path: str
+        :type background: bool
+        :rtype: WriteThread or None
+        """
+        logger.info("Saving pose: %s" % path)
 
-        # Move the objects information to after the metadata
-        objects = {"objects": self.objects()}
-        data += self.dump(objects)[1:]
+        self.updateSceneMetadata()
 
         # Create the given directory if it doesn't exist
         dirname = os.path.dirname(path)
         if not os.path.exists(dirname):
             os.makedirs(dirname)
 
-        with open(path, "w") as f:
-            f.write(str(data))
+        if not background:
+            self.write(path, self.data())
+            return None
+
+        # Copy the data so that later edits to the transfer object
+        # do not change the data while it is being written.
+        data = copy.deepcopy(self.data())
+
+        thread = WriteThread(self.write, path, data)
+        thread.start()
+
+        return thread
+
+    @staticmethod
+    def write(path, data, profile=JSON_PROFILE):
+        """
+        Serialise the given data to the given path.
+
+        :type path: str
+        :type data: dict
+        :type profile: str
+        :rtype: None
+        """
+        if mutils.isBinaryPath(path):
+            mutils.writeBinary(path, data)
+        else:
+            # Write one object at a time so that the whole file is
+            # never held in memory. The metadata is written first so
+            # that it can be read without parsing the objects.
+            with mutils.JsonStreamWriter(path, profile=profile) as writer:
+                writer.writeItem("metadata", data.get("metadata", {}))
+
+                writer.beginObject("objects")
+                for name, objectData in data.get("objects", {}).items():
+                    writer.writeItem(name, objectData)
+                writer.endObject()
 
         logger.info("Saved pose: %s" % path)
 
-    def dump(self, data=None):
+    def dump(self, data=None, profile="pretty"):
         """
         :type data: str | dict
+        :type profile: str
         :rtype: str
         """
         if data is None:
             data = self.data()
 
-        return json.dumps(data, indent=2)
+        return mutils.jsonstream.encode(data, profile)
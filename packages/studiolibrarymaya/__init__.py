@@ -16,11 +16,10 @@ import sys
 import logging
 
 import studiolibrary
-
-import mutils
 import studioqt
 
-from studiolibrarymaya.main import main
+from studiolibrarymaya.main import main, isLoaded
+from studiolibrary import SettingsStore
 
 
 __encoding__ = sys.getfilesystemencoding()
@@ -33,7 +32,8 @@ DEFAULT_FILE_TYPE = "mayaBinary"
 SETTINGS_PATH = studiolibrary.localPath("LibraryItem.json")
 
 _resource = None
-_settings = None
+_settingsStore = None
+_previewPrefetcher = None
 _mayaCloseScriptJob = None
 
 
@@ -46,17 +46,41 @@ def readSettings():
     return studiolibrary.readJson(SETTINGS_PATH)
 
 
+def settingsStore():
+    """
+    Return the in memory store for the local settings.
+
+    :rtype: SettingsStore
+    """
+    global _settingsStore
+
+    if not _settingsStore:
+        _settingsStore = SettingsStore(SETTINGS_PATH)
+
+    return _settingsStore
+
+
 def saveSettings(data):
     """
     Save the given dict to the local location of the SETTING_PATH.
 
+    The changes are written after a short delay so that many small
+    changes result in a single write.
+
     :type data: dict
     :rtype: None
     """
-    global _settings
-    _settings = None
+    settingsStore().update(data)
+
+
+def flushSettings():
+    """
+    Write any settings changes that are waiting to be saved.
 
-    studiolibrary.updateJson(SETTINGS_PATH, data)
+    :rtype: None
+    """
+    if _settingsStore:
+        _settingsStore.flush()
 
 
 def settings():
@@ -65,37 +89,51 @@ def settings():
 
     :rtype: studiolibrary.Settings
     """
-    global _settings
+    import mutils
 
-    if not _settings:
-        _settings = readSettings()
+    data = settingsStore().data()
 
     # Shared options
-    _settings.setdefault("namespaces", [])
-    _settings.setdefault("namespaceOption", "file")
+    data.setdefault("namespaces", [])
+    data.setdefault("namespaceOption", "file")
 
-    _settings.setdefault("iconToggleBoxChecked", True)
-    _settings.setdefault("infoToggleBoxChecked", True)
-    _settings.setdefault("optionsToggleBoxChecked", True)
-    _settings.setdefault("namespaceToggleBoxChecked", True)
+    data.setdefault("iconToggleBoxChecked", True)
+    data.setdefault("infoToggleBoxChecked", True)
+    data.setdefault("optionsToggleBoxChecked", True)
+    data.setdefault("namespaceToggleBoxChecked", True)
 
     # Anim options
-    _settings.setdefault('byFrame', 1)
-    _settings.setdefault('fileType', DEFAULT_FILE_TYPE)
-    _settings.setdefault('currentTime', False)
-    _settings.setdefault('connectOption', False)
-    _settings.setdefault('showHelpImage', False)
-    _settings.setdefault('pasteOption', "replace")
+    data.setdefault('byFrame', 1)
+    data.setdefault('fileType', DEFAULT_FILE_TYPE)
+    data.setdefault('currentTime', False)
+    data.setdefault('connectOption', False)
+    data.setdefault('showHelpImage', False)
+    data.setdefault('pasteOption', "replace")
 
     # Pose options
-    _settings.setdefault("keyEnabled", False)
-    _settings.setdefault("mirrorEnabled", False)
+    data.setdefault("keyEnabled", False)
+    data.setdefault("mirrorEnabled", False)
 
     # Mirror options
-    _settings.setdefault("mirrorOption", mutils.MirrorOption.Swap)
-    _settings.setdefault("mirrorAnimation", True)
+    data.setdefault("mirrorOption", mutils.MirrorOption.Swap)
+    data.setdefault("mirrorAnimation", True)
+
+    return data
+
+
+def previewPrefetcher():
+    """
+    Return the prefetcher that reads the data for the next previews.
 
-    return _settings
+    :rtype: studiolibrarymaya.previewprefetcher.PreviewPrefetcher
+    """
+    global _previewPrefetcher
+
+    if not _previewPrefetcher:
+        from studiolibrarymaya.previewprefetcher import PreviewPrefetcher
+        _previewPrefetcher = PreviewPrefetcher()
+
+    return _previewPrefetcher
 
 
 def resource():
@@ -133,6 +171,8 @@ def enableMayaClosedEvent():
     global _mayaCloseScriptJob
 
     if not _mayaCloseScriptJob:
+        import mutils
+
         event = ['quitApplication', mayaClosedEvent]
         try:
             _mayaCloseScriptJob = mutils.ScriptJob(event=event)
@@ -147,7 +187,12 @@ def mayaClosedEvent():
     :rtype: None
     """
     for libraryWidget in studiolibrary.LibraryWidget.instances():
-        libraryWidget.saveSettings()
+        libraryWidget.saveSettings(flush=True)
+
+    flushSettings()
+
+    if _previewPrefetcher:
+        _previewPrefetcher.stop()
 
 
 def setDebugMode(libraryWidget, value):
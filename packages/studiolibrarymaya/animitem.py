@@ -86,6 +86,50 @@ class ValidateAnimError(AnimItemError):
     """Raised when there is an invalid animation option"""
 
 
+def packImageSequences(path, removeFrames=False):
+    """
+    Pack the image sequences of the anim items under the given path.
+
+    Items that already have an up to date atlas are skipped. Use this to
+    convert an existing library.
+
+    :type path: str
+    :type removeFrames: bool
+    :rtype: int
+    """
+    count = 0
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        if not dirpath.endswith(".anim"):
+            continue
+
+        # Do not walk into the item folders
+        del dirnames[:]
+
+        dirname = os.path.join(dirpath, "sequence")
+        if not os.path.isdir(dirname):
+            continue
+
+        atlas = studioqt.Atlas.fromSequence(dirname)
+        frames = studioqt.imagesequence.listFrames(dirname)
+
+        if not atlas or atlas.isStale(dirname, frames):
+            try:
+                studioqt.packAtlas(dirname, frames=frames)
+            except Exception as error:
+                logger.exception(error)
+                continue
+
+            count += 1
+
+        if removeFrames:
+            shutil.rmtree(dirname)
+
+    logger.info("Packed %d image sequences under %s", count, path)
+
+    return count
+
+
 class AnimItem(baseitem.BaseItem):
 
     def __init__(self, *args, **kwargs):
@@ -295,6 +339,8 @@ class AnimItem(baseitem.BaseItem):
         # Move the animation data to the given path using the base class
         super(AnimItem, self).save(path, contents=contents)
 
+        self.storeBlobs(path)
+
 
 class AnimCreateWidget(basecreatewidget.BaseCreateWidget):
 
@@ -590,7 +636,14 @@ class AnimCreateWidget(basecreatewidget.BaseCreateWidget):
 
         sequencePath = self.sequencePath()
         if sequencePath:
-            contents = [os.path.dirname(sequencePath)]
+            dirname = os.path.dirname(sequencePath)
+            contents = [dirname]
+
+            # Pack the frames so that hovering reads a single file
+            try:
+                contents.extend(studioqt.packAtlas(dirname))
+            except Exception as error:
+                logger.exception(error)
 
         item.save(
             path=path,
@@ -634,6 +687,12 @@ class AnimPreviewWidget(basepreviewwidget.BasePreviewWidget):
         self.ui.sequenceWidget.setToolTip(self.ui.thumbnailButton.toolTip())
         self.ui.sequenceWidget.setDirname(self.item().imageSequencePath())
 
+        # Use the first frame that was read by the prefetcher
+        frames = self.ui.sequenceWidget.frames()
+        if frames and os.path.exists(frames[0]):
+            pixmap = studiolibrarymaya.previewPrefetcher().pixmap(frames[0])
+            self.ui.sequenceWidget.setIcon(QtGui.QIcon(pixmap))
+
         self.ui.thumbnailFrame.layout().insertWidget(0, self.ui.sequenceWidget)
         self.ui.thumbnailButton.hide()
         self.ui.thumbnailButton = self.ui.sequenceWidget
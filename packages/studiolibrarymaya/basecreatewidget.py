@@ -51,6 +51,8 @@ class BaseCreateWidget(QtWidgets.QWidget):
 
         self._item = None
         self._iconPath = ""
+        self._saveTask = None
+        self._acceptButtonText = ""
         self._scriptJob = None
         self._focusWidget = None
         self._libraryWidget = None
@@ -176,9 +178,16 @@ class BaseCreateWidget(QtWidgets.QWidget):
         """
         Overriding the close method so that we can disable the script job.
 
+        A running save task is cancelled and waited for, since the
+        thread is destroyed with the widget.
+
         :rtype: None
         """
+        if self._saveTask:
+            self._saveTask.stop()
+
         self.setScriptJobEnabled(False)
+        studiolibrarymaya.flushSettings()
         QtWidgets.QWidget.close(self)
 
     def scriptJob(self):
@@ -433,10 +442,95 @@ class BaseCreateWidget(QtWidgets.QWidget):
         :rtype: None
         """
         item = self.item()
-        item.save(
+
+        task = item.createSaveTask(
             objects,
             path=path,
             iconPath=iconPath,
             metadata=metadata,
         )
+
+        if task:
+            self.startSaveTask(task)
+        else:
+            item.save(
+                objects,
+                path=path,
+                iconPath=iconPath,
+                metadata=metadata,
+            )
+            self.close()
+
+    def saveTask(self):
+        """
+        Return the save task that is currently running.
+
+        :rtype: studiolibrarymaya.savetask.SaveTask or None
+        """
+        return self._saveTask
+
+    def startSaveTask(self, task):
+        """
+        Write the captured data in a worker thread and show the progress.
+
+        Clicking the accept button while the task is running cancels it.
+
+        :type task: studiolibrarymaya.savetask.SaveTask
+        :rtype: None
+        """
+        self._saveTask = task
+        self._acceptButtonText = self.ui.acceptButton.text()
+
+        # The thread must not outlive the widget
+        task.setParent(self)
+
+        task.progressChanged.connect(self._saveTaskProgressChanged)
+        task.saved.connect(self._saveTaskSaved)
+        task.failed.connect(self._saveTaskFailed)
+        task.cancelled.connect(self._saveTaskStopped)
+
+        self.ui.acceptButton.clicked.disconnect(self.accept)
+        self.ui.acceptButton.clicked.connect(task.cancel)
+        self.ui.acceptButton.setToolTip("Click to cancel saving")
+
+        task.start()
+
+    def _saveTaskProgressChanged(self, percent, text):
+        """
+        :type percent: int
+        :type text: str
+        :rtype: None
+        """
+        self.ui.acceptButton.setText("{0} {1}%".format(text, percent))
+
+    def _saveTaskStopped(self):
+        """
+        Reset the accept button after the task has finished.
+
+        :rtype: None
+        """
+        task = self._saveTask
+        self._saveTask = None
+
+        self.ui.acceptButton.clicked.disconnect(task.cancel)
+        self.ui.acceptButton.clicked.connect(self.accept)
+        self.ui.acceptButton.setToolTip("")
+        self.ui.acceptButton.setText(self._acceptButtonText)
+
+    def _saveTaskSaved(self, path):
+        """
+        :type path: str
+        :rtype: None
+        """
+        self._saveTaskStopped()
         self.close()
+
+    def _saveTaskFailed(self, message):
+        """
+        :type message: str
+        :rtype: None
+        """
+        self._saveTaskStopped()
+
+        title = "Error while saving"
+        studioqt.MessageBox.critical(self.libraryWidget(), title, message)
@@ -132,13 +132,27 @@ class BaseItem(studiolibrary.LibraryItem):
         """
         Return the transfer object used to read and write the data.
 
+        The parsed data is shared with other items for the same path
+        through the transfer cache.
+
         :rtype: mutils.TransferObject
         """
         if not self._transferObject:
             path = self.transferPath()
-            self._transferObject = self.transferClass().fromPath(path)
+            cache = mutils.transferCache()
+            self._transferObject = cache.get(self.transferClass(), path)
         return self._transferObject
 
+    def prefetch(self, items):
+        """
+        Read the data for the given items in the background.
+
+        :type items: list[studiolibrary.LibraryItem]
+        :rtype: None
+        """
+        items = [item for item in items if isinstance(item, BaseItem)]
+        studiolibrarymaya.previewPrefetcher().prefetch(self, items)
+
     def thumbnailPath(self):
         """
         Return the thumbnail location on disc to be displayed for the item.
@@ -267,7 +281,7 @@ class BaseItem(studiolibrary.LibraryItem):
             path = os.path.join(mirrorTablePath, "mirrortable.json")
 
             if path:
-                mirrorTable = mutils.MirrorTable.fromPath(path)
+                mirrorTable = mutils.loadMirrorTable(path)
 
         return mirrorTable
 
@@ -287,17 +301,14 @@ class BaseItem(studiolibrary.LibraryItem):
 
     def mirrorTablePaths(self):
         """
-        Return all mirror table paths for this item.
+        Return all mirror table paths for this item, nearest first.
+
+        The folder listings are cached and shared by all the items in
+        the same folder.
 
         :rtype: list[str]
         """
-        paths = list(studiolibrary.walkup(
-                self.path(),
-                match=lambda path: path.endswith(".mirror"),
-                depth=10,
-            )
-        )
-        return paths
+        return mutils.findMirrorTables(self.path(), depth=10)
 
     def namespaces(self):
         """
@@ -397,6 +408,38 @@ class BaseItem(studiolibrary.LibraryItem):
         """
         self.load()
 
+    def createSaveTask(self, objects, path="", iconPath="", metadata=None, **kwargs):
+        """
+        Capture the given objects and return a task that saves the item.
+
+        Return None when the item can only be saved in the main thread.
+
+        :type objects: list[str]
+        :type path: str
+        :type iconPath: str
+        :type metadata: None or dict
+        :rtype: studiolibrarymaya.savetask.SaveTask or None
+        """
+        return None
+
+    def storeBlobs(self, path):
+        """
+        Link the images of the saved item to the library blob store.
+
+        Nothing is done when the library does not have a blob store.
+
+        :type path: str
+        :rtype: None
+        """
+        store = studiolibrary.BlobStore.find(path)
+
+        if store is not None:
+            try:
+                store.dedupe(path)
+            except Exception as error:
+                # The item is saved even if the images cannot be shared
+                logger.exception(error)
+
     def load(self, objects=None, namespaces=None, **kwargs):
         """
         Load the data from the transfer object.
@@ -10,6 +10,7 @@
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import time
 import logging
 
 from studioqt import QtGui
@@ -52,6 +53,11 @@ class BasePreviewWidget(QtWidgets.QWidget):
         :type parent: QtWidgets.QWidget
         """
         QtWidgets.QWidget.__init__(self, parent)
+
+        start = time.time()
+        prefetcher = studiolibrarymaya.previewPrefetcher()
+        hit = prefetcher.isCached(item)
+
         self.setObjectName("studioLibraryMayaPreviewWidget")
         self.setWindowTitle("Preview Item")
 
@@ -78,6 +84,8 @@ class BasePreviewWidget(QtWidgets.QWidget):
         self.updateThumbnailSize()
         self.setupConnections()
 
+        prefetcher.itemPreviewed(item, time.time() - start, hit)
+
     def setupConnections(self):
         """
         :rtype: None
@@ -178,7 +186,8 @@ class BasePreviewWidget(QtWidgets.QWidget):
         :rtype: None
         """
         self._iconPath = path
-        icon = QtGui.QIcon(QtGui.QPixmap(path))
+        pixmap = studiolibrarymaya.previewPrefetcher().pixmap(path)
+        icon = QtGui.QIcon(pixmap)
         self.setIcon(icon)
         self.updateThumbnailSize()
         self.item().update()
@@ -231,6 +240,7 @@ class BasePreviewWidget(QtWidgets.QWidget):
         :rtype: None
         """
         self.setScriptJobEnabled(False)
+        studiolibrarymaya.flushSettings()
         QtWidgets.QWidget.close(self)
 
     def scriptJob(self):
@@ -0,0 +1,203 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmarks for the startup time of the library window.
+
+The import times are measured in a new interpreter, since the modules
+are already imported in the current one. In Maya the executable should
+be the mayapy of the same version.
+
+Importing studiolibrary still imports studioqt and the library widget,
+since they are needed to show the window. Only mutils and the item
+modules are imported after the first paint in deferred mode, so their
+times are marked.
+
+The loaded time includes finding the items in the worker thread.
+
+# Example:
+import studiolibrarymaya.benchmark
+reload(studiolibrarymaya.benchmark)
+studiolibrarymaya.benchmark.run("/library", deferred=True, executable="/usr/autodesk/maya/bin/mayapy")
+"""
+import os
+import sys
+import json
+import time
+import subprocess
+
+from studioqt import QtCore
+from studioqt import QtWidgets
+
+
+# The modules in the order they are imported on startup. The modules
+# after studiolibrarymaya are imported after the first paint when deferred.
+MODULES = [
+    "studioqt",
+    "studiolibrary",
+    "studiolibrarymaya",
+    "mutils",
+    "studiolibrarymaya.animitem",
+    "studiolibrarymaya.poseitem",
+    "studiolibrarymaya.mirroritem",
+    "studiolibrarymaya.setsitem",
+]
+
+DEFERRED_MODULES = MODULES[MODULES.index("studiolibrarymaya") + 1:]
+
+IMPORT_SCRIPT = """
+import sys
+import json
+import time
+
+times = []
+
+for name in sys.argv[1:]:
+    start = time.time()
+    try:
+        __import__(name)
+    except ImportError as error:
+        sys.stderr.write(str(error) + "\\n")
+        break
+    times.append((name, time.time() - start))
+
+sys.stdout.write(json.dumps(times))
+"""
+
+# The maximum time in seconds to wait for the window to paint and load
+TIMEOUT = 60
+
+
+class PaintFilter(QtCore.QObject):
+
+    def __init__(self, parent=None):
+        """
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QObject.__init__(self, parent)
+        self._paintTime = None
+
+    def paintTime(self):
+        """
+        Return the time of the first paint event or None.
+
+        :rtype: float or None
+        """
+        return self._paintTime
+
+    def eventFilter(self, obj, event):
+        """
+        :type obj: QtCore.QObject
+        :type event: QtCore.QEvent
+        :rtype: bool
+        """
+        if event.type() == QtCore.QEvent.Paint and self._paintTime is None:
+            self._paintTime = time.time()
+
+        return False
+
+
+def benchmarkImports(modules=None, executable=None):
+    """
+    Return the time in seconds it takes to import each of the modules.
+
+    The time of each module does not include the modules before it.
+
+    :type modules: list[str] or None
+    :type executable: str or None
+    :rtype: list[(str, float)]
+    """
+    modules = modules or MODULES
+    executable = executable or sys.executable
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+
+    process = subprocess.Popen(
+        [executable, "-c", IMPORT_SCRIPT] + modules,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stdout, stderr = process.communicate()
+
+    if stderr:
+        print(stderr)
+
+    return [tuple(item) for item in json.loads(stdout or "[]")]
+
+
+def benchmarkFirstPaint(path, deferred=True, **kwargs):
+    """
+    Return the time in seconds until the window is painted and loaded.
+
+    :type path: str
+    :type deferred: bool
+    :rtype: dict
+    """
+    import studiolibrarymaya
+
+    app = QtWidgets.QApplication.instance()
+
+    start = time.time()
+    libraryWidget = studiolibrarymaya.main(path=path, deferred=deferred, **kwargs)
+    created = time.time()
+
+    paintFilter = PaintFilter(libraryWidget)
+    libraryWidget.installEventFilter(paintFilter)
+    libraryWidget.update()
+
+    while time.time() - start < TIMEOUT:
+        app.processEvents()
+        if paintFilter.paintTime() and studiolibrarymaya.isLoaded(libraryWidget):
+            break
+
+    loaded = time.time()
+
+    libraryWidget.removeEventFilter(paintFilter)
+
+    painted = paintFilter.paintTime() or loaded
+
+    return {
+        "created": created - start,
+        "painted": painted - start,
+        "loaded": loaded - start,
+    }
+
+
+def run(path, deferred=True, executable=None):
+    """
+    Print the import times and the startup times for the given library.
+
+    The startup is measured once per process, since the window is only
+    created the first time.
+
+    :type path: str
+    :type deferred: bool
+    :type executable: str or None
+    :rtype: None
+    """
+    msg = "Imports\n"
+
+    for name, duration in benchmarkImports(executable=executable):
+        if deferred and name in DEFERRED_MODULES:
+            name += " (after paint)"
+        msg += "  {0:<44} {1:>10.4f} sec\n".format(name, duration)
+
+    results = benchmarkFirstPaint(path, deferred=deferred)
+
+    msg += "Startup (deferred={0})\n".format(deferred)
+    msg += "  created: {created:>10.4f} sec\n".format(**results)
+    msg += "  painted: {painted:>10.4f} sec\n".format(**results)
+    msg += "  loaded:  {loaded:>10.4f} sec".format(**results)
+
+    print(msg)
@@ -11,9 +11,20 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
+import time
+import logging
+from functools import partial
+
 import studiolibrary
 
 
+logger = logging.getLogger(__name__)
+
+
+# The library widgets that have been shown but not loaded yet
+_loading = set()
+
+
 def main(*args, **kwargs):
     """
     Convenience method for creating/showing a MayaLibraryWidget instance.
@@ -28,22 +39,115 @@ def main(*args, **kwargs):
         unlockRegExp=None
     )
 
+    When deferred is True the window is shown before the items are
+    registered and the library is read. The items and mutils are
+    imported after the first paint, and the items are then found in a
+    worker thread.
+
+    main(path="/library", deferred=True)
+
     :rtype: studiolibrarymaya.MayaLibraryWidget
     """
-    import studiolibrarymaya
+    deferred = kwargs.pop("deferred", False)
+    path = kwargs.get("path")
 
-    studiolibrarymaya.registerItems()
-    studiolibrarymaya.enableMayaClosedEvent()
+    # The path can only be deferred when it is given as a keyword
+    if not deferred or not path or len(args) > 1:
+        loadItems()
+        return createLibraryWidget(*args, **kwargs)
+
+    start = time.time()
+
+    show = kwargs.get("show", True)
+
+    kwargs["path"] = ""
+    kwargs["show"] = False
+    libraryWidget = createLibraryWidget(*args, **kwargs)
 
+    # Do not read the path from the settings when the window is shown,
+    # since the given path is set after the first paint
+    libraryWidget.setRestorePathEnabled(False)
+    libraryWidget.setAsyncRefreshEnabled(True)
+
+    if show:
+        libraryWidget.show()
+
+    logger.debug("Created window in %.1f ms", (time.time() - start) * 1000)
+
+    _loading.add(libraryWidget)
+
+    # Load the library after the window has been painted
+    from studioqt import QtCore
+    QtCore.QTimer.singleShot(0, partial(loadLibrary, libraryWidget, path))
+
+    return libraryWidget
+
+
+def createLibraryWidget(*args, **kwargs):
+    """
+    Return the library widget for the current application.
+
+    :rtype: studiolibrary.LibraryWidget
+    """
     if studiolibrary.isMaya():
         import studiolibrarymaya.mayalibrarywidget
         cls = studiolibrarymaya.mayalibrarywidget.MayaLibraryWidget
     else:
         cls = studiolibrary.LibraryWidget
 
-    libraryWidget = cls.instance(*args, **kwargs)
+    return cls.instance(*args, **kwargs)
 
-    return libraryWidget
+
+def loadItems():
+    """
+    Register the items and enable the Maya closed event.
+
+    This imports the item modules and mutils.
+
+    :rtype: None
+    """
+    import studiolibrarymaya
+
+    studiolibrarymaya.registerItems()
+    studiolibrarymaya.enableMayaClosedEvent()
+
+
+def loadLibrary(libraryWidget, path):
+    """
+    Register the items and set the path of the given library widget.
+
+    The items are still being found when this returns, see isLoaded.
+
+    :type libraryWidget: studiolibrary.LibraryWidget
+    :type path: str
+    :rtype: None
+    """
+    start = time.time()
+
+    try:
+        loadItems()
+        libraryWidget.setRestorePathEnabled(True)
+        libraryWidget.setPath(path)
+    finally:
+        _loading.discard(libraryWidget)
+
+    logger.debug("Set the path %s in %.1f ms", path, (time.time() - start) * 1000)
+
+
+def isLoaded(libraryWidget):
+    """
+    Return True if the library of the given widget has been loaded.
+
+    The library is loaded when the path has been set and the items
+    have been found.
+
+    :type libraryWidget: studiolibrary.LibraryWidget
+    :rtype: bool
+    """
+    if libraryWidget in _loading:
+        return False
+
+    return not libraryWidget.isScanningItems()
 
 
 if __name__ == "__main__":
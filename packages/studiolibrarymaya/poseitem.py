@@ -36,6 +36,7 @@ item = poseitem.PoseItem(path)
 item.load(objects=objects, namespaces=namespaces, key=True, mirror=False)
 """
 
+import shutil
 import logging
 
 from studioqt import QtCore
@@ -46,6 +47,7 @@ import studiolibrarymaya
 from studiolibrarymaya import baseitem
 from studiolibrarymaya import basecreatewidget
 from studiolibrarymaya import basepreviewwidget
+from studiolibrarymaya import savetask
 
 try:
     import mutils
@@ -352,9 +354,50 @@ class PoseItem(baseitem.BaseItem):
         # Move the mirror table to the given path using the base class
         contents = [tempPath, iconPath]
         super(PoseItem, self).save(path, contents=contents, **kwargs)
+        self.storeBlobs(path)
 
         logger.info(u'Saved: {0}'.format(path))
 
+    def createSaveTask(self, objects, path="", iconPath="", metadata=None, **kwargs):
+        """
+        Capture the pose in the main thread and return a task that writes it.
+
+        :type objects: list[str]
+        :type path: str
+        :type iconPath: str
+        :type metadata: None or dict
+        :rtype: savetask.SaveTask
+        """
+        if path and not path.endswith(".pose"):
+            path += ".pose"
+
+        pose = mutils.Pose.fromObjects(objects)
+        pose.updateMetadata(metadata or {})
+        pose.updateSceneMetadata()
+
+        basename = self.transferBasename()
+
+        def writePose(dirname):
+            pose.write(dirname + "/" + basename, pose.data())
+
+        def copyIcon(dirname):
+            shutil.copy(iconPath, dirname)
+
+        def finalize(stagingPath):
+            super(PoseItem, self).save(path, stagingPath=stagingPath, **kwargs)
+            self.storeBlobs(path)
+            logger.info(u'Saved: {0}'.format(path))
+
+        task = savetask.SaveTask(path)
+        task.addStage("Writing pose", writePose)
+
+        if iconPath:
+            task.addStage("Copying thumbnail", copyIcon)
+
+        task.setFinalize(finalize)
+
+        return task
+
 
 class PoseCreateWidget(basecreatewidget.BaseCreateWidget):
 
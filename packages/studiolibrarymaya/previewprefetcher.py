@@ -0,0 +1,305 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Read the data for the next previews before the user selects them.
+
+When the user moves through the items, a new preview widget is created
+for each one. It reads the transfer object, the thumbnail, the first
+frame of the image sequence and the mirror tables. When an item is
+selected, the library widget passes the next items in the view in the
+direction the user is moving in. The prefetcher reads their files in a
+worker thread, so the preview widget only reads from caches. The worker
+is only given plain paths and the images are decoded in the main thread.
+
+The hit rate and the time to show each preview are shown in the status
+bar in debug mode.
+
+Example:
+    prefetcher = studiolibrarymaya.previewPrefetcher()
+    prefetcher.prefetch(item, items)
+
+    pixmap = prefetcher.pixmap(item.thumbnailPath())
+"""
+import os
+import time
+import Queue
+import logging
+import threading
+import collections
+
+from studioqt import QtGui
+from studioqt import QtCore
+from studioqt.imagesequence import listFrames
+
+import mutils
+
+
+__all__ = [
+    "PreviewPrefetcher",
+]
+
+logger = logging.getLogger(__name__)
+
+
+# The maximum number of image files to keep in memory
+MAX_FILES = 64
+
+
+class PrefetchThread(QtCore.QThread):
+
+    def __init__(self, prefetcher, parent=None):
+        """
+        :type prefetcher: PreviewPrefetcher
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QThread.__init__(self, parent)
+        self._prefetcher = prefetcher
+
+    def run(self):
+        """
+        The starting point for the thread.
+
+        :rtype: None
+        """
+        self._prefetcher.processJobs()
+
+
+class PreviewPrefetcher(QtCore.QObject):
+
+    def __init__(self, parent=None):
+        """
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QObject.__init__(self, parent)
+
+        self._lock = threading.Lock()
+        self._queue = Queue.Queue()
+        self._thread = None
+
+        # {path: (mtime, data)}
+        self._files = collections.OrderedDict()
+
+        self._hits = 0
+        self._previews = 0
+
+    def read(self, path):
+        """
+        Return the contents of the given file from the cache.
+
+        The file is read again when it is not cached or it has changed.
+        This is safe to call from the worker thread.
+
+        :type path: str
+        :rtype: str or None
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._files.pop(path, None)
+            if cached and cached[0] == mtime:
+                self._files[path] = cached
+                return cached[1]
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        with self._lock:
+            self._files[path] = (mtime, data)
+            while len(self._files) > MAX_FILES:
+                self._files.popitem(last=False)
+
+        return data
+
+    def isFileCached(self, path):
+        """
+        :type path: str
+        :rtype: bool
+        """
+        with self._lock:
+            return path in self._files
+
+    def pixmap(self, path):
+        """
+        Return a pixmap for the given path from the file cache.
+
+        The image is decoded here, so it must be called from the main
+        thread.
+
+        :type path: str
+        :rtype: QtGui.QPixmap
+        """
+        try:
+            data = self.read(path)
+        except IOError:
+            data = None
+
+        pixmap = QtGui.QPixmap()
+
+        if data is None or not pixmap.loadFromData(data):
+            return QtGui.QPixmap(path)
+
+        return pixmap
+
+    def isCached(self, item):
+        """
+        Return True if the data for the given item has been read.
+
+        :type item: studiolibrarymaya.BaseItem
+        :rtype: bool
+        """
+        cache = mutils.transferCache()
+
+        if not cache.contains(item.transferClass(), item.transferPath()):
+            return False
+
+        path = item.thumbnailPath()
+        if os.path.exists(path) and not self.isFileCached(path):
+            return False
+
+        return True
+
+    def itemPreviewed(self, item, duration, hit):
+        """
+        Record the time it took to show the preview for the given item.
+
+        :type item: studiolibrarymaya.BaseItem
+        :type duration: float
+        :type hit: bool
+        :rtype: None
+        """
+        self._previews += 1
+        if hit:
+            self._hits += 1
+
+        msg = "Preview {0} in {1:.1f} ms ({2}, hit rate {3}%)".format(
+            item.name(),
+            duration * 1000,
+            "hit" if hit else "miss",
+            100 * self._hits / self._previews,
+        )
+
+        logger.debug(msg)
+
+        libraryWidget = item.libraryWidget()
+        if libraryWidget and libraryWidget.isDebug():
+            libraryWidget.showInfoMessage(msg)
+
+    def stats(self):
+        """
+        Return the number of previews that were read from the caches and
+        the total number of previews.
+
+        :rtype: (int, int)
+        """
+        return self._hits, self._previews
+
+    def prefetch(self, item, items):
+        """
+        Read the data for the given items after the given item is selected.
+
+        The items are the ones next to the selected item in the view,
+        nearest first, as given by the library widget.
+
+        :type item: studiolibrarymaya.BaseItem
+        :type items: list[studiolibrarymaya.BaseItem]
+        :rtype: None
+        """
+        # Read the transfer objects with the transfer cache worker
+        cls = item.transferClass()
+        paths = [i.transferPath() for i in items if i.transferClass() is cls]
+
+        cache = mutils.transferCache()
+        cache.prefetch(cls, paths)
+
+        # Only plain paths are passed to the preview worker
+        jobs = []
+        for i in items:
+            jobs.append((i.name(), i.path(), i.thumbnailPath(), i.imageSequencePath() or ""))
+
+        self.addJobs(jobs)
+
+    def prefetchPaths(self, path, thumbnailPath, sequencePath):
+        """
+        Read the images and the mirror tables for the given item path.
+
+        This is called from the worker thread, so only the files are read
+        and the images are decoded in the main thread.
+
+        :type path: str
+        :type thumbnailPath: str
+        :type sequencePath: str
+        :rtype: None
+        """
+        mutils.findMirrorTables(path)
+
+        self.read(thumbnailPath)
+
+        if sequencePath:
+            frames = listFrames(sequencePath)
+            if frames:
+                self.read(frames[0])
+
+    def addJobs(self, jobs):
+        """
+        Replace the jobs that have not been started with the given jobs.
+
+        :type jobs: list[(str, str, str, str)]
+        :rtype: None
+        """
+        try:
+            while True:
+                self._queue.get_nowait()
+        except Queue.Empty:
+            pass
+
+        for job in jobs:
+            self._queue.put(job)
+
+        if self._thread is None:
+            self._thread = PrefetchThread(self)
+            self._thread.start()
+
+    def processJobs(self):
+        """
+        Run the jobs in the worker thread until the prefetcher is stopped.
+
+        :rtype: None
+        """
+        while True:
+            job = self._queue.get()
+
+            if job is None:
+                return
+
+            name, path, thumbnailPath, sequencePath = job
+
+            try:
+                start = time.time()
+                self.prefetchPaths(path, thumbnailPath, sequencePath)
+                logger.debug("Prefetched %s in %.1f ms", name, (time.time() - start) * 1000)
+            except Exception as error:
+                logger.debug("Cannot prefetch %s: %s", name, error)
+
+    def stop(self):
+        """
+        Stop the worker thread.
+
+        :rtype: None
+        """
+        if self._thread is not None:
+            self.addJobs([None])
+            self._thread.wait()
+            self._thread = None
@@ -0,0 +1,245 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Save the files for an item in a worker thread.
+
+The scene is captured in the main thread before the task is started.
+The stages then write their files to a staging folder next to the
+destination. When all stages are done the finalize function is called
+in the main thread with the staging folder. Since the staging folder is
+on the same disc as the destination, the whole item is moved into place
+with a single rename, so an interrupted save never leaves a half written
+item behind.
+
+Example:
+    task = SaveTask(path, parent=widget)
+    task.addStage("Writing pose", writePose)
+    task.setFinalize(lambda stagingPath: item.save(path, stagingPath=stagingPath))
+    task.start()
+"""
+import os
+import uuid
+import shutil
+import logging
+
+from studioqt import QtCore
+
+
+__all__ = [
+    "SaveTask",
+    "SaveTaskCancelled",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class SaveTaskCancelled(Exception):
+    """"""
+
+
+class SaveTask(QtCore.QThread):
+
+    progressChanged = QtCore.Signal(int, str)
+    saved = QtCore.Signal(str)
+    failed = QtCore.Signal(str)
+    cancelled = QtCore.Signal()
+
+    def __init__(self, path, parent=None):
+        """
+        :type path: str
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QThread.__init__(self, parent)
+
+        self._path = path
+        self._error = None
+        self._stages = []
+        self._finalize = None
+        self._isCancelled = False
+
+        dirname, basename = os.path.split(path)
+        name = ".{0}.{1}.staging".format(basename, uuid.uuid4().hex[:8])
+        self._stagingPath = os.path.join(dirname, name)
+
+        self.finished.connect(self._finished)
+
+    def path(self):
+        """
+        Return the destination path of the item.
+
+        :rtype: str
+        """
+        return self._path
+
+    def stagingPath(self):
+        """
+        Return the folder that the stages write their files to.
+
+        :rtype: str
+        """
+        return self._stagingPath
+
+    def addStage(self, name, func):
+        """
+        Add a stage that is called with the staging path in the worker.
+
+        The function must not call any Maya commands.
+
+        :type name: str
+        :type func: func
+        :rtype: None
+        """
+        self._stages.append((name, func))
+
+    def setFinalize(self, func):
+        """
+        Set the function that moves the staging folder into place.
+
+        It is called in the main thread with the staging path.
+
+        :type func: func
+        :rtype: None
+        """
+        self._finalize = func
+
+    def cancel(self):
+        """
+        Cancel the task before the next stage is started.
+
+        :rtype: None
+        """
+        self._isCancelled = True
+
+    def isCancelled(self):
+        """
+        :rtype: bool
+        """
+        return self._isCancelled
+
+    def error(self):
+        """
+        Return the error message if the task failed.
+
+        :rtype: str or None
+        """
+        return self._error
+
+    def contents(self):
+        """
+        Return the files that were written to the staging folder.
+
+        :rtype: list[str]
+        """
+        if not os.path.exists(self._stagingPath):
+            return []
+
+        # Skip the lock and temp files of interrupted writes
+        names = sorted(os.listdir(self._stagingPath))
+        names = [name for name in names if not name.startswith(".")]
+        return [os.path.join(self._stagingPath, name) for name in names]
+
+    def removeHiddenFiles(self):
+        """
+        Remove the lock and temp files left in the staging folder.
+
+        :rtype: None
+        """
+        for name in os.listdir(self._stagingPath):
+            if name.startswith("."):
+                path = os.path.join(self._stagingPath, name)
+
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+
+    def run(self):
+        """
+        The starting point for the thread.
+
+        :rtype: None
+        """
+        try:
+            if not os.path.exists(self._stagingPath):
+                os.makedirs(self._stagingPath)
+
+            count = len(self._stages) + 1
+
+            for i, (name, func) in enumerate(self._stages):
+                if self._isCancelled:
+                    raise SaveTaskCancelled()
+
+                self.progressChanged.emit(int(100 * i / count), name)
+                func(self._stagingPath)
+
+        except SaveTaskCancelled:
+            pass
+
+        except Exception as error:
+            logger.exception(error)
+            self._error = str(error)
+
+    def _finished(self):
+        """
+        Triggered in the main thread when the worker has finished.
+
+        :rtype: None
+        """
+        try:
+            if self._isCancelled:
+                logger.info("Cancelled saving: %s", self._path)
+                self.cleanup()
+                self.cancelled.emit()
+                return
+
+            if self._error is None:
+                self.progressChanged.emit(95, "Moving into place")
+
+                if self._finalize:
+                    self.removeHiddenFiles()
+                    self._finalize(self._stagingPath)
+
+        except Exception as error:
+            logger.exception(error)
+            self._error = str(error)
+
+        self.cleanup()
+
+        if self._error is None:
+            self.progressChanged.emit(100, "Saved")
+            self.saved.emit(self._path)
+        else:
+            self.failed.emit(self._error)
+
+    def stop(self):
+        """
+        Cancel the task and wait for the worker to finish.
+
+        Called before the owner of the task is closed, since a running
+        thread cannot be destroyed.
+
+        :rtype: None
+        """
+        if self.isRunning():
+            self.cancel()
+            self.wait()
+            self.cleanup()
+
+    def cleanup(self):
+        """
+        Remove the staging folder if it was not moved into place.
+
+        :rtype: None
+        """
+        if os.path.exists(self._stagingPath):
+            shutil.rmtree(self._stagingPath, ignore_errors=True)
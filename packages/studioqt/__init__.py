@@ -18,13 +18,14 @@ from studioqt.icon import Icon
 from studioqt.menu import Menu
 from studioqt.theme import Theme, ThemesMenu
 from studioqt.color import Color
-from studioqt.pixmap import Pixmap
+from studioqt.pixmap import Pixmap, coloredPixmap
 from studioqt.resource import Resource, RESOURCE_DIRNAME
 from studioqt.stylesheet import StyleSheet
 
 from studioqt.decorators import showWaitCursor
 from studioqt.decorators import showArrowCursor
 
+from studioqt.atlas import Atlas, packAtlas
 from studioqt.imagesequence import ImageSequence
 from studioqt.imagesequence import ImageSequenceWidget
 
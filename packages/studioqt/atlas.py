@@ -0,0 +1,363 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+Pack the frames of an image sequence into a single atlas image.
+
+An image sequence is a folder of many small images. Reading them one at
+a time from a network share is slow, so the frames can be packed into a
+grid in one downscaled image next to the folder, with a small index:
+
+    wave.anim/sequence/thumbnail.0001.jpg ...
+    wave.anim/sequence.atlas.jpg
+    wave.anim/sequence.atlas.json
+
+The atlas is decoded by Qt straight from the file and the frames are cut
+out of the decoded image. The index keeps the newest modified time of the
+sequence folder and its frames, so an atlas is ignored once the frames
+have changed. The image and the index are written to temp files and
+renamed into place with studiolibrary.replaceFile.
+
+Example:
+    import studioqt
+
+    studioqt.packAtlas("/library/wave.anim/sequence")
+
+    atlas = studioqt.Atlas.fromSequence("/library/wave.anim/sequence")
+    image = atlas.frame(0)
+"""
+import os
+import json
+import math
+import uuid
+import logging
+import threading
+
+from studioqt import QtGui
+from studioqt import QtCore
+
+
+__all__ = [
+    "Atlas",
+    "packAtlas",
+    "atlasIndexPath",
+]
+
+logger = logging.getLogger(__name__)
+
+
+ATLAS_VERSION = 2
+
+# The maximum width and height of each frame in the atlas
+ATLAS_FRAME_SIZE = 250
+ATLAS_QUALITY = 85
+
+IMAGE_EXTENSION = ".atlas.jpg"
+INDEX_EXTENSION = ".atlas.json"
+
+
+def atlasIndexPath(dirname):
+    """
+    Return the index path of the atlas for the given sequence folder.
+
+    :type dirname: str
+    :rtype: str
+    """
+    return dirname.rstrip("/\\") + INDEX_EXTENSION
+
+
+def atlasImagePath(dirname):
+    """
+    Return the image path of the atlas for the given sequence folder.
+
+    :type dirname: str
+    :rtype: str
+    """
+    return dirname.rstrip("/\\") + IMAGE_EXTENSION
+
+
+def sourceMtime(dirname, frames):
+    """
+    Return the newest modified time of the given folder and frames.
+
+    :type dirname: str
+    :type frames: list[str]
+    :rtype: float or None
+    """
+    try:
+        return max([os.path.getmtime(dirname)] + [os.path.getmtime(path) for path in frames])
+    except OSError:
+        return None
+
+
+def tempPath(path):
+    """
+    Return a unique temp path next to the given path.
+
+    The extension is kept so that Qt can save the image in its format.
+
+    :type path: str
+    :rtype: str
+    """
+    dirname, basename = os.path.split(path)
+    return os.path.join(dirname, ".{0}.{1}".format(uuid.uuid4().hex, basename))
+
+
+def readScaledFrame(path, frameSize, size=None):
+    """
+    Return the given frame scaled while it is decoded.
+
+    The first frame is scaled to fit the frame size and the other frames
+    are scaled to the size of the first frame.
+
+    :type path: str
+    :type frameSize: int
+    :type size: QtCore.QSize or None
+    :rtype: QtGui.QImage
+    """
+    reader = QtGui.QImageReader(path)
+
+    if size is None:
+        size = reader.size()
+
+        if size.isValid() and (size.width() > frameSize or size.height() > frameSize):
+            size.scale(frameSize, frameSize, QtCore.Qt.KeepAspectRatio)
+
+    if size.isValid():
+        reader.setScaledSize(size)
+
+    return reader.read()
+
+
+def packAtlas(dirname, frames=None, frameSize=ATLAS_FRAME_SIZE, quality=ATLAS_QUALITY):
+    """
+    Pack the frames in the given sequence folder into an atlas.
+
+    Return the paths of the atlas image and index, or an empty list if
+    there are no frames.
+
+    :type dirname: str
+    :type frames: list[str] or None
+    :type frameSize: int
+    :type quality: int
+    :rtype: list[str]
+    """
+    from studioqt.imagesequence import listFrames
+
+    # The studio library imports studioqt, so it is imported when packing
+    import studiolibrary
+
+    frames = frames or listFrames(dirname)
+
+    # Taken before reading, so a frame that changes while packing makes
+    # the atlas stale
+    mtime = sourceMtime(dirname, frames)
+
+    size = None
+    images = []
+
+    for path in frames:
+        image = readScaledFrame(path, frameSize, size)
+        if image.isNull():
+            continue
+
+        if size is None:
+            size = image.size()
+
+        images.append((os.path.basename(path), image))
+
+    if not images:
+        return []
+
+    width = size.width()
+    height = size.height()
+    columns = int(math.ceil(math.sqrt(len(images))))
+    rows = int(math.ceil(float(len(images)) / columns))
+
+    atlas = QtGui.QImage(columns * width, rows * height, QtGui.QImage.Format_RGB32)
+    atlas.fill(0)
+
+    painter = QtGui.QPainter(atlas)
+
+    try:
+        for i, (name, image) in enumerate(images):
+            x = (i % columns) * width
+            y = (i // columns) * height
+            painter.drawImage(x, y, image)
+    finally:
+        painter.end()
+
+    imagePath = atlasImagePath(dirname)
+    indexPath = atlasIndexPath(dirname)
+
+    data = {
+        "version": ATLAS_VERSION,
+        "image": os.path.basename(imagePath),
+        "mtime": mtime,
+        "frameWidth": width,
+        "frameHeight": height,
+        "columns": columns,
+        "frames": [name for name, image in images],
+    }
+
+    paths = [tempPath(imagePath), tempPath(indexPath)]
+
+    try:
+        if not atlas.save(paths[0], "JPG", quality):
+            raise IOError("Cannot save the atlas image {0}".format(imagePath))
+
+        with open(paths[1], "w") as f:
+            json.dump(data, f, indent=4)
+
+        # Each file is replaced in a single step, so a reader never
+        # sees a partially written image or index
+        studiolibrary.replaceFile(paths[0], imagePath)
+        studiolibrary.replaceFile(paths[1], indexPath)
+
+    finally:
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    logger.debug("Packed %d frames into %s", len(images), imagePath)
+
+    return [imagePath, indexPath]
+
+
+class Atlas(object):
+
+    @classmethod
+    def fromSequence(cls, dirname):
+        """
+        Return the atlas for the given sequence folder or None.
+
+        :type dirname: str
+        :rtype: Atlas or None
+        """
+        path = atlasIndexPath(dirname)
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            return cls(path)
+        except (IOError, ValueError, KeyError) as error:
+            logger.warning("Cannot read the atlas %s: %s", path, error)
+            return None
+
+    def __init__(self, path):
+        """
+        :type path: str
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        self._path = path
+        self._imagePath = os.path.join(os.path.dirname(path), data["image"])
+        self._frameWidth = data["frameWidth"]
+        self._frameHeight = data["frameHeight"]
+        self._columns = data["columns"]
+        self._frames = data["frames"]
+        self._mtime = data.get("mtime")
+
+        self._image = None
+        self._lock = threading.Lock()
+
+    def path(self):
+        """
+        :rtype: str
+        """
+        return self._path
+
+    def frames(self):
+        """
+        Return the file names of the packed frames.
+
+        :rtype: list[str]
+        """
+        return self._frames
+
+    def frameCount(self):
+        """
+        :rtype: int
+        """
+        return len(self._frames)
+
+    def isStale(self, dirname, frames):
+        """
+        Return True if the given frames have changed since the atlas was packed.
+
+        :type dirname: str
+        :type frames: list[str]
+        :rtype: bool
+        """
+        if self.frameCount() != len(frames):
+            return True
+
+        mtime = sourceMtime(dirname, frames)
+
+        return self._mtime is None or mtime is None or mtime > self._mtime
+
+    def frameSize(self):
+        """
+        :rtype: QtCore.QSize
+        """
+        return QtCore.QSize(self._frameWidth, self._frameHeight)
+
+    def image(self):
+        """
+        Return the decoded atlas image, reading it on first use.
+
+        :rtype: QtGui.QImage
+        """
+        with self._lock:
+            if self._image is None:
+                self._image = self._read()
+            return self._image
+
+    def _read(self):
+        """
+        Read and decode the atlas image.
+
+        Qt reads the file itself, so the contents are never copied into
+        a Python string first.
+
+        :rtype: QtGui.QImage
+        """
+        reader = QtGui.QImageReader(self._imagePath)
+        image = reader.read()
+
+        if image.isNull():
+            logger.warning("Cannot read the atlas image %s: %s", self._imagePath, reader.errorString())
+
+        return image
+
+    def frame(self, index):
+        """
+        Return the image for the given frame index.
+
+        :type index: int
+        :rtype: QtGui.QImage
+        """
+        x = (index % self._columns) * self._frameWidth
+        y = (index // self._columns) * self._frameHeight
+
+        return self.image().copy(x, y, self._frameWidth, self._frameHeight)
+
+    def release(self):
+        """
+        Release the decoded atlas image.
+
+        :rtype: None
+        """
+        with self._lock:
+            self._image = None
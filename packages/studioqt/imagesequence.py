@@ -13,13 +13,280 @@
 
 import re
 import os
+import threading
 
 from studioqt import QtGui
 from studioqt import QtCore
 from studioqt import QtWidgets
 
+from studioqt.atlas import Atlas
 
-__all__ = ['ImageSequence', 'ImageSequenceWidget']
+
+__all__ = ['ImageSequence', 'ImageSequenceWidget', 'FrameDecoder', 'listFrames']
+
+
+# The maximum number of bytes of decoded frames for each sequence
+MAX_BUFFER_SIZE = 32 * 1024 * 1024
+
+
+# {dirname: (mtime, frames)}
+_frameLists = {}
+
+# The decoders that were stopped and have not finished yet
+_stoppedDecoders = set()
+
+
+def listFrames(dirname):
+    """
+    Return the naturally sorted frames in the given folder.
+
+    The folder is only listed again when its modified time has changed.
+
+    :type dirname: str
+    :rtype: list[str]
+    """
+    try:
+        mtime = os.path.getmtime(dirname)
+    except OSError:
+        return []
+
+    cached = _frameLists.get(dirname)
+    if cached and cached[0] == mtime:
+        return list(cached[1])
+
+    def naturalSortItems(items):
+        """
+        Sort the given list in the way that humans expect.
+        """
+        convert = lambda text: int(text) if text.isdigit() else text
+        alphanum_key = lambda key: [convert(c) for c in re.split('([0-9]+)', key)]
+        items.sort(key=alphanum_key)
+
+    frames = [dirname + "/" + filename for filename in os.listdir(dirname)]
+    naturalSortItems(frames)
+
+    _frameLists[dirname] = (mtime, frames)
+
+    return list(frames)
+
+
+def readFrame(path, size=None, atlas=None, index=0):
+    """
+    Return the given frame decoded and scaled to fit the given size.
+
+    The frame is cut out of the atlas when one is given.
+
+    :type path: str
+    :type size: QtCore.QSize or None
+    :type atlas: Atlas or None
+    :type index: int
+    :rtype: QtGui.QImage
+    """
+    if atlas is not None:
+        image = atlas.frame(index)
+    else:
+        image = QtGui.QImage(path)
+
+    if size and not image.isNull():
+        image = image.scaled(
+            size,
+            QtCore.Qt.KeepAspectRatio,
+            QtCore.Qt.SmoothTransformation,
+        )
+
+    return image
+
+
+class FrameDecoder(QtCore.QThread):
+
+    """
+    Decode the frames ahead of the playhead in a worker thread.
+
+    The decoded frames are scaled to the display size and kept in a ring
+    around the playhead. When the buffer is over the byte limit, the
+    frames furthest from the playhead in the playing direction are
+    removed first.
+
+    The atlas is owned by the decoder and is released by the worker when
+    it has finished, together with the decoded frames.
+    """
+
+    def __init__(self, frames, size=None, maxSize=MAX_BUFFER_SIZE, atlas=None, parent=None):
+        """
+        :type frames: list[str]
+        :type size: QtCore.QSize or None
+        :type maxSize: int
+        :type atlas: Atlas or None
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QThread.__init__(self, parent)
+
+        self._frames = frames
+        self._size = size
+        self._atlas = atlas
+        self._maxSize = maxSize
+
+        self._images = {}
+        self._bufferSize = 0
+        self._current = 0
+        self._stopped = False
+        self._condition = threading.Condition()
+
+        self.finished.connect(self._finished)
+
+    def distance(self, frame):
+        """
+        Return how many frames the given frame is ahead of the playhead.
+
+        :type frame: int
+        :rtype: int
+        """
+        return (frame - self._current) % len(self._frames)
+
+    def decode(self, frame):
+        """
+        Return the given frame decoded and scaled to the display size.
+
+        :type frame: int
+        :rtype: QtGui.QImage
+        """
+        return readFrame(self._frames[frame], self._size, self._atlas, frame)
+
+    def image(self, frame):
+        """
+        Return the given frame from the buffer or decode it now.
+
+        :type frame: int
+        :rtype: QtGui.QImage
+        """
+        with self._condition:
+            image = self._images.get(frame)
+
+        if image is None:
+            image = self.decode(frame)
+            self._addImage(frame, image)
+
+        return image
+
+    def setCurrentFrame(self, frame):
+        """
+        Move the playhead and wake the worker to decode ahead of it.
+
+        :type frame: int
+        :rtype: None
+        """
+        with self._condition:
+            self._current = frame
+            self._condition.notify()
+
+    def _addImage(self, frame, image):
+        """
+        Add the given image to the buffer if it fits.
+
+        Return False if the buffer is full of frames nearer the playhead.
+
+        :type frame: int
+        :type image: QtGui.QImage
+        :rtype: bool
+        """
+        size = image.width() * image.height() * 4
+
+        with self._condition:
+            if frame in self._images:
+                return True
+
+            distance = self.distance(frame)
+
+            while self._bufferSize + size > self._maxSize and self._images:
+                furthest = max(self._images, key=self.distance)
+
+                if self.distance(furthest) <= distance:
+                    return False
+
+                removed = self._images.pop(furthest)
+                self._bufferSize -= removed.width() * removed.height() * 4
+
+            self._images[frame] = image
+            self._bufferSize += size
+
+        return True
+
+    def _nextFrame(self):
+        """
+        Return the nearest frame ahead of the playhead that is not decoded.
+
+        Must be called with the lock held.
+
+        :rtype: int or None
+        """
+        count = len(self._frames)
+
+        for i in range(count):
+            frame = (self._current + i) % count
+            if frame not in self._images:
+                return frame
+
+        return None
+
+    def run(self):
+        """
+        The starting point for the thread.
+
+        :rtype: None
+        """
+        full = False
+
+        while True:
+            with self._condition:
+                frame = None if full else self._nextFrame()
+
+                while frame is None and not self._stopped:
+                    self._condition.wait()
+                    frame = self._nextFrame()
+
+                if self._stopped:
+                    self._images = {}
+                    self._bufferSize = 0
+                    break
+
+                current = self._current
+
+            image = self.decode(frame)
+            added = self._addImage(frame, image)
+
+            # Wait for the playhead to move before decoding more
+            with self._condition:
+                full = not added and current == self._current
+
+        if self._atlas is not None:
+            self._atlas.release()
+
+    def stop(self):
+        """
+        Stop the worker without waiting for it to finish.
+
+        The worker finishes the frame it is decoding and then releases
+        the decoded frames. The decoder is kept until then, since a
+        running thread cannot be destroyed.
+
+        :rtype: None
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+        _stoppedDecoders.add(self)
+
+        if self.isFinished():
+            _stoppedDecoders.discard(self)
+
+    def _finished(self):
+        """
+        Triggered in the main thread when the worker has finished.
+
+        :rtype: None
+        """
+        _stoppedDecoders.discard(self)
 
 
 class ImageSequence(QtCore.QObject):
@@ -37,6 +304,12 @@ class ImageSequence(QtCore.QObject):
         self._frames = []
         self._dirname = None
         self._paused = False
+        self._size = None
+        self._atlas = None
+        self._decoder = None
+
+        # The last frame that was shown as (frame, QtGui.QPixmap)
+        self._pixmap = None
 
         if path:
             self.setDirname(path)
@@ -48,18 +321,72 @@ class ImageSequence(QtCore.QObject):
         :type dirname: str
         :rtype: None
         """
-        def naturalSortItems(items):
-            """
-            Sort the given list in the way that humans expect.
-            """
-            convert = lambda text: int(text) if text.isdigit() else text
-            alphanum_key = lambda key: [convert(c) for c in re.split('([0-9]+)', key)]
-            items.sort(key=alphanum_key)
+        self.stopDecoder()
 
+        self._pixmap = None
         self._dirname = dirname
+        self._atlas = Atlas.fromSequence(dirname)
+
         if os.path.isdir(dirname):
-            self._frames = [dirname + "/" + filename for filename in os.listdir(dirname)]
-            naturalSortItems(self._frames)
+            self._frames = listFrames(dirname)
+
+            # Ignore an atlas that was packed before the frames changed
+            if self._atlas and self._atlas.isStale(dirname, self._frames):
+                self._atlas = None
+
+        elif self._atlas:
+            self._frames = [dirname + "/" + name for name in self._atlas.frames()]
+
+    def atlas(self):
+        """
+        Return the atlas the frames are read from.
+
+        :rtype: Atlas or None
+        """
+        return self._atlas
+
+    def setSize(self, size):
+        """
+        Set the size the frames are decoded to for display.
+
+        :type size: QtCore.QSize
+        :rtype: None
+        """
+        if size != self._size:
+            self.stopDecoder()
+            self._pixmap = None
+            self._size = QtCore.QSize(size)
+
+    def decoder(self):
+        """
+        Return the worker that decodes the frames while playing.
+
+        The worker is created when the sequence starts playing and is
+        stopped when it is paused or stopped.
+
+        :rtype: FrameDecoder or None
+        """
+        if self._decoder is None and self._frames:
+            # The decoder releases its own atlas when it has finished
+            atlas = None
+            if self._atlas is not None:
+                atlas = Atlas.fromSequence(self._dirname)
+
+            self._decoder = FrameDecoder(self._frames, size=self._size, atlas=atlas)
+            self._decoder.setCurrentFrame(self._frame)
+            self._decoder.start()
+
+        return self._decoder
+
+    def stopDecoder(self):
+        """
+        Stop the decoding worker without waiting for it.
+
+        :rtype: None
+        """
+        if self._decoder is not None:
+            self._decoder.stop()
+            self._decoder = None
 
     def dirname(self):
         """
@@ -92,6 +419,7 @@ class ImageSequence(QtCore.QObject):
         """
         self._paused = True
         self._timer.stop()
+        self.stopDecoder()
 
     def resume(self):
         """
@@ -101,15 +429,21 @@ class ImageSequence(QtCore.QObject):
         """
         if self._paused:
             self._paused = False
+            self.decoder()
             self._timer.start()
 
     def stop(self):
         """
         Stops the movie. ImageSequence enters NotRunning state.
 
+        The decoded frames are released.
+
         :rtype: None
         """
-        self._timer.stop()
+        if self._timer:
+            self._timer.stop()
+
+        self.stopDecoder()
 
     def start(self):
         """
@@ -118,6 +452,7 @@ class ImageSequence(QtCore.QObject):
         :rtype: None
         """
         self.reset()
+        self.decoder()
         if self._timer:
             self._timer.start(1000.0 / self._fps)
 
@@ -168,15 +503,40 @@ class ImageSequence(QtCore.QObject):
 
         :rtype: QtGui.QIcon
         """
-        return QtGui.QIcon(self.currentFilename())
+        return QtGui.QIcon(self.currentPixmap())
 
     def currentPixmap(self):
         """
         Return the current frame as a QPixmap.
 
+        While playing the frame is taken from the decoder buffer. When
+        not playing the last shown frame is kept, so the atlas is only
+        decoded again when the frame changes.
+
         :rtype: QtGui.QPixmap
         """
-        return QtGui.QPixmap(self.currentFilename())
+        filename = self.currentFilename()
+
+        if filename is None:
+            return QtGui.QPixmap()
+
+        if self._decoder is not None:
+            image = self._decoder.image(self._frame)
+
+        elif self._pixmap and self._pixmap[0] == self._frame:
+            return self._pixmap[1]
+
+        else:
+            image = readFrame(filename, self._size, self._atlas, self._frame)
+
+            # Only keep the decoded atlas while playing
+            if self._atlas is not None:
+                self._atlas.release()
+
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self._pixmap = (self._frame, pixmap)
+
+        return pixmap
 
     def currentFilename(self):
         """
@@ -206,6 +566,10 @@ class ImageSequence(QtCore.QObject):
         if frame >= self.frameCount():
             frame = 0
         self._frame = frame
+
+        if self._decoder is not None:
+            self._decoder.setCurrentFrame(frame)
+
         self.frameChanged.emit(frame)
 
 
@@ -241,6 +605,7 @@ class ImageSequenceWidget(QtWidgets.QToolButton):
         self._size = QtCore.QSize(w, h)
         self.setIconSize(self._size)
         self.setFixedSize(self._size)
+        self._imageSequence.setSize(self._size)
 
     def setDirname(self, dirname):
         """
@@ -254,6 +619,14 @@ class ImageSequenceWidget(QtWidgets.QToolButton):
             icon = self._imageSequence.currentIcon()
             self.setIcon(icon)
 
+    def frames(self):
+        """
+        Return all the filenames in the image sequence.
+
+        :rtype: list[str]
+        """
+        return self._imageSequence.frames()
+
     def enterEvent(self, event):
         """
         Start playing the image sequence when the mouse enters the widget.
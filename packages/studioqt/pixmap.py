@@ -11,12 +11,80 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
+import collections
+
 from studioqt import QtGui
+from studioqt import QtCore
 from studioqt import QtWidgets
 
 import studioqt
 
 
+# The maximum number of recoloured pixmaps to keep
+MAX_COLORED_PIXMAPS = 256
+
+# {(path, color, size): QtGui.QPixmap}
+_coloredPixmaps = collections.OrderedDict()
+
+
+def colorKey(color):
+    """
+    Return a hashable key for the given color.
+
+    :type color: QtGui.QColor or str
+    :rtype: str
+    """
+    if isinstance(color, basestring):
+        return color
+
+    return studioqt.Color.fromColor(color).toString()
+
+
+def coloredPixmap(path, color, size=None):
+    """
+    Return a recoloured pixmap for the given path from the cache.
+
+    Painting a new pixmap for every icon is slow when many icons of the
+    same colour are shown, so the pixmaps are kept by path, colour and
+    size. The returned pixmap shares its data with the cached one.
+
+    :type path: str
+    :type color: QtGui.QColor or str
+    :type size: QtCore.QSize or None
+    :rtype: Pixmap
+    """
+    sizeKey = (size.width(), size.height()) if size else None
+    key = (path, colorKey(color), sizeKey)
+
+    pixmap = _coloredPixmaps.pop(key, None)
+
+    if pixmap is None:
+        pixmap = Pixmap(path)
+
+        if size and not pixmap.isNull():
+            pixmap = Pixmap(pixmap.scaled(
+                size,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            ))
+
+        pixmap.setColor(color)
+
+    _coloredPixmaps[key] = pixmap
+
+    while len(_coloredPixmaps) > MAX_COLORED_PIXMAPS:
+        _coloredPixmaps.popitem(last=False)
+
+    return Pixmap(pixmap)
+
+
+def clearColoredPixmapCache():
+    """
+    :rtype: None
+    """
+    _coloredPixmaps.clear()
+
+
 class Pixmap(QtGui.QPixmap):
 
     def __init__(self, *args):
@@ -15,6 +15,7 @@ import os
 
 from studioqt import QtGui
 from studioqt import Pixmap
+from studioqt.pixmap import coloredPixmap
 
 
 PATH = os.path.abspath(__file__)
@@ -98,9 +99,8 @@ class Resource(object):
         :rtype: QtWidgets.QPixmap
         """
         path = self.get(scope, name + "." + extension)
-        p = Pixmap(path)
 
         if color:
-            p.setColor(color)
+            return coloredPixmap(path, color)
 
-        return p
+        return Pixmap(path)
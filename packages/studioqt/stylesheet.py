@@ -11,12 +11,163 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
+"""
+The style sheets are templates with placeholders for the theme options
+and DPI expressions, for example:
+
+    background-color: BACKGROUND_COLOR;
+    padding: 4*DPI;
+
+The template is parsed once into a list of tokens and each render only
+joins the tokens for the given options and dpi. The rendered style
+sheets are memoised, since the same template is rendered again every
+time the theme or the dpi changes.
+"""
 import os
 import re
+import threading
+import collections
 
 import studioqt
 
 
+# The maximum number of compiled templates and rendered style sheets
+MAX_CACHED_STYLESHEETS = 32
+
+DPI_EXPRESSION = re.compile("([0-9]+)[*]DPI")
+
+
+_lock = threading.Lock()
+
+# {(data, keys): StyleSheetTemplate}
+_templates = collections.OrderedDict()
+
+# {(data, options, dpi): str}
+_rendered = collections.OrderedDict()
+
+
+def _cached(cache, key, func):
+    """
+    Return the value for the key from the given LRU cache.
+
+    :type cache: collections.OrderedDict
+    :type key: tuple
+    :type func: func
+    :rtype: object
+    """
+    with _lock:
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+            return value
+
+    value = func()
+
+    with _lock:
+        cache[key] = value
+        while len(cache) > MAX_CACHED_STYLESHEETS:
+            cache.popitem(last=False)
+
+    return value
+
+
+def formatDpi(text, dpi):
+    """
+    Replace the DPI expressions in the given text with their values.
+
+    :type text: str
+    :type dpi: float
+    :rtype: str
+    """
+    return DPI_EXPRESSION.sub(lambda m: str(int(int(m.group(1)) * dpi)), text)
+
+
+def clearStyleSheetCache():
+    """
+    Clear the compiled templates and the rendered style sheets.
+
+    :rtype: None
+    """
+    with _lock:
+        _templates.clear()
+        _rendered.clear()
+
+
+class StyleSheetTemplate(object):
+
+    @classmethod
+    def fromText(cls, text, keys=None):
+        """
+        Return the compiled template for the given text from the cache.
+
+        :type text: str
+        :type keys: list[str] or None
+        :rtype: StyleSheetTemplate
+        """
+        keys = tuple(sorted(keys or []))
+        return _cached(_templates, (text, keys), lambda: cls(text, keys))
+
+    def __init__(self, text, keys=None):
+        """
+        :type text: str
+        :type keys: list[str] or None
+        """
+        # Match the longest keys first, so that "ACCENT_COLOR_R" is
+        # not replaced as "ACCENT_COLOR" followed by "_R".
+        keys = sorted(keys or [], key=len, reverse=True)
+        patterns = [re.escape(key) for key in keys]
+        patterns.append(DPI_EXPRESSION.pattern)
+
+        self._tokens = []
+        index = 0
+
+        for match in re.finditer("|".join(patterns), text):
+            if match.start() > index:
+                self._tokens.append((None, text[index:match.start()]))
+
+            value = match.group()
+
+            if match.group(1) is not None:
+                self._tokens.append(("dpi", int(match.group(1))))
+            else:
+                self._tokens.append(("key", value))
+
+            index = match.end()
+
+        if index < len(text):
+            self._tokens.append((None, text[index:]))
+
+    def tokens(self):
+        """
+        Return the literal text, placeholder and DPI expression tokens.
+
+        :rtype: list[(str or None, str or int)]
+        """
+        return self._tokens
+
+    def render(self, options=None, dpi=1):
+        """
+        Return the text for the given options and dpi.
+
+        :type options: dict or None
+        :type dpi: float
+        :rtype: str
+        """
+        options = options or {}
+        parts = []
+
+        for kind, value in self._tokens:
+            if kind is None:
+                parts.append(value)
+            elif kind == "dpi":
+                parts.append(str(int(value * dpi)))
+            else:
+                # The option values can also contain DPI expressions
+                parts.append(formatDpi(options[value], dpi))
+
+        return "".join(parts)
+
+
 class StyleSheet(object):
 
     @classmethod
@@ -74,28 +225,20 @@ class StyleSheet(object):
     @staticmethod
     def format(data=None, options=None, dpi=1):
         """
-        :type data:
+        Return the given template with the options and dpi applied.
+
+        The template is compiled once and the result is memoised.
+
+        :type data: str
         :type options: dict
+        :type dpi: float
         :rtype: str
         """
-        if options is not None:
-            keys = options.keys()
-            keys.sort(key=len, reverse=True)
-            for key in keys:
-                data = data.replace(key, options[key])
-
-        reDpi = re.compile("[0-9]+[*]DPI")
-        newData = []
+        options = options or {}
+        key = (data, tuple(sorted(options.items())), dpi)
 
-        for line in data.split("\n"):
-            dpi_ = reDpi.search(line)
+        def render():
+            template = StyleSheetTemplate.fromText(data, options.keys())
+            return template.render(options, dpi)
 
-            if dpi_:
-                new = dpi_.group().replace("DPI", str(dpi))
-                val = int(eval(new))
-                line = line.replace(dpi_.group(), str(val))
-
-            newData.append(line)
-
-        data = "\n".join(newData)
-        return data
+        return _cached(_rendered, key, render)
@@ -748,6 +748,18 @@ class CombinedWidget(QtWidgets.QWidget):
         for item in items:
             item.updateData()
 
+    def removeItems(self, items):
+        """
+        Remove the given items from the combined widget.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        for item in items:
+            row = self._treeWidget.indexOfTopLevelItem(item)
+            if row >= 0:
+                self._treeWidget.takeTopLevelItem(row)
+
     def addItem(self, item):
         """
         Add the item to the tree widget.
@@ -58,6 +58,7 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
     combined widget.
     """
     MAX_ICON_SIZE = 256
+    MAX_CACHED_MOVIE_SIZE = 4 * 1024 * 1024
 
     DEFAULT_FONT_SIZE = 13
     DEFAULT_PLAYHEAD_COLOR = QtGui.QColor(255, 255, 255, 220)
@@ -1228,6 +1229,8 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
                     self.updateFrame()
 
     def resetImageSequence(self):
+        if isinstance(self._imageSequence, studioqt.ImageSequence):
+            self._imageSequence.stop()
         self._imageSequence = None
 
     def imageSequence(self):
@@ -1274,15 +1277,24 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         if os.path.isfile(path) and path.lower().endswith(".gif"):
 
             movie = QtGui.QMovie(path)
-            movie.setCacheMode(QtGui.QMovie.CacheAll)
             movie.frameChanged.connect(self._frameChanged)
 
-        elif os.path.isdir(path):
+            # Only keep every frame of small movies so that scrubbing
+            # large movies does not hold all the decoded frames
+            if os.path.getsize(path) <= self.MAX_CACHED_MOVIE_SIZE:
+                movie.setCacheMode(QtGui.QMovie.CacheAll)
+            else:
+                movie.setCacheMode(QtGui.QMovie.CacheNone)
+
+        elif os.path.isdir(path) or os.path.exists(studioqt.atlas.atlasIndexPath(path)):
 
             if not self.imageSequence():
                 movie = studioqt.ImageSequence(path)
                 movie.frameChanged.connect(self._frameChanged)
 
+                if self.rect():
+                    movie.setSize(self.rect().size())
+
         if movie:
             self.setImageSequence(movie)
             self.imageSequence().start()
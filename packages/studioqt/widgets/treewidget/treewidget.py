@@ -10,6 +10,8 @@
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import threading
+from functools import partial
 
 from studioqt import QtGui
 from studioqt import QtCore
@@ -64,6 +66,50 @@ def pathsToDict(paths, root="", split=None):
     return results
 
 
+class ChildLoaderThread(QtCore.QThread):
+    """
+    Call the child loader for the given paths without blocking the tree.
+    """
+    loaded = QtCore.Signal(object, object)
+
+    def __init__(self, loader, paths, parent=None):
+        """
+        :type loader: func
+        :type paths: list[str]
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QThread.__init__(self, parent)
+
+        self._paths = paths
+        self._loader = loader
+        self._canceled = threading.Event()
+
+    def cancel(self):
+        """
+        Skip the paths that have not been loaded yet.
+
+        :rtype: None
+        """
+        self._canceled.set()
+
+    def run(self):
+        """
+        :rtype: None
+        """
+        for path in self._paths:
+            if self._canceled.is_set():
+                return
+
+            try:
+                paths = self._loader(path)
+            except Exception as error:
+                logger.debug("Cannot load the children of %s: %s", path, error)
+                continue
+
+            # Only the results are sent back and Qt queues them to the tree
+            self.loaded.emit(path, paths)
+
+
 class TreeWidget(QtWidgets.QTreeWidget):
 
     itemDropped = QtCore.Signal(object)
@@ -75,8 +121,14 @@ class TreeWidget(QtWidgets.QTreeWidget):
 
         self._dpi = 1
         self._items = []
+        self._split = SPLIT_TOKEN
         self._locked = False
+        self._pathSettings = {}
+        self._childLoader = None
+        self._prefetchItems = {}
+        self._loaderThreads = []
 
+        self.itemExpanded.connect(self._itemExpanded)
         self.itemExpanded.connect(self.update)
         self.itemCollapsed.connect(self.update)
 
@@ -215,6 +267,9 @@ class TreeWidget(QtWidgets.QTreeWidget):
         """
         Return the item for the given path.
 
+        The parent items are populated when the item has not been
+        created yet.
+
         :type path: str
         :rtype: NavigationWidgetItem
         """
@@ -222,13 +277,205 @@ class TreeWidget(QtWidgets.QTreeWidget):
             if path == item.path():
                 return item
 
+        return self.populatePath(path)
+
+    def populatePath(self, path):
+        """
+        Create the items down to the given path and return its item.
+
+        :type path: str
+        :rtype: TreeWidgetItem or None
+        """
+        if not path:
+            return None
+
+        items = [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+
+        while items:
+            for item in items:
+                if item.path() == path:
+                    return item
+
+                if path.startswith(item.path() + self._split):
+                    self.populateItem(item)
+                    items = [item.child(i) for i in range(item.childCount())]
+                    break
+            else:
+                return None
+
+    def setChildLoader(self, func):
+        """
+        Set the function that returns the child paths of a path.
+
+        The function is called with the path of an item the first time its
+        children are needed. It returns a dict of the child paths and
+        their settings. It is also called from a worker thread to prefetch
+        the next level, so it must not create or change any widgets.
+
+        :type func: func or None
+        :rtype: None
+        """
+        self._childLoader = func
+
+    def loadItem(self, item, paths=None):
+        """
+        Create the child items returned by the child loader.
+
+        :type item: TreeWidgetItem
+        :type paths: dict or None
+        :rtype: None
+        """
+        item.setLoaded(True)
+
+        if paths is None:
+            paths = self._childLoader(item.path())
+
+        for path in sorted(paths):
+            settings = paths[path]
+
+            # The settings that have been saved take precedence
+            if settings:
+                settings = dict(settings)
+                settings.update(self._pathSettings.get(path, {}))
+                self._pathSettings[path] = settings
+
+            text = path.split(self._split)[-1]
+            self.createItem(text, path, None, parent=item)
+
+    def populateItem(self, item):
+        """
+        Create the child items that have not been created yet.
+
+        :type item: TreeWidgetItem
+        :rtype: None
+        """
+        if not item.isLoaded():
+            self.loadItem(item)
+
+        data = item.childData()
+        if not data:
+            return
+
+        item.setChildData(None)
+
+        for text, value in sorted(data.iteritems()):
+            path = self._split.join([item.path(), text])
+            self.createItem(text, path, value, parent=item)
+
+    def createItem(self, text, path, data, parent=None):
+        """
+        Create an item with the given data for its children.
+
+        :type text: str
+        :type path: str
+        :type data: dict
+        :type parent: TreeWidgetItem or None
+        :rtype: TreeWidgetItem
+        """
+        if parent is None:
+            item = TreeWidgetItem(self)
+        else:
+            item = TreeWidgetItem()
+            parent.addChild(item)
+
+        item.setText(0, unicode(text))
+        item.setPath(path)
+        item.setChildData(data)
+
+        if self._childLoader and not data:
+            item.setLoaded(False)
+
+        settings = self._pathSettings.pop(path, None)
+        if settings:
+            if settings.get("expanded"):
+                self.populateItem(item)
+            item.setSettings(settings)
+
+        item.update()
+
+        return item
+
+    def _itemExpanded(self, item):
+        """
+        Triggered when an item is expanded.
+
+        Creates the children of the item and then loads their children in
+        a worker thread, so the next level is ready before it is expanded.
+
+        :type item: TreeWidgetItem
+        :rtype: None
+        """
+        self.populateItem(item)
+
+        paths = []
+
+        for i in range(item.childCount()):
+            child = item.child(i)
+            if not child.isLoaded():
+                self._prefetchItems[child.path()] = child
+                paths.append(child.path())
+
+        if not paths:
+            return
+
+        thread = ChildLoaderThread(self._childLoader, paths, self)
+
+        thread.loaded.connect(self._childPathsLoaded, QtCore.Qt.QueuedConnection)
+        thread.finished.connect(partial(self._loaderThreadFinished, thread))
+
+        self._loaderThreads.append(thread)
+        thread.start()
+
+    def _childPathsLoaded(self, path, paths):
+        """
+        Triggered in the main thread when the children of a path are loaded.
+
+        :type path: str
+        :type paths: dict
+        :rtype: None
+        """
+        item = self._prefetchItems.pop(path, None)
+
+        try:
+            if item is not None and not item.isLoaded():
+                self.loadItem(item, paths)
+        except RuntimeError:
+            # The item has been deleted by clear()
+            pass
+
+    def _loaderThreadFinished(self, thread):
+        """
+        Triggered when a child loader thread has finished.
+
+        :type thread: ChildLoaderThread
+        :rtype: None
+        """
+        if thread in self._loaderThreads:
+            self._loaderThreads.remove(thread)
+        thread.deleteLater()
+
+    def clear(self):
+        """
+        Remove all the items.
+
+        :rtype: None
+        """
+        for thread in self._loaderThreads:
+            thread.cancel()
+
+        self._prefetchItems = {}
+        self._pathSettings = {}
+
+        QtWidgets.QTreeWidget.clear(self)
+
     def settings(self):
         """
         Return a dictionary of the settings for this widget.
 
         :rtype: dict
         """
-        settings = {}
+        # Keep the settings for the items that have not been created
+        settings = dict(self._pathSettings)
 
         scrollBar = self.verticalScrollBar()
         settings["verticalScrollBar"] = {
@@ -254,6 +501,9 @@ class TreeWidget(QtWidgets.QTreeWidget):
         :type settings: dict
         """
         for path in sorted(settings.keys()):
+            if path in ("verticalScrollBar", "horizontalScrollBar"):
+                continue
+
             s = settings.get(path, None)
             self.setPathSettings(path, s)
 
@@ -271,15 +521,40 @@ class TreeWidget(QtWidgets.QTreeWidget):
 
     def setPathSettings(self, path, settings):
         """
-        Show the context menu at the given position.
+        Set the settings for the item with the given path.
+
+        Items are only created for selected or expanded paths. The
+        settings for other paths are applied when their item is created.
 
         :type path: str
         :type settings: dict
         :rtype: None
         """
-        item = self.itemFromPath(path)
-        if item and settings:
+        if not settings:
+            return
+
+        if settings.get("selected") or settings.get("expanded"):
+            item = self.itemFromPath(path)
+        else:
+            item = self.findItem(path)
+
+        if item:
+            if settings.get("expanded"):
+                self.populateItem(item)
             item.setSettings(settings)
+        else:
+            self._pathSettings[path] = settings
+
+    def findItem(self, path):
+        """
+        Return the item for the given path if it has been created.
+
+        :type path: str
+        :rtype: TreeWidgetItem or None
+        """
+        for item in self.items():
+            if path == item.path():
+                return item
 
     def showContextMenu(self, position):
         """
@@ -369,6 +644,10 @@ class TreeWidget(QtWidgets.QTreeWidget):
         :rtype: None
         """
         paths = self.normPaths(paths)
+
+        for path in paths:
+            self.populatePath(path)
+
         items = self.items()
         for item in items:
             if item.path() in paths:
@@ -445,36 +724,18 @@ class TreeWidget(QtWidgets.QTreeWidget):
         """ 
         Create the items from the given data dict
 
+        Only the top level items are created. The children are created
+        when their parent is expanded, selected or given settings.
+
         :type data: dict
         :type split: str or None
 
         :rtype: None
         """
-        split = split or SPLIT_TOKEN
+        self._split = split or SPLIT_TOKEN
 
         for key in data:
-
-            path = split.join([key])
-
-            item = TreeWidgetItem(self)
-            item.setText(0, unicode(key))
-            item.setPath(path)
-
-            def _recursive(parent, children, split=None):
-                for text, val in sorted(children.iteritems()):
-
-                    path = parent.path()
-                    path = split.join([path, text])
-
-                    child = TreeWidgetItem()
-                    child.setText(0, unicode(text))
-                    child.setPath(path)
-
-                    parent.addChild(child)
-
-                    _recursive(child, val, split=split)
-
-            _recursive(item, data[key], split=split)
+            self.createItem(key, key, data[key])
 
         self.update()
 
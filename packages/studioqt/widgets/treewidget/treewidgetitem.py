@@ -38,6 +38,54 @@ class TreeWidgetItem(QtWidgets.QTreeWidgetItem):
         self._collapsedIconPath = None
 
         self._settings = {}
+        self._loaded = True
+        self._childData = None
+
+    def childData(self):
+        """
+        Return the data for the children that have not been created yet.
+
+        :rtype: dict or None
+        """
+        return self._childData
+
+    def setChildData(self, data):
+        """
+        Set the data for the children that are created on demand.
+
+        The expand indicator is shown when there is data for children.
+
+        :type data: dict or None
+        :rtype: None
+        """
+        self._childData = data or None
+
+        if self._childData or not self._loaded:
+            policy = QtWidgets.QTreeWidgetItem.ShowIndicator
+        else:
+            policy = QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless
+
+        self.setChildIndicatorPolicy(policy)
+
+    def isLoaded(self):
+        """
+        Return False if the children still need to be loaded by the tree.
+
+        :rtype: bool
+        """
+        return self._loaded
+
+    def setLoaded(self, loaded):
+        """
+        Set if the children have been loaded by the tree's child loader.
+
+        The expand indicator is shown until the children are loaded.
+
+        :type loaded: bool
+        :rtype: None
+        """
+        self._loaded = loaded
+        self.setChildData(self._childData)
 
     def iconPath(self):
         """
@@ -183,8 +231,7 @@ class TreeWidgetItem(QtWidgets.QTreeWidgetItem):
 
         color = self.iconColor()
 
-        pixmap = studioqt.Pixmap(path)
-        pixmap.setColor(color)
+        pixmap = studioqt.coloredPixmap(path, color)
 
         self.setIcon(0, pixmap)
 
@@ -316,7 +363,7 @@ class TreeWidgetItem(QtWidgets.QTreeWidgetItem):
         self.setSelected(isSelected)
 
         isExpanded = settings.get("expanded", False)
-        if self.childCount() > 0:
+        if self.childCount() > 0 or self.childData() or not self.isLoaded():
             self.setExpanded(isExpanded)
 
         bold = settings.get("bold", False)
@@ -0,0 +1,160 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+An in memory copy of a settings file that coalesces writes.
+
+The widgets save the settings on many small changes. The store
+keeps the changed keys and writes them together after a short delay.
+The file is only read again when its modified time has changed, for
+example when another session has saved it.
+
+Example:
+    store = SettingsStore("/tmp/settings.json")
+    store.update({"byFrame": 2})
+    print store.data()["byFrame"]
+    store.flush()
+"""
+import os
+import logging
+
+from studioqt import QtCore
+
+import studiolibrary
+
+
+__all__ = [
+    "SettingsStore",
+]
+
+logger = logging.getLogger(__name__)
+
+
+# The number of milliseconds to wait for more changes before writing
+SAVE_DELAY = 500
+
+
+class SettingsStore(QtCore.QObject):
+
+    def __init__(self, path, delay=SAVE_DELAY, parent=None):
+        """
+        :type path: str
+        :type delay: int
+        :type parent: QtCore.QObject or None
+        """
+        QtCore.QObject.__init__(self, parent)
+
+        self._path = path
+        self._data = None
+        self._mtime = None
+        self._pending = {}
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+    def path(self):
+        """
+        :rtype: str
+        """
+        return self._path
+
+    def mtime(self):
+        """
+        Return the modified time of the settings file.
+
+        :rtype: float or None
+        """
+        try:
+            return os.path.getmtime(self._path)
+        except OSError:
+            return None
+
+    def isDirty(self):
+        """
+        Return True if there are changes that have not been written.
+
+        :rtype: bool
+        """
+        return bool(self._pending)
+
+    def data(self):
+        """
+        Return the settings and read the file only if it has changed.
+
+        :rtype: dict
+        """
+        mtime = self.mtime()
+
+        if self._data is None or mtime != self._mtime:
+            logger.debug("Reading settings %s", self._path)
+
+            data = studiolibrary.readJson(self._path)
+            data.update(self._pending)
+
+            if self._data is None:
+                self._data = data
+            else:
+                # Keep the same dict so that callers holding it stay valid
+                self._data.clear()
+                self._data.update(data)
+
+            self._mtime = mtime
+
+        return self._data
+
+    def update(self, data):
+        """
+        Update the settings and write them after a short delay.
+
+        :type data: dict
+        :rtype: None
+        """
+        current = self.data()
+
+        for key, value in data.items():
+            self._pending[key] = value
+
+        if data is not current:
+            current.update(data)
+
+        self._timer.start()
+
+    def flush(self):
+        """
+        Write the changed settings to disc now.
+
+        :rtype: None
+        """
+        self._timer.stop()
+
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = {}
+
+        logger.debug("Saving settings %s", self._path)
+
+        # Merge with the file, which may contain changes from other sessions
+        with studiolibrary.FileLock(self._path):
+            data = studiolibrary.readJson(self._path)
+            data.update(pending)
+            studiolibrary.saveJson(self._path, data, profile="pretty")
+
+        if self._data is not None:
+            self._data.clear()
+            self._data.update(data)
+
+        # Keep the written data without reading the file again
+        self._mtime = self.mtime()
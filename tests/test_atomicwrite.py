@@ -0,0 +1,238 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+import studiolibrary.tests.test_atomicwrite
+reload(studiolibrary.tests.test_atomicwrite)
+studiolibrary.tests.test_atomicwrite.run()
+"""
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+import threading
+import multiprocessing
+
+import studiolibrary
+import studiolibrary.atomicwrite
+
+
+WRITER_COUNT = 8
+WRITE_COUNT = 25
+
+
+def writeMany(path, index):
+    """
+    Write the given path many times from a separate process.
+
+    :type path: str
+    :type index: int
+    :rtype: None
+    """
+    for i in range(WRITE_COUNT):
+        data = {"writer": index, "count": i, "values": [index] * 5000}
+        studiolibrary.write(path, json.dumps(data), relative=False)
+
+
+def updateMany(path, index):
+    """
+    Update a key for the given index many times from a separate process.
+
+    :type path: str
+    :type index: int
+    :rtype: None
+    """
+    key = "writer{0}".format(index)
+
+    for i in range(WRITE_COUNT):
+        studiolibrary.updateJson(path, {key: {"count": i + 1}})
+
+
+class TestAtomicWrite(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.dirname = studiolibrary.normPath(tempfile.mkdtemp())
+        self.path = self.dirname + "/pose.json"
+
+    def tearDown(self):
+        """
+        """
+        shutil.rmtree(self.dirname, ignore_errors=True)
+
+    def runProcesses(self, target):
+        """
+        Run the given target in WRITER_COUNT processes and wait for them.
+
+        :type target: func
+        :rtype: list[multiprocessing.Process]
+        """
+        processes = []
+
+        for i in range(WRITER_COUNT):
+            process = multiprocessing.Process(target=target, args=(self.path, i))
+            processes.append(process)
+            process.start()
+
+        return processes
+
+    def test_write(self):
+        """
+        Test the file is replaced and no temp or lock files are left.
+        """
+        with studiolibrary.atomicWrite(self.path) as f:
+            f.write("old")
+
+        with studiolibrary.atomicWrite(self.path) as f:
+            f.write("new")
+
+        with open(self.path, "r") as f:
+            self.assertEqual("new", f.read())
+
+        self.assertEqual(["pose.json"], os.listdir(self.dirname))
+
+    def test_discard(self):
+        """
+        Test a failed write leaves the existing file unchanged.
+        """
+        with studiolibrary.atomicWrite(self.path) as f:
+            f.write("old")
+
+        try:
+            with studiolibrary.atomicWrite(self.path) as f:
+                f.write("partial")
+                raise ValueError("Failed while writing")
+        except ValueError:
+            pass
+
+        with open(self.path, "r") as f:
+            self.assertEqual("old", f.read())
+
+        self.assertEqual(["pose.json"], os.listdir(self.dirname))
+
+    def test_lock_timeout(self):
+        """
+        Test a writer in another thread waits for the lock and then times out.
+        """
+        errors = []
+
+        def write():
+            try:
+                studiolibrary.atomicWrite(self.path, timeout=0.2).__enter__()
+            except studiolibrary.LockTimeoutError as error:
+                errors.append(error)
+
+        with studiolibrary.FileLock(self.path):
+            start = time.time()
+
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join()
+
+            self.assertGreaterEqual(time.time() - start, 0.2)
+
+        self.assertEqual(1, len(errors))
+
+    def test_nested_lock(self):
+        """
+        Test a thread that holds the lock can write the file.
+        """
+        with studiolibrary.FileLock(self.path) as lock:
+            studiolibrary.write(self.path, "new", relative=False)
+            self.assertTrue(lock.isLocked())
+
+        with open(self.path, "r") as f:
+            self.assertEqual("new", f.read())
+
+        self.assertEqual(["pose.json"], os.listdir(self.dirname))
+
+    @unittest.skipIf(studiolibrary.atomicwrite.fcntl is None, "Requires fcntl")
+    def test_crashed_writer(self):
+        """
+        Test a lock file left by a crashed writer does not block writes.
+        """
+        lockPath = studiolibrary.atomicwrite.lockPath(self.path)
+
+        with open(lockPath, "w") as f:
+            f.write("12345")
+
+        with studiolibrary.atomicWrite(self.path, timeout=1) as f:
+            f.write("new")
+
+        self.assertFalse(os.path.exists(lockPath))
+
+    @unittest.skipIf(os.name == "nt", "Requires fork")
+    def test_concurrent_writes(self):
+        """
+        Test many processes writing the file while reading it.
+        """
+        processes = self.runProcesses(writeMany)
+
+        reads = 0
+
+        while any(process.is_alive() for process in processes):
+            if os.path.exists(self.path):
+                data = studiolibrary.readJson(self.path, relative=False)
+                self.assertEqual([data["writer"]] * 5000, data["values"])
+                reads += 1
+
+        for process in processes:
+            process.join()
+            self.assertEqual(0, process.exitcode)
+
+        self.assertGreater(reads, 0)
+        self.assertEqual(["pose.json"], os.listdir(self.dirname))
+
+    @unittest.skipIf(os.name == "nt", "Requires fork")
+    def test_concurrent_updates(self):
+        """
+        Test no update is lost when many processes update the file.
+        """
+        studiolibrary.saveJson(self.path, {})
+
+        processes = self.runProcesses(updateMany)
+
+        for process in processes:
+            process.join()
+            self.assertEqual(0, process.exitcode)
+
+        data = studiolibrary.readJson(self.path)
+
+        for i in range(WRITER_COUNT):
+            key = "writer{0}".format(i)
+            self.assertEqual({"count": WRITE_COUNT}, data[key])
+
+        self.assertEqual(["pose.json"], os.listdir(self.dirname))
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestAtomicWrite, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,146 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+import studiolibrary.tests.test_blobstore
+reload(studiolibrary.tests.test_blobstore)
+studiolibrary.tests.test_blobstore.run()
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import studiolibrary.fileops
+
+
+class TestBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.root = studiolibrary.normPath(tempfile.mkdtemp())
+
+        for name in ["wave1.pose", "wave2.pose"]:
+            path = self.root + "/poses/" + name
+            os.makedirs(path + "/sequence")
+
+            with open(path + "/pose.json", "w") as f:
+                f.write(name)
+
+            with open(path + "/thumbnail.jpg", "wb") as f:
+                f.write(b"thumbnail")
+
+            for i in range(3):
+                with open(path + "/sequence/frame{0}.jpg".format(i), "wb") as f:
+                    f.write(b"frame" + str(i).encode("ascii"))
+
+        self.store = studiolibrary.BlobStore.create(self.root)
+
+    def tearDown(self):
+        """
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_find(self):
+        """
+        Test the store is found from an item path.
+        """
+        store = studiolibrary.BlobStore.find(self.root + "/poses/wave1.pose")
+        self.assertEqual(self.store.path(), store.path())
+
+        self.store.remove()
+        self.assertEqual(None, studiolibrary.BlobStore.find(self.root + "/poses/wave1.pose"))
+
+    def test_dedupe(self):
+        """
+        Test identical images are stored once and other files are skipped.
+        """
+        path1 = self.root + "/poses/wave1.pose"
+        path2 = self.root + "/poses/wave2.pose"
+
+        self.assertEqual(4, self.store.dedupe(path1))
+        self.assertEqual(4, self.store.dedupe(path2))
+        self.assertEqual(4, len(self.store.blobs()))
+
+        self.assertTrue(os.path.samefile(path1 + "/thumbnail.jpg", path2 + "/thumbnail.jpg"))
+        self.assertTrue(self.store.isStored(path1 + "/sequence/frame2.jpg"))
+        self.assertFalse(self.store.isStored(path1 + "/pose.json"))
+
+        with open(path2 + "/sequence/frame2.jpg", "rb") as f:
+            self.assertEqual(b"frame2", f.read())
+
+    def test_copy(self):
+        """
+        Test the stored images are linked when an item is copied.
+        """
+        path1 = self.root + "/poses/wave1.pose"
+        path3 = self.root + "/poses/wave3.pose"
+
+        self.store.dedupe(path1)
+        studiolibrary.fileops.copyPath(path1, path3)
+
+        self.assertTrue(os.path.samefile(path1 + "/thumbnail.jpg", path3 + "/thumbnail.jpg"))
+        self.assertFalse(os.path.samefile(path1 + "/pose.json", path3 + "/pose.json"))
+
+        with open(path3 + "/pose.json") as f:
+            self.assertEqual("wave1.pose", f.read())
+
+    def test_collect_garbage(self):
+        """
+        Test only the blobs that are not linked from an item are removed.
+        """
+        path1 = self.root + "/poses/wave1.pose"
+        path2 = self.root + "/poses/wave2.pose"
+
+        with open(path2 + "/thumbnail.jpg", "wb") as f:
+            f.write(b"other")
+
+        self.store.dedupe(path1)
+        self.store.dedupe(path2)
+        self.assertEqual(5, len(self.store.blobs()))
+
+        self.assertEqual((0, 0), studiolibrary.collectGarbage(self.root))
+
+        shutil.rmtree(path2)
+        count, size = studiolibrary.collectGarbage(self.root)
+
+        self.assertEqual(1, count)
+        self.assertEqual(len(b"other"), size)
+        self.assertEqual(4, len(self.store.blobs()))
+
+        shutil.rmtree(path1)
+        studiolibrary.collectGarbage(self.root)
+
+        self.assertEqual([], self.store.blobs())
+        self.assertEqual([], os.listdir(self.store.path()))
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestBlobStore, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
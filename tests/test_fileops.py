@@ -0,0 +1,293 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+import studiolibrary.tests.test_fileops
+reload(studiolibrary.tests.test_fileops)
+studiolibrary.tests.test_fileops.run()
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import studiolibrary.fileops
+
+
+class TestFileOps(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        self.dirname = studiolibrary.normPath(tempfile.mkdtemp())
+
+        os.makedirs(self.dirname + "/src")
+
+        for i in range(20):
+            path = self.dirname + "/src/item{0}.pose".format(i)
+            os.makedirs(path)
+            with open(path + "/pose.json", "w") as f:
+                f.write(str(i))
+
+    def tearDown(self):
+        """
+        """
+        shutil.rmtree(self.dirname, ignore_errors=True)
+
+    def listdir(self, name):
+        """
+        :type name: str
+        :rtype: list[str]
+        """
+        path = os.path.join(self.dirname, name)
+        if not os.path.exists(path):
+            return []
+        return sorted(os.listdir(path))
+
+    def test_move(self):
+        """
+        Test all the items are moved and the changes are returned.
+        """
+        names = self.listdir("src")
+
+        transaction = studiolibrary.FileTransaction()
+        for name in names:
+            transaction.move(
+                self.dirname + "/src/" + name,
+                self.dirname + "/dst/" + name,
+            )
+
+        changes = transaction.commit()
+
+        self.assertEqual(len(names), len(changes))
+        self.assertEqual(names, self.listdir("dst"))
+        self.assertEqual([], self.listdir("src"))
+
+        with open(self.dirname + "/dst/item3.pose/pose.json") as f:
+            self.assertEqual("3", f.read())
+
+    def test_copy_and_trash(self):
+        """
+        Test copy and trash in the same transaction.
+        """
+        with studiolibrary.FileTransaction() as transaction:
+            transaction.copy(
+                self.dirname + "/src/item1.pose",
+                self.dirname + "/dst/item1.pose",
+            )
+            trash1 = transaction.trash(
+                self.dirname + "/src/item2.pose",
+                self.dirname + "/.trash",
+            )
+
+        os.makedirs(self.dirname + "/other/item2.pose")
+
+        with studiolibrary.FileTransaction() as transaction:
+            trash2 = transaction.trash(
+                self.dirname + "/other/item2.pose",
+                self.dirname + "/.trash",
+            )
+
+        self.assertNotEqual(trash1, trash2)
+        self.assertEqual(2, len(self.listdir(".trash")))
+        self.assertIn("item1.pose", self.listdir("src"))
+        self.assertNotIn("item2.pose", self.listdir("src"))
+        self.assertEqual(["item1.pose"], self.listdir("dst"))
+
+    def test_validate(self):
+        """
+        Test nothing is changed when an operation is not valid.
+        """
+        names = self.listdir("src")
+
+        transaction = studiolibrary.FileTransaction()
+        transaction.move(
+            self.dirname + "/src/item1.pose",
+            self.dirname + "/dst/item1.pose",
+        )
+        transaction.move(
+            self.dirname + "/src/item2.pose",
+            self.dirname + "/dst/item1.pose",
+        )
+
+        self.assertRaises(studiolibrary.FileTransactionError, transaction.commit)
+        self.assertEqual(names, self.listdir("src"))
+        self.assertEqual([], self.listdir("dst"))
+
+    def test_rollback(self):
+        """
+        Test the moved items are moved back when an operation fails.
+        """
+        names = self.listdir("src")
+
+        transaction = studiolibrary.FileTransaction()
+        for name in names:
+            transaction.move(
+                self.dirname + "/src/" + name,
+                self.dirname + "/dst/" + name,
+            )
+
+        transaction.copy(
+            self.dirname + "/src/item1.pose",
+            self.dirname + "/copy/item1.pose",
+        )
+
+        # Fail the copy after all the moves have been done
+        copyPath = studiolibrary.fileops.copyPath
+
+        def failCopy(src, dst, callback=None):
+            raise IOError("Disc full")
+
+        studiolibrary.fileops.copyPath = failCopy
+        try:
+            self.assertRaises(studiolibrary.FileTransactionError, transaction.commit)
+        finally:
+            studiolibrary.fileops.copyPath = copyPath
+
+        self.assertEqual(names, self.listdir("src"))
+        self.assertEqual([], self.listdir("dst"))
+        self.assertEqual([], transaction.changes())
+
+    def test_copy_tree(self):
+        """
+        Test a folder is copied and the byte progress is reported.
+        """
+        progress = []
+
+        def callback(copied, total):
+            progress.append((copied, total))
+
+        src = self.dirname + "/src"
+        dst = self.dirname + "/copy"
+
+        with open(src + "/item1.pose/thumbnail.jpg", "wb") as f:
+            f.write(b"x" * (studiolibrary.fileops.CHUNK_SIZE * 2 + 10))
+
+        studiolibrary.fileops.copyTree(src, dst, callback=callback)
+
+        self.assertEqual(self.listdir("src"), self.listdir("copy"))
+        self.assertFalse(os.path.exists(dst + "/" + studiolibrary.fileops.MANIFEST_NAME))
+
+        size = os.path.getsize(src + "/item1.pose/thumbnail.jpg")
+        self.assertEqual(size, os.path.getsize(dst + "/item1.pose/thumbnail.jpg"))
+
+        total = progress[-1][1]
+        self.assertEqual((total, total), progress[-1])
+        self.assertGreater(total, size)
+
+    def test_resume(self):
+        """
+        Test the files in the manifest are skipped when resuming a copy.
+        """
+        src = self.dirname + "/src"
+        dst = self.dirname + "/copy"
+
+        copied = []
+        copyFile = studiolibrary.fileops.copyFile
+
+        def failCopy(src, dst, callback=None):
+            if len(copied) >= 5:
+                raise IOError("Network error")
+            copied.append(src)
+            copyFile(src, dst, callback)
+
+        studiolibrary.fileops.copyFile = failCopy
+        try:
+            self.assertRaises(
+                IOError,
+                studiolibrary.fileops.copyTree, src, dst, threads=1
+            )
+        finally:
+            studiolibrary.fileops.copyFile = copyFile
+
+        manifest = studiolibrary.fileops.readManifest(dst + "/" + studiolibrary.fileops.MANIFEST_NAME)
+        self.assertEqual(5, len(manifest))
+
+        resumed = []
+
+        def countCopy(src, dst, callback=None):
+            resumed.append(src)
+            copyFile(src, dst, callback)
+
+        studiolibrary.fileops.copyFile = countCopy
+        try:
+            studiolibrary.fileops.copyTree(src, dst)
+        finally:
+            studiolibrary.fileops.copyFile = copyFile
+
+        self.assertEqual(15, len(resumed))
+        self.assertFalse(set(copied) & set(resumed))
+
+        with open(dst + "/item7.pose/pose.json") as f:
+            self.assertEqual("7", f.read())
+
+    def test_resume_transaction(self):
+        """
+        Test an interrupted copy is kept and resumed by the same copy.
+        """
+        src = self.dirname + "/src"
+        dst = self.dirname + "/copy"
+
+        copied = []
+        copyFile = studiolibrary.fileops.copyFile
+
+        def failCopy(src, dst, callback=None):
+            if len(copied) >= 5:
+                raise IOError("Network error")
+            copied.append(src)
+            copyFile(src, dst, callback)
+
+        transaction = studiolibrary.FileTransaction(threads=1)
+        transaction.copy(src, dst)
+
+        studiolibrary.fileops.copyFile = failCopy
+        try:
+            self.assertRaises(studiolibrary.FileTransactionError, transaction.commit)
+        finally:
+            studiolibrary.fileops.copyFile = copyFile
+
+        self.assertTrue(studiolibrary.fileops.isResumable(dst))
+
+        progress = []
+
+        transaction = studiolibrary.FileTransaction()
+        transaction.setCallback(lambda copied, total: progress.append(copied))
+        transaction.copy(src, dst)
+        transaction.commit()
+
+        self.assertFalse(studiolibrary.fileops.isResumable(dst))
+        self.assertEqual(self.listdir("src"), self.listdir("copy"))
+        self.assertEqual(progress[-1], sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, dirs, names in os.walk(src) for name in names
+        ))
+
+
+def testSuite():
+    """
+    Return the test suite for the test case.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestFileOps, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())